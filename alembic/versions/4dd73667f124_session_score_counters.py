@@ -0,0 +1,52 @@
+"""Session score counters
+
+Revision ID: 4dd73667f124
+Revises: af4b7ae55d37
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4dd73667f124'
+down_revision: Union[str, None] = 'af4b7ae55d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for column in ('experts_score', 'bot_score', 'rounds_played'):
+        op.add_column(
+            'sessions',
+            sa.Column(
+                column, sa.Integer(), server_default='0', nullable=False
+            ),
+        )
+    op.execute(
+        """
+        UPDATE sessions
+        SET experts_score = score.experts,
+            bot_score = score.bot,
+            rounds_played = score.total
+        FROM (
+            SELECT session_id,
+                   count(*) FILTER (WHERE is_correct_answer IS TRUE) AS experts,
+                   count(*) FILTER (WHERE is_correct_answer IS FALSE) AS bot,
+                   count(*) FILTER (WHERE is_correct_answer IS NOT NULL)
+                       AS total
+            FROM rounds
+            GROUP BY session_id
+        ) AS score
+        WHERE sessions.id = score.session_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('sessions', 'rounds_played')
+    op.drop_column('sessions', 'bot_score')
+    op.drop_column('sessions', 'experts_score')
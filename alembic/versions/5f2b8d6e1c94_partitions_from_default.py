@@ -0,0 +1,104 @@
+"""Move default partition rows into new monthly partitions
+
+Revision ID: 5f2b8d6e1c94
+Revises: 7c3e9a1d5b28
+Create Date: 2026-10-20 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f2b8d6e1c94'
+down_revision: Union[str, None] = '7c3e9a1d5b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Postgres не создает секцию, если в {table}_default уже есть строки
+# ее месяца. Такие строки переносятся: удаляются из default-секции
+# во временную таблицу и после создания секции вставляются обратно
+# через родительскую таблицу, все в одной транзакции.
+CREATE_MONTHLY_PARTITIONS = """
+CREATE OR REPLACE FUNCTION create_monthly_partitions(
+    parent text, from_month date, to_month date
+) RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    bound date := date_trunc('month', from_month);
+    next_bound date;
+    part_name text;
+    moved bigint;
+BEGIN
+    WHILE bound <= to_month LOOP
+        next_bound := (bound + interval '1 month')::date;
+        part_name := parent || '_' || to_char(bound, 'YYYY_MM');
+        IF to_regclass(quote_ident(part_name)) IS NULL THEN
+            EXECUTE format(
+                'CREATE TEMP TABLE partition_rows_moved (LIKE %I) '
+                'ON COMMIT DROP',
+                parent
+            );
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM %I WHERE created_at >= %L '
+                'AND created_at < %L RETURNING *) '
+                'INSERT INTO partition_rows_moved SELECT * FROM moved',
+                parent || '_default',
+                bound,
+                next_bound
+            );
+            GET DIAGNOSTICS moved = ROW_COUNT;
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I '
+                'FOR VALUES FROM (%L) TO (%L)',
+                part_name,
+                parent,
+                bound,
+                next_bound
+            );
+            IF moved > 0 THEN
+                EXECUTE format(
+                    'INSERT INTO %I SELECT * FROM partition_rows_moved',
+                    parent
+                );
+                RAISE NOTICE 'В секцию % перенесено строк из %: %',
+                    part_name, parent || '_default', moved;
+            END IF;
+            DROP TABLE partition_rows_moved;
+        END IF;
+        bound := next_bound;
+    END LOOP;
+END
+$$
+"""
+
+# Версия из b52e1f0c9a47
+PREVIOUS_CREATE_MONTHLY_PARTITIONS = """
+CREATE OR REPLACE FUNCTION create_monthly_partitions(
+    parent text, from_month date, to_month date
+) RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    bound date := date_trunc('month', from_month);
+BEGIN
+    WHILE bound <= to_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I '
+            'FOR VALUES FROM (%L) TO (%L)',
+            parent || '_' || to_char(bound, 'YYYY_MM'),
+            parent,
+            bound,
+            (bound + interval '1 month')::date
+        );
+        bound := (bound + interval '1 month')::date;
+    END LOOP;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    op.execute(CREATE_MONTHLY_PARTITIONS)
+
+
+def downgrade() -> None:
+    op.execute(PREVIOUS_CREATE_MONTHLY_PARTITIONS)
@@ -0,0 +1,62 @@
+"""Quiz version counter
+
+Revision ID: 7c3e9a1d5b28
+Revises: a4d8c2e6f019
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e9a1d5b28'
+down_revision: Union[str, None] = 'a4d8c2e6f019'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('themes', 'questions', 'answers')
+
+
+def upgrade() -> None:
+    # Одна строка со счетчиком изменений тем, вопросов и ответов.
+    # Триггеры увеличивают его в той же транзакции, что и запись,
+    # поэтому версию видят все процессы и только после коммита
+    op.create_table(
+        'quiz_version',
+        sa.Column('id', sa.SmallInteger(), server_default='1', nullable=False),
+        sa.Column(
+            'version', sa.BigInteger(), server_default='0', nullable=False
+        ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.CheckConstraint('id = 1', name='ck_quiz_version_single_row'),
+    )
+    op.execute("INSERT INTO quiz_version (id, version) VALUES (1, 0)")
+    op.execute(
+        """
+        CREATE FUNCTION bump_quiz_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE quiz_version SET version = version + 1 WHERE id = 1;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    for table in TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_bump_quiz_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_quiz_version()
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER {table}_bump_quiz_version ON {table}")
+    op.execute("DROP FUNCTION bump_quiz_version()")
+    op.drop_table('quiz_version')
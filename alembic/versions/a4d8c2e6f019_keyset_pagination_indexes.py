@@ -0,0 +1,42 @@
+"""Keyset pagination indexes
+
+Revision ID: a4d8c2e6f019
+Revises: e3a9f5b7d204
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d8c2e6f019'
+down_revision: Union[str, None] = 'e3a9f5b7d204'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('ix_themes_created_at_id', 'themes', ['created_at', 'id']),
+    ('ix_questions_created_at_id', 'questions', ['created_at', 'id']),
+    (
+        'ix_questions_theme_id_created_at_id',
+        'questions',
+        ['theme_id', 'created_at', 'id'],
+    ),
+    (
+        'ix_sessions_status_created_at_id',
+        'sessions',
+        ['status', 'created_at', 'id'],
+    ),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
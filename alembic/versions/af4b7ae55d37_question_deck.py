@@ -0,0 +1,60 @@
+"""Question deck
+
+Revision ID: af4b7ae55d37
+Revises: d7fbed942981
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'af4b7ae55d37'
+down_revision: Union[str, None] = 'd7fbed942981'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'sessions',
+        sa.Column('question_deck', sa.ARRAY(sa.BigInteger()), nullable=True),
+    )
+    op.create_table(
+        'chat_seen_questions',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('chat_id', sa.BigInteger(), nullable=False),
+        sa.Column('question_id', sa.BigInteger(), nullable=False),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=True,
+        ),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ['question_id'], ['questions.id'], ondelete='CASCADE'
+        ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('id'),
+        sa.UniqueConstraint(
+            'chat_id', 'question_id', name='uq_chat_seen_questions'
+        ),
+    )
+    # Уже заданные вопросы переносим из истории раундов
+    op.execute(
+        """
+        INSERT INTO chat_seen_questions (chat_id, question_id)
+        SELECT DISTINCT sessions.chat_id, rounds.question_id
+        FROM rounds JOIN sessions ON sessions.id = rounds.session_id
+        WHERE rounds.question_id IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('chat_seen_questions')
+    op.drop_column('sessions', 'question_deck')
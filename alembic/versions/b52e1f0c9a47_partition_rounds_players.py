@@ -0,0 +1,199 @@
+"""Partition rounds and players, sessions archive
+
+Revision ID: b52e1f0c9a47
+Revises: 4dd73667f124
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b52e1f0c9a47'
+down_revision: Union[str, None] = '4dd73667f124'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONED = ('players', 'rounds')
+
+# Месячные секции {table}_YYYY_MM для [from_month, to_month].
+# Ее же вызывает архиватор, чтобы секции были готовы заранее
+# и строки не оседали в {table}_default.
+CREATE_MONTHLY_PARTITIONS = """
+CREATE OR REPLACE FUNCTION create_monthly_partitions(
+    parent text, from_month date, to_month date
+) RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    bound date := date_trunc('month', from_month);
+BEGIN
+    WHILE bound <= to_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I '
+            'FOR VALUES FROM (%L) TO (%L)',
+            parent || '_' || to_char(bound, 'YYYY_MM'),
+            parent,
+            bound,
+            (bound + interval '1 month')::date
+        );
+        bound := (bound + interval '1 month')::date;
+    END LOOP;
+END
+$$
+"""
+
+
+def create_indexes() -> None:
+    op.create_index(
+        'ix_players_session_id_user_id',
+        'players',
+        ['session_id', 'user_id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_rounds_active_session_id',
+        'rounds',
+        ['session_id'],
+        unique=False,
+        postgresql_where=sa.text('is_active IS TRUE'),
+    )
+    op.create_index(
+        'ix_rounds_session_id_is_correct_answer',
+        'rounds',
+        ['session_id', 'is_correct_answer'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_rounds_answer_player_id',
+        'rounds',
+        ['answer_player_id'],
+        unique=False,
+    )
+
+
+def create_foreign_keys() -> None:
+    op.create_foreign_key(
+        None, 'players', 'sessions', ['session_id'], ['id'],
+        ondelete='CASCADE',
+    )
+    op.create_foreign_key(
+        None, 'players', 'users', ['user_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_foreign_key(
+        None, 'rounds', 'sessions', ['session_id'], ['id'],
+        ondelete='CASCADE',
+    )
+    op.create_foreign_key(
+        None, 'rounds', 'questions', ['question_id'], ['id'],
+        ondelete='SET NULL',
+    )
+
+
+def upgrade() -> None:
+    # Ссылки на секционированную таблицу должны включать created_at,
+    # поэтому внешние ключи на players.id и rounds.id убираются
+    op.execute(
+        'ALTER TABLE sessions '
+        'DROP CONSTRAINT IF EXISTS sessions_current_round_id_fkey'
+    )
+    op.execute(
+        'ALTER TABLE rounds '
+        'DROP CONSTRAINT IF EXISTS rounds_answer_player_id_fkey'
+    )
+    op.execute(CREATE_MONTHLY_PARTITIONS)
+
+    for table in PARTITIONED:
+        old = f'{table}_unpartitioned'
+        op.execute(
+            f'UPDATE {table} SET created_at = now() WHERE created_at IS NULL'
+        )
+        op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+        op.execute(
+            f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) '
+            'PARTITION BY RANGE (created_at)'
+        )
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN created_at SET NOT NULL')
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+        op.execute(
+            f"""
+            SELECT create_monthly_partitions(
+                '{table}',
+                (SELECT coalesce(min(created_at), now()) FROM {old})::date,
+                (now() + interval '2 months')::date
+            )
+            """
+        )
+        op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+        op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+        op.execute(f'DROP TABLE {old}')
+        op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id, created_at)')
+
+    create_foreign_keys()
+    create_indexes()
+
+    op.create_table(
+        'sessions_archive',
+        sa.Column('id', sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column('chat_id', sa.BigInteger(), nullable=False),
+        sa.Column(
+            'status',
+            postgresql.ENUM(name='statussession', create_type=False),
+            nullable=False,
+        ),
+        sa.Column('experts_score', sa.Integer(), nullable=False),
+        sa.Column('bot_score', sa.Integer(), nullable=False),
+        sa.Column('rounds_played', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            'archived_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.Column(
+            'data', postgresql.JSONB(astext_type=sa.Text()), nullable=False
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        op.f('ix_sessions_archive_chat_id'),
+        'sessions_archive',
+        ['chat_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    # Архивные игры обратно не переносятся
+    op.drop_index(
+        op.f('ix_sessions_archive_chat_id'), table_name='sessions_archive'
+    )
+    op.drop_table('sessions_archive')
+
+    for table in PARTITIONED:
+        old = f'{table}_partitioned'
+        op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+        op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)')
+        op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+        op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+        op.execute(f'DROP TABLE {old}')
+        op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id)')
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN created_at DROP NOT NULL')
+
+    create_foreign_keys()
+    create_indexes()
+    op.create_foreign_key(
+        None, 'rounds', 'players', ['answer_player_id'], ['id'],
+        ondelete='SET NULL',
+    )
+    op.create_foreign_key(
+        None, 'sessions', 'rounds', ['current_round_id'], ['id'],
+        ondelete='SET NULL',
+    )
+    op.execute(
+        'DROP FUNCTION create_monthly_partitions(text, date, date)'
+    )
@@ -0,0 +1,57 @@
+"""User stats
+
+Revision ID: c81d4a6e2f13
+Revises: b52e1f0c9a47
+Create Date: 2026-10-19 16:00:00.000000
+
+Таблица создается пустой, историю в нее переносит
+python cli.py rebuild-user-stats
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81d4a6e2f13'
+down_revision: Union[str, None] = 'b52e1f0c9a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = (
+    'total_answers',
+    'correct_answers',
+    'incorrect_answers',
+    'games_played',
+    'wins',
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_stats',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.BigInteger(), nullable=False),
+        *(
+            sa.Column(
+                counter, sa.Integer(), server_default='0', nullable=False
+            )
+            for counter in COUNTERS
+        ),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=True,
+        ),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_stats')
@@ -0,0 +1,78 @@
+"""Hot lookup indexes
+
+Revision ID: d7fbed942981
+Revises: 4df9c31ecc86
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7fbed942981'
+down_revision: Union[str, None] = '4df9c31ecc86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE_SESSION = "status NOT IN ('COMPLETED', 'CANCELLED')"
+
+
+def upgrade() -> None:
+    # Уникальный индекс не создастся, если в чате уже висит несколько
+    # незавершенных игр - оставляем самую свежую, остальные отменяем
+    op.execute(
+        f"""
+        UPDATE sessions SET status = 'CANCELLED'
+        WHERE {ACTIVE_SESSION}
+          AND id NOT IN (
+            SELECT max(id) FROM sessions
+            WHERE {ACTIVE_SESSION}
+            GROUP BY chat_id
+          )
+        """
+    )
+    op.create_index(
+        'ix_sessions_active_chat_id',
+        'sessions',
+        ['chat_id'],
+        unique=True,
+        postgresql_where=sa.text(ACTIVE_SESSION),
+    )
+    op.create_index(
+        'ix_players_session_id_user_id',
+        'players',
+        ['session_id', 'user_id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_rounds_active_session_id',
+        'rounds',
+        ['session_id'],
+        unique=False,
+        postgresql_where=sa.text('is_active IS TRUE'),
+    )
+    op.create_index(
+        'ix_rounds_session_id_is_correct_answer',
+        'rounds',
+        ['session_id', 'is_correct_answer'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_rounds_answer_player_id',
+        'rounds',
+        ['answer_player_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_rounds_answer_player_id', table_name='rounds')
+    op.drop_index(
+        'ix_rounds_session_id_is_correct_answer', table_name='rounds'
+    )
+    op.drop_index('ix_rounds_active_session_id', table_name='rounds')
+    op.drop_index('ix_players_session_id_user_id', table_name='players')
+    op.drop_index('ix_sessions_active_chat_id', table_name='sessions')
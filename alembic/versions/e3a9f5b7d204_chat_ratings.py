@@ -0,0 +1,90 @@
+"""Chat ratings
+
+Revision ID: e3a9f5b7d204
+Revises: c81d4a6e2f13
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9f5b7d204'
+down_revision: Union[str, None] = 'c81d4a6e2f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'chat_ratings',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('chat_id', sa.BigInteger(), nullable=False),
+        sa.Column(
+            'games_played', sa.Integer(), server_default='0', nullable=False
+        ),
+        sa.Column(
+            'expert_wins', sa.Integer(), server_default='0', nullable=False
+        ),
+        sa.Column('bot_wins', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('last_experts_score', sa.Integer(), nullable=True),
+        sa.Column('last_bot_score', sa.Integer(), nullable=True),
+        sa.Column('last_game_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=True,
+        ),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('chat_id'),
+    )
+    op.create_index(
+        'ix_chat_ratings_top',
+        'chat_ratings',
+        [sa.text('expert_wins DESC'), sa.text('games_played DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_user_stats_top',
+        'user_stats',
+        [sa.text('wins DESC'), sa.text('correct_answers DESC')],
+        unique=False,
+    )
+    # Рейтинг по уже сыгранным играм, включая архивные
+    op.execute(
+        """
+        INSERT INTO chat_ratings (
+            chat_id, games_played, expert_wins, bot_wins,
+            last_experts_score, last_bot_score, last_game_at
+        )
+        SELECT DISTINCT ON (chat_id)
+            chat_id,
+            count(*) OVER chat,
+            count(*) FILTER (WHERE experts_score > bot_score) OVER chat,
+            count(*) FILTER (WHERE experts_score <= bot_score) OVER chat,
+            experts_score,
+            bot_score,
+            finished_at
+        FROM (
+            SELECT id, chat_id, experts_score, bot_score,
+                   coalesce(updated_at, created_at) AS finished_at
+            FROM sessions WHERE status = 'COMPLETED'
+            UNION ALL
+            SELECT id, chat_id, experts_score, bot_score, finished_at
+            FROM sessions_archive WHERE status = 'COMPLETED'
+        ) AS games
+        WINDOW chat AS (PARTITION BY chat_id)
+        ORDER BY chat_id, id DESC
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_stats_top', table_name='user_stats')
+    op.drop_index('ix_chat_ratings_top', table_name='chat_ratings')
+    op.drop_table('chat_ratings')
@@ -0,0 +1,107 @@
+"""Подписанные токены сессии администратора.
+
+Токен - base64url(JSON {id, email, exp}) и HMAC-SHA256 от него через
+точку. Проверка не ходит в БД: подпись сверяется hmac.compare_digest,
+срок - по exp. Уже проверенные токены держит TokenCache.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, frozen=True)
+class AdminPrincipal:
+    """Администратор, подтвержденный токеном"""
+
+    id: int
+    email: str
+
+
+def derive_key(secret: str) -> bytes:
+    """Ключ подписи из ключа сессии, чтобы не использовать его напрямую"""
+    return hashlib.sha256(b"admin-token:" + secret.encode()).digest()
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _signature(key: bytes, payload: str) -> str:
+    return _b64encode(hmac.new(key, payload.encode(), hashlib.sha256).digest())
+
+
+def sign_token(
+    principal: AdminPrincipal, key: bytes, ttl: int, now: float | None = None
+) -> str:
+    expires_at = int((time.time() if now is None else now) + ttl)
+    payload = _b64encode(
+        json.dumps(
+            {"id": principal.id, "email": principal.email, "exp": expires_at},
+            separators=(",", ":"),
+        ).encode()
+    )
+    return f"{payload}.{_signature(key, payload)}"
+
+
+def verify_token(
+    token: str, key: bytes, now: float | None = None
+) -> tuple[AdminPrincipal, float] | None:
+    """:return: Администратор и время истечения токена или None,
+    если подпись не сошлась, токен испорчен или просрочен
+    """
+    payload, _, signature = token.partition(".")
+    expected = _signature(key, payload)
+    if not hmac.compare_digest(signature.encode(), expected.encode()):
+        return None
+    try:
+        data = json.loads(_b64decode(payload))
+        principal = AdminPrincipal(id=int(data["id"]), email=str(data["email"]))
+        expires_at = float(data["exp"])
+    except (ValueError, KeyError, TypeError):
+        return None
+    if expires_at <= (time.time() if now is None else now):
+        return None
+    return principal, expires_at
+
+
+class TokenCache:
+    """Проверенные токены на ttl секунд (но не дольше срока токена).
+    При переполнении вытесняются самые старые записи.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: dict[str, tuple[AdminPrincipal, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str, now: float) -> AdminPrincipal | None:
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+        principal, valid_until = entry
+        if valid_until <= now:
+            del self._entries[token]
+            return None
+        return principal
+
+    def put(
+        self,
+        token: str,
+        principal: AdminPrincipal,
+        expires_at: float,
+        now: float,
+    ) -> None:
+        while len(self._entries) >= self.max_size:
+            del self._entries[next(iter(self._entries))]
+        self._entries[token] = (principal, min(expires_at, now + self.ttl))
@@ -1,7 +1,21 @@
 import enum
 
-from sqlalchemy import JSON, BigInteger, Boolean, Column, ForeignKey
+from sqlalchemy import (
+    ARRAY,
+    JSON,
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql.functions import func
 from sqlalchemy.sql.sqltypes import Enum
 
 from app.bot.user.models import UserModel  # noqa: F401
@@ -27,6 +41,26 @@ class StatusSession(enum.Enum):
     CANCELLED = "cancelled"
 
 
+# Все связи ленивые. Что нужно конкретному запросу, он подгружает
+# опциями (selectinload/joinedload) в аксессоре.
+
+# players и rounds разбиты на месячные секции по created_at (см. миграцию
+# partition_rounds_players). Первичный ключ таблицы (id, created_at),
+# а ORM по-прежнему различает строки по одному id. Внешних ключей
+# на эти таблицы нет: Postgres требует, чтобы ссылка включала created_at,
+# поэтому связи на них описаны через primaryjoin.
+PARTITION_BY_CREATED_AT = {"postgresql_partition_by": "RANGE (created_at)"}
+
+
+def partition_key_column() -> Column:
+    return Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now(),
+        nullable=False,
+    )
+
+
 class StateModel(TimedBaseMixin, BaseModel):
     __tablename__ = "states"
     id = Column(BigInteger, primary_key=True, autoincrement=True, unique=True)
@@ -43,16 +77,37 @@ class StateModel(TimedBaseMixin, BaseModel):
     )
 
 
+# Условие частичного уникального индекса активной игры чата.
+# Оно же - цель ON CONFLICT при создании сессии
+ACTIVE_SESSION_WHERE = "status NOT IN ('COMPLETED', 'CANCELLED')"
+
+
 class SessionModel(TimedBaseMixin, BaseModel):
     __tablename__ = "sessions"
+    __table_args__ = (
+        # В чате может быть только одна незавершенная игра
+        Index(
+            "ix_sessions_active_chat_id",
+            "chat_id",
+            unique=True,
+            postgresql_where=text(ACTIVE_SESSION_WHERE),
+        ),
+        # Keyset-пагинация списков активных и завершенных игр
+        Index("ix_sessions_status_created_at_id", "status", "created_at", "id"),
+    )
     id = Column(BigInteger, primary_key=True, autoincrement=True, unique=True)
     chat_id = Column(BigInteger)
     status = Column(Enum(StatusSession))
-    current_round_id = Column(
-        BigInteger,
-        ForeignKey("rounds.id", ondelete="SET NULL"),
-        unique=True,
-        nullable=True,
+    current_round_id = Column(BigInteger, unique=True, nullable=True)
+    # Вопросы, заранее вытянутые на игру. Раунд забирает первый из них
+    question_deck = Column(ARRAY(BigInteger), nullable=True)
+    # Счет игры. Меняется тем же запросом, что выносит вердикт раунду
+    experts_score = Column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    bot_score = Column(Integer, default=0, server_default="0", nullable=False)
+    rounds_played = Column(
+        Integer, default=0, server_default="0", nullable=False
     )
 
     state = relationship(
@@ -76,16 +131,30 @@ class SessionModel(TimedBaseMixin, BaseModel):
 
     current_round = relationship(
         "RoundModel",
-        foreign_keys=[current_round_id],
+        primaryjoin="foreign(SessionModel.current_round_id) == RoundModel.id",
         post_update=True,
         uselist=False,
-        lazy="joined",
     )
 
+    @property
+    def score(self) -> dict:
+        """Счет в формате GameSessionAccessor.gen_score"""
+        return {
+            "experts": self.experts_score or 0,
+            "bot": self.bot_score or 0,
+            "total_rounds": self.rounds_played or 0,
+        }
+
 
 class PlayerModel(TimedBaseMixin, BaseModel):
     __tablename__ = "players"
-    id = Column(BigInteger, primary_key=True, autoincrement=True, unique=True)
+    __table_args__ = (
+        Index("ix_players_session_id_user_id", "session_id", "user_id"),
+        PARTITION_BY_CREATED_AT,
+    )
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    created_at = partition_key_column()
+    __mapper_args__ = {"primary_key": [id]}
     session_id = Column(
         BigInteger, ForeignKey("sessions.id", ondelete="CASCADE"), unique=False
     )
@@ -97,19 +166,37 @@ class PlayerModel(TimedBaseMixin, BaseModel):
         BigInteger, ForeignKey("users.id", ondelete="CASCADE"), unique=False
     )
 
-    user = relationship("UserModel", back_populates="players", lazy="joined")
+    user = relationship("UserModel", back_populates="players")
     session = relationship("SessionModel", back_populates="players")
     answered_rounds = relationship(
         "RoundModel",
         back_populates="answer_player",
-        foreign_keys="RoundModel.answer_player_id",
-        lazy="joined",
+        primaryjoin="PlayerModel.id == foreign(RoundModel.answer_player_id)",
     )
 
 
 class RoundModel(TimedBaseMixin, BaseModel):
     __tablename__ = "rounds"
-    id = Column(BigInteger, primary_key=True, autoincrement=True, unique=True)
+    __table_args__ = (
+        # Поиск текущего раунда сессии
+        Index(
+            "ix_rounds_active_session_id",
+            "session_id",
+            postgresql_where=text("is_active IS TRUE"),
+        ),
+        # Подсчет счета игры без чтения таблицы
+        Index(
+            "ix_rounds_session_id_is_correct_answer",
+            "session_id",
+            "is_correct_answer",
+        ),
+        # Ответы игрока: присоединяются к каждому PlayerModel
+        Index("ix_rounds_answer_player_id", "answer_player_id"),
+        PARTITION_BY_CREATED_AT,
+    )
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    created_at = partition_key_column()
+    __mapper_args__ = {"primary_key": [id]}
     session_id = Column(
         BigInteger, ForeignKey("sessions.id", ondelete="CASCADE"), unique=False
     )
@@ -120,21 +207,78 @@ class RoundModel(TimedBaseMixin, BaseModel):
         ForeignKey("questions.id", ondelete="SET NULL"),
         nullable=True,
     )
-    answer_player_id = Column(
-        BigInteger,
-        ForeignKey("players.id", ondelete="SET NULL"),
-        nullable=True,
-    )
+    answer_player_id = Column(BigInteger, nullable=True)
 
-    question = relationship(
-        "QuestionModel", back_populates="rounds", lazy="joined"
-    )
+    question = relationship("QuestionModel", back_populates="rounds")
     session = relationship(
         "SessionModel", back_populates="rounds", foreign_keys=[session_id]
     )
     answer_player = relationship(
         "PlayerModel",
         back_populates="answered_rounds",
-        foreign_keys=[answer_player_id],
-        lazy="joined",
+        primaryjoin="foreign(RoundModel.answer_player_id) == PlayerModel.id",
+    )
+
+
+class ChatSeenQuestionModel(TimedBaseMixin, BaseModel):
+    """Вопросы, которые уже задавались в чате"""
+
+    __tablename__ = "chat_seen_questions"
+    __table_args__ = (
+        UniqueConstraint(
+            "chat_id", "question_id", name="uq_chat_seen_questions"
+        ),
+    )
+    id = Column(BigInteger, primary_key=True, autoincrement=True, unique=True)
+    chat_id = Column(BigInteger, nullable=False)
+    question_id = Column(
+        BigInteger,
+        ForeignKey("questions.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+
+class SessionArchiveModel(BaseModel):
+    """Завершенная игра, вынесенная архиватором из рабочих таблиц.
+    В data лежат строки сессии, игроков и раундов на момент переноса.
+    У раундов дополнительно записан answer_user_id, чтобы статистику
+    игрока можно было посчитать без архивных игроков.
+    """
+
+    __tablename__ = "sessions_archive"
+    id = Column(BigInteger, primary_key=True, autoincrement=False)
+    chat_id = Column(BigInteger, nullable=False, index=True)
+    status = Column(Enum(StatusSession), nullable=False)
+    experts_score = Column(Integer, nullable=False)
+    bot_score = Column(Integer, nullable=False)
+    rounds_played = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    archived_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    data = Column(JSONB, nullable=False)
+
+
+class ChatRatingModel(TimedBaseMixin, BaseModel):
+    """Рейтинг чата. Обновляется запросом, который завершает игру"""
+
+    __tablename__ = "chat_ratings"
+    __table_args__ = (
+        # Топ чатов по победам знатоков
+        Index(
+            "ix_chat_ratings_top",
+            text("expert_wins DESC"),
+            text("games_played DESC"),
+        ),
+    )
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    chat_id = Column(BigInteger, unique=True, nullable=False)
+    games_played = Column(
+        Integer, default=0, server_default="0", nullable=False
     )
+    expert_wins = Column(Integer, default=0, server_default="0", nullable=False)
+    bot_wins = Column(Integer, default=0, server_default="0", nullable=False)
+    last_experts_score = Column(Integer, nullable=True)
+    last_bot_score = Column(Integer, nullable=True)
+    last_game_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,6 +1,12 @@
 import typing
 
-from app.bot.game.views import ActiveSessionListView, CompletedSessionListView
+from app.bot.game.views import (
+    ActiveSessionListView,
+    CompletedSessionListView,
+    HistoryExportView,
+    SessionEventsView,
+    TopRatingView,
+)
 
 if typing.TYPE_CHECKING:
     from app.web.app import Application
@@ -9,3 +15,6 @@ if typing.TYPE_CHECKING:
 def setup_routes(app: "Application"):
     app.router.add_view("/sessions.active", ActiveSessionListView)
     app.router.add_view("/sessions.completed", CompletedSessionListView)
+    app.router.add_view("/sessions.export", HistoryExportView)
+    app.router.add_view("/sessions.events", SessionEventsView)
+    app.router.add_view("/ratings.top", TopRatingView)
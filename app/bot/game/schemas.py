@@ -1,6 +1,9 @@
-from marshmallow import Schema, fields
+from datetime import UTC
+
+from marshmallow import Schema, fields, validate
 
 from app.bot.user.schemas import UserSchema
+from app.web.pagination import PageSchema
 
 
 class StateSchema(Schema):
@@ -25,25 +28,51 @@ class SessionSchema(Schema):
     state = fields.Nested(StateSchema, many=False)
     players = fields.Nested(PlayerSchema, many=True)
 
-    experts_score = fields.Method("get_experts_score")
-    bot_score = fields.Method("get_bot_score")
+    experts_score = fields.Int()
+    bot_score = fields.Int()
+
+
+class HistoryExportSchema(Schema):
+    chat_id = fields.Int()
+    since = fields.AwareDateTime(default_timezone=UTC)
+    until = fields.AwareDateTime(default_timezone=UTC)
+    gzip = fields.Bool(load_default=False)
+
+
+class SessionPageSchema(PageSchema):
+    item_schema = SessionSchema
 
-    def get_experts_score(self, obj):
-        """Вычисляет счет экспертов на основе правильных ответов"""
-        if not obj.rounds:
-            return 0
-        return sum(
-            1 for roundw in obj.rounds if roundw.is_correct_answer is True
-        )
 
-    def get_bot_score(self, obj):
-        """Вычисляет счет бота на основе неправильных ответов"""
-        if not obj.rounds:
-            return 0
-        return sum(
-            1 for roundw in obj.rounds if roundw.is_correct_answer is False
-        )
+class CompletedSessionPageSchema(ChatIdSchema, SessionPageSchema):
+    pass
 
 
 class SessionListSchema(Schema):
     active_sessions = fields.Nested(SessionSchema, many=True)
+    next_cursor = fields.Str(allow_none=True)
+
+
+class TopLimitSchema(Schema):
+    limit = fields.Int(load_default=10, validate=validate.Range(min=1, max=100))
+
+
+class ChatRatingSchema(Schema):
+    chat_id = fields.Int()
+    games_played = fields.Int()
+    expert_wins = fields.Int()
+    bot_wins = fields.Int()
+    last_experts_score = fields.Int()
+    last_bot_score = fields.Int()
+    last_game_at = fields.DateTime()
+
+
+class TopPlayerSchema(Schema):
+    username_tg = fields.Str()
+    games_played = fields.Int()
+    wins = fields.Int()
+    correct_answers = fields.Int()
+
+
+class TopRatingSchema(Schema):
+    chats = fields.Nested(ChatRatingSchema, many=True)
+    players = fields.Nested(TopPlayerSchema, many=True)
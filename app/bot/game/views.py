@@ -1,39 +1,165 @@
+from aiohttp.web import HTTPServiceUnavailable, Response, StreamResponse
 from aiohttp_apispec import querystring_schema, response_schema
 
-from app.bot.game.schemas import ChatIdSchema, SessionListSchema, SessionSchema
+from app.bot.game.schemas import (
+    ChatIdSchema,
+    ChatRatingSchema,
+    CompletedSessionPageSchema,
+    HistoryExportSchema,
+    SessionListSchema,
+    SessionPageSchema,
+    SessionSchema,
+    TopLimitSchema,
+    TopPlayerSchema,
+    TopRatingSchema,
+)
+from app.store.database.pagination import Page, split_page
+from app.store.events.bus import TooManySubscribersError
+from app.store.game.dataclasses import SessionRead
+from app.store.game.export_accessor import ndjson_chunks
 from app.web.app import View
+from app.web.pagination import list_schema
+from app.web.serializers import compile_schema, dumps
 from app.web.utils import json_response
 
 
+def session_list_response(
+    sessions: list[SessionRead], page: Page, only: frozenset[str] | None
+) -> Response:
+    sessions, next_cursor = split_page(sessions, page)
+    return json_response(
+        data={
+            "active_sessions": list_schema(SessionSchema, only).dump(sessions),
+            "next_cursor": next_cursor,
+        }
+    )
+
+
 class ActiveSessionListView(View):
+    @querystring_schema(SessionPageSchema)
     @response_schema(SessionListSchema)
     async def get(self):
-        active_sessions = await self.store.game_session.get_active_sessions()
+        query = self.request["querystring"]
+        page, only = query["page"], query["only"]
 
-        return json_response(
-            data={
-                "active_sessions": [
-                    SessionSchema().dump(session) for session in active_sessions
-                ]
-            }
+        sessions = await self.store.game_session.get_active_sessions(
+            page=page, fields=only
         )
+        return session_list_response(sessions, page, only)
 
 
 class CompletedSessionListView(View):
-    @querystring_schema(ChatIdSchema)
+    @querystring_schema(CompletedSessionPageSchema)
     @response_schema(SessionListSchema)
     async def get(self):
-        chat_id = self.request.query.get("chat_id") or None
+        query = self.request["querystring"]
+        page, only = query["page"], query["only"]
+
+        sessions = await self.store.game_session.get_completed_sessions(
+            query.get("chat_id"), page=page, fields=only
+        )
+        return session_list_response(sessions, page, only)
+
+
+class HistoryExportView(View):
+    """История завершенных игр в NDJSON, одна игра на строку.
+    Ответ отдается кусками по мере чтения из БД.
+    """
+
+    @querystring_schema(HistoryExportSchema)
+    async def get(self):
+        query = self.request["querystring"]
+        history = self.store.history.stream_history(
+            chat_id=query.get("chat_id"),
+            since=query.get("since"),
+            until=query.get("until"),
+        )
+
+        response = StreamResponse(
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+        if query["gzip"]:
+            response.headers["Content-Encoding"] = "gzip"
+        response.enable_chunked_encoding()
+        await response.prepare(self.request)
+        async for chunk in ndjson_chunks(history, compress=query["gzip"]):
+            await response.write(chunk)
+        await response.write_eof()
+        return response
+
+
+def sse_message(event: str, data: dict, id_: int | None = None) -> bytes:
+    """Одно сообщение text/event-stream"""
+    head = f"id: {id_}\n" if id_ is not None else ""
+    return f"{head}event: {event}\ndata: ".encode() + dumps(data) + b"\n\n"
+
+
+class SessionEventsView(View):
+    """Лента событий игр в формате Server-Sent Events.
+
+    События приходят из обработчиков бота через app.store.events,
+    БД ручка не читает. Если клиент не успевает читать, старые события
+    вытесняются и приходит событие lagged с их числом - после него
+    стоит перечитать /sessions.active.
+    """
+
+    @querystring_schema(ChatIdSchema)
+    async def get(self):
+        try:
+            subscription = self.store.events.subscribe(
+                chat_id=self.request["querystring"].get("chat_id")
+            )
+        except TooManySubscribersError as e:
+            raise HTTPServiceUnavailable from e
 
-        completed_sessions = (
-            await self.store.game_session.get_completed_sessions(chat_id)
+        keepalive = self.request.app.config.events.keepalive
+        response = StreamResponse(
+            headers={
+                "Content-Type": "text/event-stream",
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no",
+            }
         )
+        try:
+            await response.prepare(self.request)
+            while (events := await subscription.get(keepalive)) is not None:
+                if dropped := subscription.take_dropped():
+                    await response.write(
+                        sse_message("lagged", {"dropped": dropped})
+                    )
+                if not events:
+                    await response.write(b": keepalive\n\n")
+                    continue
+                await response.write(
+                    b"".join(
+                        sse_message(event.type.value, event.to_dict(), event.id)
+                        for event in events
+                    )
+                )
+            await response.write_eof()
+        except ConnectionResetError:
+            pass
+        finally:
+            self.store.events.unsubscribe(subscription)
+        return response
+
+
+class TopRatingView(View):
+    @querystring_schema(TopLimitSchema)
+    @response_schema(TopRatingSchema)
+    async def get(self):
+        limit = self.request["querystring"]["limit"]
+
+        chats = await self.store.ratings.top_chats(limit=limit)
+        players = await self.store.ratings.top_players(limit=limit)
 
         return json_response(
             data={
-                "active_sessions": [
-                    SessionSchema().dump(session)
-                    for session in completed_sessions
-                ]
+                "chats": compile_schema(ChatRatingSchema, many=True).dump(
+                    chats
+                ),
+                "players": compile_schema(TopPlayerSchema, many=True).dump(
+                    players
+                ),
             }
         )
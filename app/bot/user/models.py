@@ -1,4 +1,12 @@
-from sqlalchemy import BigInteger, Column, String
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    text,
+)
 from sqlalchemy.orm import relationship
 
 from app.store.database.sqlalchemy_base import BaseModel, TimedBaseMixin
@@ -10,3 +18,49 @@ class UserModel(TimedBaseMixin, BaseModel):
     username_tg = Column(String, unique=True)
     id_tg = Column(BigInteger, unique=True)
     players = relationship("PlayerModel", back_populates="user")
+
+
+class UserStatsModel(TimedBaseMixin, BaseModel):
+    """Счетчики игрока. Ведутся RoundAccessor в той же транзакции,
+    что закрывает раунд, пересчитываются командой rebuild-user-stats.
+    """
+
+    __tablename__ = "user_stats"
+    __table_args__ = (
+        # Топ игроков по победам
+        Index(
+            "ix_user_stats_top",
+            text("wins DESC"),
+            text("correct_answers DESC"),
+        ),
+    )
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(
+        BigInteger,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        unique=True,
+        nullable=False,
+    )
+    total_answers = Column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    correct_answers = Column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    incorrect_answers = Column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    # Завершенные игры, в которых игрок был в составе, и победы в них
+    games_played = Column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    wins = Column(Integer, default=0, server_default="0", nullable=False)
+
+
+STATS_COLUMNS = (
+    "total_answers",
+    "correct_answers",
+    "incorrect_answers",
+    "games_played",
+    "wins",
+)
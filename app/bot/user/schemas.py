@@ -15,3 +15,5 @@ class UserInfo(Schema):
     total_answers = fields.Int()
     correct_answers = fields.Int()
     incorrect_answers = fields.Int()
+    games_played = fields.Int()
+    wins = fields.Int()
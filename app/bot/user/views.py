@@ -2,6 +2,7 @@ from aiohttp_apispec import querystring_schema, response_schema
 
 from app.bot.user.schemas import UserId, UserInfo
 from app.web.app import View
+from app.web.serializers import compile_schema
 from app.web.utils import json_response
 
 
@@ -15,4 +16,4 @@ class UserStatsListView(View):
             username_tg
         )
 
-        return json_response(data=UserInfo().dump(user_stats))
+        return json_response(data=compile_schema(UserInfo).dump(user_stats))
@@ -0,0 +1,6 @@
+from marshmallow import Schema, fields
+
+
+class MetricsSchema(Schema):
+    tg_outbox = fields.Dict()
+    db_pool = fields.Dict()
@@ -0,0 +1,16 @@
+from aiohttp_apispec import response_schema
+
+from app.monitoring.schemes import MetricsSchema
+from app.web.app import View
+from app.web.utils import json_response
+
+
+class MetricsView(View):
+    @response_schema(MetricsSchema)
+    async def get(self):
+        return json_response(
+            data={
+                "tg_outbox": self.store.tg_api.outbox.stats,
+                "db_pool": self.database.pool_stats,
+            }
+        )
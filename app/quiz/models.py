@@ -1,6 +1,6 @@
 import re
 
-from sqlalchemy import BigInteger, Column, ForeignKey, String
+from sqlalchemy import BigInteger, Column, ForeignKey, Index, String
 from sqlalchemy.orm import relationship
 
 from app.bot.game.models import RoundModel  # noqa: F401
@@ -9,6 +9,8 @@ from app.store.database.sqlalchemy_base import BaseModel, TimedBaseMixin
 
 class ThemeModel(TimedBaseMixin, BaseModel):
     __tablename__ = "themes"
+    # Keyset-пагинация списка тем
+    __table_args__ = (Index("ix_themes_created_at_id", "created_at", "id"),)
     id = Column(BigInteger, primary_key=True, autoincrement=True, unique=True)
     title = Column(String, unique=True)
     questions = relationship(
@@ -18,6 +20,16 @@ class ThemeModel(TimedBaseMixin, BaseModel):
 
 class QuestionModel(TimedBaseMixin, BaseModel):
     __tablename__ = "questions"
+    # Keyset-пагинация списка вопросов, в том числе внутри темы
+    __table_args__ = (
+        Index("ix_questions_created_at_id", "created_at", "id"),
+        Index(
+            "ix_questions_theme_id_created_at_id",
+            "theme_id",
+            "created_at",
+            "id",
+        ),
+    )
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     title = Column(String, unique=True)
     theme_id = Column(
@@ -27,12 +39,8 @@ class QuestionModel(TimedBaseMixin, BaseModel):
         unique=False,
     )
 
-    theme = relationship(
-        "ThemeModel", back_populates="questions", lazy="joined"
-    )
-    true_answer = relationship(
-        "AnswerModel", uselist=False, backref="question", lazy="joined"
-    )
+    theme = relationship("ThemeModel", back_populates="questions")
+    true_answer = relationship("AnswerModel", uselist=False, backref="question")
     rounds = relationship("RoundModel", back_populates="question")
 
     def is_answer_is_true(self, answer: str) -> bool:
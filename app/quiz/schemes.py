@@ -1,4 +1,7 @@
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate
+
+from app.store.quiz.importer import FORMATS
+from app.web.pagination import PageSchema
 
 
 class ThemeSchema(Schema):
@@ -20,11 +23,38 @@ class QuestionSchema(Schema):
 
 class ThemeListSchema(Schema):
     themes = fields.Nested(ThemeSchema, many=True)
+    next_cursor = fields.Str(allow_none=True)
+
+
+class ThemePageSchema(PageSchema):
+    item_schema = ThemeSchema
 
 
 class ThemeIdSchema(Schema):
     theme_id = fields.Int()
 
 
+class QuestionPageSchema(ThemeIdSchema, PageSchema):
+    item_schema = QuestionSchema
+
+
 class ListQuestionSchema(Schema):
     questions = fields.Nested(QuestionSchema, many=True)
+    next_cursor = fields.Str(allow_none=True)
+
+
+class ImportFormatSchema(Schema):
+    format = fields.Str(load_default="csv", validate=validate.OneOf(FORMATS))
+
+
+class ImportErrorSchema(Schema):
+    line = fields.Int()
+    error = fields.Str()
+
+
+class ImportReportSchema(Schema):
+    total = fields.Int()
+    imported = fields.Int()
+    duplicates = fields.Int()
+    invalid = fields.Int()
+    errors = fields.Nested(ImportErrorSchema, many=True)
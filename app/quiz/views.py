@@ -2,17 +2,29 @@ from aiohttp_apispec import querystring_schema, request_schema, response_schema
 
 from app.quiz.models import AnswerModel
 from app.quiz.schemes import (
+    ImportFormatSchema,
+    ImportReportSchema,
     ListQuestionSchema,
+    QuestionPageSchema,
     QuestionSchema,
-    ThemeIdSchema,
     ThemeListSchema,
+    ThemePageSchema,
     ThemeSchema,
 )
+from app.store.database.pagination import split_page
+from app.store.quiz.importer import ImportFormatError, decode_lines
 from app.web.app import View
+from app.web.cache import cached_response
 from app.web.middlewares import HTTP_ERROR_CODES
+from app.web.pagination import list_schema
+from app.web.serializers import compile_schema
 from app.web.utils import error_json_response, json_response
 
 
+async def quiz_version(view: View) -> str:
+    return str(await view.store.quizzes.get_version())
+
+
 class ThemeAddView(View):
     @request_schema(ThemeSchema)
     @response_schema(ThemeSchema)
@@ -26,15 +38,26 @@ class ThemeAddView(View):
                 http_status=409, status=HTTP_ERROR_CODES[409]
             )
 
-        return json_response(data=ThemeSchema().dump(theme))
+        return json_response(data=compile_schema(ThemeSchema).dump(theme))
 
 
 class ThemeListView(View):
+    @querystring_schema(ThemePageSchema)
     @response_schema(ThemeListSchema)
+    @cached_response(version=quiz_version)
     async def get(self):
-        themes = await self.store.quizzes.list_themes()
-        result = [{"id": theme.id, "title": theme.title} for theme in themes]
-        return json_response(data={"themes": result})
+        query = self.request["querystring"]
+        page, only = query["page"], query["only"]
+
+        themes = await self.store.quizzes.list_themes(page=page, fields=only)
+        themes, next_cursor = split_page(themes, page)
+
+        return json_response(
+            data={
+                "themes": list_schema(ThemeSchema, only).dump(themes),
+                "next_cursor": next_cursor,
+            }
+        )
 
 
 class QuestionAddView(View):
@@ -79,24 +102,41 @@ class QuestionAddView(View):
 
 
 class QuestionListView(View):
-    @querystring_schema(ThemeIdSchema)
+    @querystring_schema(QuestionPageSchema)
     @response_schema(ListQuestionSchema)
+    @cached_response(version=quiz_version)
     async def get(self):
-        theme_id = self.request.query.get("theme_id")
-        if theme_id is not None:
-            try:
-                theme_id = int(theme_id)
-            except ValueError:
-                return json_response(
-                    status=400, data={"error": "theme_id must be integer"}
-                )
+        query = self.request["querystring"]
+        page, only = query["page"], query["only"]
 
-        questions = await self.store.quizzes.list_questions(theme_id=theme_id)
+        questions = await self.store.quizzes.list_questions(
+            theme_id=query.get("theme_id"), page=page, fields=only
+        )
+        questions, next_cursor = split_page(questions, page)
 
         return json_response(
             data={
-                "questions": [
-                    QuestionSchema().dump(question) for question in questions
-                ]
+                "questions": list_schema(QuestionSchema, only).dump(questions),
+                "next_cursor": next_cursor,
             }
         )
+
+
+class QuestionImportView(View):
+    """Тело запроса - файл CSV или JSONL, читается потоком"""
+
+    @querystring_schema(ImportFormatSchema)
+    @response_schema(ImportReportSchema)
+    async def post(self):
+        try:
+            report = await self.store.quizzes.import_questions(
+                decode_lines(self.request.content),
+                fmt=self.request["querystring"]["format"],
+            )
+        except ImportFormatError as e:
+            return error_json_response(
+                http_status=400, status=HTTP_ERROR_CODES[400], message=str(e)
+            )
+        return json_response(
+            data=compile_schema(ImportReportSchema).dump(report)
+        )
@@ -1,8 +1,13 @@
 import typing
 
 from app.store.database.database import Database
+from app.store.events.bus import EventBus
 from app.store.fsm.fsm import FSMContext
+from app.store.game.archive_accessor import ArchiveAccessor
+from app.store.game.export_accessor import HistoryExportAccessor
 from app.store.game.player_accessor import PlayerAccessor
+from app.store.game.rating_accessor import RatingAccessor
+from app.store.game.reaper_accessor import SessionReaperAccessor
 from app.store.game.round_accessor import RoundAccessor
 from app.store.game.session_accessor import GameSessionAccessor
 from app.store.game.user_accessor import UserAccessor
@@ -16,6 +21,7 @@ if typing.TYPE_CHECKING:
 class Store:
     def __init__(self, app: "Application"):
         from app.store.admin.accessor import AdminAccessor
+        from app.store.bot.board import GameBoardManager
         from app.store.bot.manager import BotManager
         from app.store.quiz.accessor import QuizAccessor
         from app.store.tg_api.accessor import TelegramApiAccessor
@@ -28,14 +34,20 @@ class Store:
         self.users = UserAccessor(app)
         self.players = PlayerAccessor(app)
         self.rounds = RoundAccessor(app)
+        self.archive = ArchiveAccessor(app)
+        self.ratings = RatingAccessor(app)
+        self.history = HistoryExportAccessor(app)
+        self.reaper = SessionReaperAccessor(app)
 
         # Таймер
         self.timer_manager = TimerManager(app)
         self.rabbit = RabbitMQAccessor(app)
 
         self.tg_api = TelegramApiAccessor(app)
+        self.board = GameBoardManager(app)
         self.bots_manager = BotManager(app)
         self.fsm = FSMContext(app)
+        self.events = EventBus(app)
 
 
 def setup_store(app: "Application"):
@@ -43,3 +55,4 @@ def setup_store(app: "Application"):
     app.on_startup.append(app.database.connect)
     app.on_cleanup.append(app.database.disconnect)
     app.store = Store(app)
+    app.on_shutdown.append(app.store.events.close)
@@ -1,9 +1,18 @@
 import base64
+import time
+from functools import cached_property
 from typing import TYPE_CHECKING
 
 from sqlalchemy import select
 
 from app.admin.models import AdminModel
+from app.admin.tokens import (
+    AdminPrincipal,
+    TokenCache,
+    derive_key,
+    sign_token,
+    verify_token,
+)
 from app.base.base_accessor import BaseAccessor
 
 if TYPE_CHECKING:
@@ -20,6 +29,41 @@ class AdminAccessor(BaseAccessor):
 
         await self.create_admin(email, encode_password)
 
+    @cached_property
+    def _token_key(self) -> bytes:
+        return derive_key(self.app.config.session.key)
+
+    @cached_property
+    def _token_cache(self) -> TokenCache:
+        config = self.app.config.session
+        return TokenCache(
+            ttl=config.token_cache_ttl, max_size=config.token_cache_size
+        )
+
+    def issue_token(self, admin: AdminModel) -> str:
+        """Подписанный токен для куки сессии"""
+        return sign_token(
+            AdminPrincipal(id=admin.id, email=admin.email),
+            key=self._token_key,
+            ttl=self.app.config.session.token_ttl,
+        )
+
+    def verify_token(self, token: str) -> AdminPrincipal | None:
+        """Администратор из токена без запроса в БД.
+        Повторная проверка того же токена берется из кэша.
+        """
+        now = time.time()
+        principal = self._token_cache.get(token, now)
+        if principal is not None:
+            return principal
+
+        verified = verify_token(token, key=self._token_key, now=now)
+        if verified is None:
+            return None
+        principal, expires_at = verified
+        self._token_cache.put(token, principal, expires_at, now)
+        return principal
+
     async def get_by_email(self, email: str) -> AdminModel | None:
         async with await self.app.database.get_session() as session:
             stmt = select(AdminModel).where(AdminModel.email == email)
@@ -0,0 +1,220 @@
+import asyncio
+import time
+import typing
+from dataclasses import dataclass, field
+from logging import getLogger
+from typing import Any
+
+from app.store.bot import consts
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+
+@dataclass
+class GameBoard:
+    """Состояние закрепленного сообщения игры"""
+
+    message_id: int | None = None
+    phase: str = ""
+    captain: str | None = None
+    # username_tg -> готов ли игрок
+    roster: dict[str, bool] = field(default_factory=dict)
+    experts: int = 0
+    bot: int = 0
+    deadline: float | None = None
+    notes: list[str] = field(default_factory=list)
+    reply_markup: dict[str, Any] | None = None
+
+    def add_note(self, text: str) -> None:
+        self.notes.append(text)
+        del self.notes[: -consts.BOARD_MAX_NOTES]
+
+    def render(self) -> str:
+        roster = "\n".join(
+            consts.BOARD_PLAYER.format(
+                mark="✅" if is_ready else "▫️",
+                username=username,
+                captain=" (капитан)" if username == self.captain else "",
+            )
+            for username, is_ready in self.roster.items()
+        )
+        text = consts.BOARD_TEMPLATE.format(
+            phase=self.phase,
+            experts=self.experts,
+            bot=self.bot,
+            roster=roster or "-",
+        )
+        if self.deadline is not None:
+            left = max(0, round(self.deadline - time.monotonic()))
+            text += consts.BOARD_COUNTDOWN.format(seconds=left)
+        if self.notes:
+            text += "\n\n" + "\n".join(self.notes)
+        return text
+
+
+class GameBoardManager:
+    """Режим одного сообщения на игру.
+
+    Вместо отправки и последующего удаления коротких сообщений
+    бот держит одно закрепленное сообщение и редактирует его.
+    Изменения за BOARD_EDIT_DEBOUNCE секунд склеиваются в один
+    editMessageText. Пока у доски есть deadline, обратный отсчет
+    обновляется раз в BOARD_COUNTDOWN_STEP секунд.
+    """
+
+    def __init__(self, app: "Application"):
+        self.app = app
+        self.logger = getLogger("game_board")
+        self.boards: dict[int, GameBoard] = {}
+        self._flush_tasks: dict[int, asyncio.Task] = {}
+        self._tick_tasks: dict[int, asyncio.Task] = {}
+
+    def get(self, chat_id: int) -> GameBoard:
+        if chat_id not in self.boards:
+            self.boards[chat_id] = GameBoard()
+        return self.boards[chat_id]
+
+    async def open(
+        self,
+        chat_id: int,
+        captain: str,
+        reply_markup: dict[str, Any] | None = None,
+    ) -> GameBoard:
+        """Создает доску новой игры, сразу отправляет и закрепляет ее"""
+        self._cancel_flush(chat_id)
+        self._cancel_tick(chat_id)
+        board = GameBoard(
+            phase=consts.BOARD_PHASE_WAITING_PLAYERS,
+            captain=captain,
+            roster={captain: False},
+            reply_markup=reply_markup,
+        )
+        self.boards[chat_id] = board
+        await self.flush(chat_id)
+        return board
+
+    def update(self, chat_id: int, **changes: Any) -> GameBoard:
+        """Меняет поля доски и планирует ее перерисовку"""
+        board = self.get(chat_id)
+        for name, value in changes.items():
+            setattr(board, name, value)
+        self.schedule(chat_id)
+        return board
+
+    def note(self, chat_id: int, text: str) -> None:
+        self.get(chat_id).add_note(text)
+        self.schedule(chat_id)
+
+    def set_player(
+        self, chat_id: int, username: str, is_ready: bool | None = False
+    ) -> None:
+        """Добавляет игрока или меняет его отметку готовности.
+        is_ready=None убирает игрока с доски.
+        """
+        roster = self.get(chat_id).roster
+        if is_ready is None:
+            roster.pop(username, None)
+        else:
+            roster[username] = is_ready
+        self.schedule(chat_id)
+
+    def schedule(self, chat_id: int) -> None:
+        """Перерисовка через BOARD_EDIT_DEBOUNCE секунд.
+        Если она уже запланирована - новые изменения попадут в нее.
+        """
+        if chat_id in self._flush_tasks:
+            return
+        self._flush_tasks[chat_id] = asyncio.create_task(
+            self._delayed_flush(chat_id)
+        )
+
+    async def _delayed_flush(self, chat_id: int) -> None:
+        try:
+            await asyncio.sleep(consts.BOARD_EDIT_DEBOUNCE)
+            self._flush_tasks.pop(chat_id, None)
+            await self.flush(chat_id)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.logger.error("Не удалось обновить доску игры", exc_info=e)
+
+    def _cancel_flush(self, chat_id: int) -> None:
+        task = self._flush_tasks.pop(chat_id, None)
+        if task is not None:
+            task.cancel()
+
+    def _schedule_tick(self, chat_id: int, board: GameBoard) -> None:
+        """Следующая перерисовка отсчета, если до deadline остается
+        больше шага. Тики ложатся на кратные шагу секунды до конца,
+        последним показывается BOARD_COUNTDOWN_STEP.
+        """
+        self._cancel_tick(chat_id)
+        if board.deadline is None:
+            return
+        step = consts.BOARD_COUNTDOWN_STEP
+        left = board.deadline - time.monotonic()
+        delay = left % step
+        if delay < step / 2:
+            # Только что была отметка кратная шагу - до следующей
+            delay += step
+        if left - delay < step / 2:
+            return
+        self._tick_tasks[chat_id] = asyncio.create_task(
+            self._tick(chat_id, delay)
+        )
+
+    async def _tick(self, chat_id: int, delay: float) -> None:
+        try:
+            await asyncio.sleep(delay)
+            self._tick_tasks.pop(chat_id, None)
+            await self.flush(chat_id)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.logger.error("Не удалось обновить отсчет доски", exc_info=e)
+
+    def _cancel_tick(self, chat_id: int) -> None:
+        task = self._tick_tasks.pop(chat_id, None)
+        if task is not None:
+            task.cancel()
+
+    async def flush(self, chat_id: int) -> None:
+        board = self.boards.get(chat_id)
+        if board is None:
+            return
+        self._schedule_tick(chat_id, board)
+
+        tg_api = self.app.store.tg_api
+        if board.message_id is None:
+            mess = await tg_api.send_message(
+                chat_id=chat_id,
+                text=board.render(),
+                reply_markup=board.reply_markup,
+            )
+            board.message_id = mess.message_id
+            await tg_api.pin_chat_message(
+                chat_id=chat_id, message_id=mess.message_id
+            )
+            return
+
+        await tg_api.edit_message_text(
+            chat_id=chat_id,
+            message_id=board.message_id,
+            text=board.render(),
+            reply_markup=board.reply_markup,
+        )
+
+    async def close(self, chat_id: int, phase: str) -> None:
+        """Последняя перерисовка доски без кнопок, после чего она забывается"""
+        self._cancel_flush(chat_id)
+        self._cancel_tick(chat_id)
+        board = self.boards.get(chat_id)
+        if board is None:
+            return
+
+        board.phase = phase
+        board.deadline = None
+        board.reply_markup = None
+        await self.flush(chat_id)
+        del self.boards[chat_id]
@@ -11,6 +11,16 @@ QUESTION_DISCUTION_TIMEOUT = 60
 VERDICT_CAPTAIN_TIMEOUT = 60
 
 MAX_SCORE = 6
+# Больше раундов в одной игре не бывает
+QUESTION_DECK_SIZE = 2 * MAX_SCORE - 1
+
+# Режим доски: правки за это время склеиваются в один editMessageText
+BOARD_EDIT_DEBOUNCE = 1.0
+# Сколько последних событий показывается на доске
+BOARD_MAX_NOTES = 5
+# Шаг обратного отсчета на доске: пока идет таймер, она
+# перерисовывается раз в столько секунд
+BOARD_COUNTDOWN_STEP = 10
 
 RULES_INFO = (
     "Игра проходит между командой «Знатоков» (от 2 до 6 человек) и ботом. "
@@ -114,6 +124,10 @@ GAME_CLOSED = (
     "*Игра отменена.* Когда снова захотите "
     "интеллектуально посоревноваться - я буду на месте 🦉"
 )
+GAME_REAPED = (
+    "*Игра отменена:* слишком долго не было ходов. Когда снова захотите "
+    "интеллектуально посоревноваться - начните новую /start"
+)
 CAPTAIN_INSTUCTION = (
     "*Уважаемый капитан!*\n"
     "Отметьте кого нибудь из участников, "
@@ -133,10 +147,16 @@ WARNING_CAP_DONT_EXIST_PLAYER = (
 RATING_INFO = (
     "*Рейтинг чата* \n"
     "*Количество матчей сыграно:* {count}\n"
+    "*Побед знатоков:* {expert_wins}\n"
+    "*Побед бота:* {bot_wins}\n"
     "*Счет последней игры:* \n"
     "- Знатоки: {experts}\n"
     "- Бот: {bot}\n"
 )
+TOP_PLAYERS_LIMIT = 10
+TOP_PLAYERS_TITLE = "*Лучшие игроки*\n"
+TOP_PLAYER = "{place}. @{username} - побед: {wins}, верных ответов: {correct}"
+TOP_PLAYERS_EMPTY = "*Лучшие игроки*\nПока никто не доиграл ни одной игры."
 
 RUPOR_QUEST = (
     "*Внимание вопрос!*\n"
@@ -148,3 +168,18 @@ RUPOR_QUEST = (
     "У вас минута на обсуждение, после минуты "
     "капитан назовет кто будет отвечать. _Минута пошла!_"
 )
+
+BOARD_TEMPLATE = (
+    "*Что? Где? Когда?*\n"
+    "*Сейчас:* {phase}\n"
+    "*Счет:* Знатоки {experts} : {bot} Бот\n\n"
+    "*Игроки:*\n"
+    "{roster}"
+)
+BOARD_PLAYER = "{mark} @{username}{captain}"
+BOARD_COUNTDOWN = "\n\n⏳ Осталось ~{seconds} сек."
+BOARD_PHASE_WAITING_PLAYERS = "набор игроков"
+BOARD_PHASE_DISCUSSION = "обсуждение вопроса"
+BOARD_PHASE_VERDICT_CAPTAIN = "капитан выбирает отвечающего"
+BOARD_PHASE_WAIT_ANSWER = "отвечает @{username}"
+BOARD_PHASE_FINISHED = "игра окончена"
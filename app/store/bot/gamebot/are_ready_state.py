@@ -64,6 +64,10 @@ class AreReadyNextRoundPlayersProcessGameBot(BotBase):
         await self.player_store.set_player_is_ready(
             session_id=curr_sess.id, id_tg=user_id, new_active=True
         )
+        if self.board_mode:
+            self.board.set_player(
+                chat_id, callback.from_.username, is_ready=True
+            )
 
         active_connected_user_ids = [
             player.user.id_tg
@@ -1,3 +1,4 @@
+import time
 from typing import TYPE_CHECKING
 
 from app.bot.game.models import (
@@ -6,14 +7,16 @@ from app.bot.game.models import (
     RoundModel,
     StatusSession,
 )
-from app.quiz.models import QuestionModel
 from app.store.bot import consts
 from app.store.bot.keyboards import (
     are_ready_keyboard,
 )
+from app.store.events.bus import GameEventType
+from app.store.quiz.question_bank import CachedQuestion
 
 if TYPE_CHECKING:
     from app.store import GameSessionAccessor
+    from app.store.bot.board import GameBoardManager
     from app.web.app import Application
 
 
@@ -39,6 +42,26 @@ class BotBase:
     def player_store(self):
         return self.app.store.players
 
+    @property
+    def board_mode(self) -> bool:
+        return self.app.config.bot.board_mode is True
+
+    @property
+    def board(self) -> "GameBoardManager":
+        return self.app.store.board
+
+    def publish(
+        self,
+        event_type: GameEventType,
+        chat_id: int,
+        session_id: int | None = None,
+        **data,
+    ) -> None:
+        """Событие игры для подписчиков ленты /sessions.events"""
+        self.app.store.events.publish(
+            event_type, chat_id=chat_id, session_id=session_id, **data
+        )
+
     def _add_handlers_in_list(self):
         if self.handlers is None:
             self.handlers = []
@@ -62,6 +85,64 @@ class BotBase:
         data["unnecessary_messages"].append(message_id)
         await self.app.store.fsm.update_data(chat_id=chat_id, new_data=data)
 
+    async def notify(self, chat_id: int, text: str) -> None:
+        """Короткое информационное сообщение для чата.
+        В режиме доски попадает в ленту закрепленного сообщения,
+        иначе отправляется отдельно и позже удаляется.
+        """
+        if self.board_mode:
+            self.board.note(chat_id, text)
+            return
+
+        mess = await self.app.store.tg_api.send_message(
+            chat_id=chat_id, text=text
+        )
+        await self.add_message_in_unnecessary_messages(
+            chat_id=chat_id, message_id=mess.message_id
+        )
+
+    async def ask_ready(
+        self, chat_id: int, text: str, timeout: float | None = None
+    ) -> None:
+        """Спрашивает игроков о готовности к следующему вопросу"""
+        if self.board_mode:
+            board = self.board.get(chat_id)
+            self.board.update(
+                chat_id,
+                phase=text,
+                roster=dict.fromkeys(board.roster, False),
+                reply_markup=are_ready_keyboard,
+                deadline=time.monotonic() + timeout if timeout else None,
+            )
+            return
+
+        mess = await self.app.store.tg_api.send_message(
+            chat_id=chat_id,
+            text=text,
+            reply_markup=are_ready_keyboard,
+        )
+        await self.add_message_in_unnecessary_messages(
+            chat_id=chat_id, message_id=mess.message_id
+        )
+
+    async def next_deck_question(
+        self, chat_id: int, session_id: int
+    ) -> CachedQuestion:
+        """Следующий вопрос из колоды игры. Если колода кончилась
+        или вопрос удален - берется случайный.
+        """
+        question_id = await self.game_store.pop_deck_question(
+            session_id=session_id, chat_id=chat_id
+        )
+        question = None
+        if question_id is not None:
+            question = await self.app.store.quizzes.get_cached_question(
+                question_id
+            )
+        if question is None:
+            question = await self.app.store.quizzes.random_question()
+        return question
+
     async def deleted_unnecessary_messages(self, chat_id: int):
         data = await self.app.store.fsm.get_data(chat_id)
         if data.get("unnecessary_messages") is None:
@@ -69,7 +150,8 @@ class BotBase:
 
         unnecessary_messages = data.get("unnecessary_messages")
 
-        await self.app.store.tg_api.delete_messages(
+        # Удаление идет в фоне и не задерживает следующий шаг игры
+        await self.app.store.tg_api.delete_messages_in_background(
             chat_id, unnecessary_messages
         )
         data["unnecessary_messages"] = []
@@ -91,10 +173,20 @@ class BotBase:
         await self.game_store.set_status(
             session_id=session_id, new_status=new_status
         )
-        await self.app.store.tg_api.send_message(
+        self.publish(
+            GameEventType.SESSION_FINISHED,
+            chat_id=current_chat_id,
+            session_id=session_id,
+            status=new_status.value,
+        )
+        await self.app.store.tg_api.post_message(
             chat_id=current_chat_id,
             text=text or consts.GAME_CLOSED,
         )
+        if self.board_mode:
+            await self.board.close(
+                current_chat_id, phase=consts.BOARD_PHASE_FINISHED
+            )
 
         self.app.store.timer_manager.clean_timers(chat_id=current_chat_id)
 
@@ -109,7 +201,7 @@ class BotBase:
             chat_id=current_chat_id, inload_players=True
         )
         if not curr_sess or curr_sess.status != StatusSession.PROCESSING:
-            await self.app.store.tg_api.send_message(
+            await self.app.store.tg_api.post_message(
                 chat_id=current_chat_id,
                 text=(
                     "*У вас нет активной игровой сессии.*\n" "Начните её /start"
@@ -149,8 +241,8 @@ class BotBase:
             chat_id=current_chat_id, new_state=GameState.QUESTION_DISCUTION
         )
 
-        rand_question: QuestionModel = (
-            await self.app.store.quizzes.random_question()
+        rand_question = await self.next_deck_question(
+            chat_id=current_chat_id, session_id=session_id
         )
 
         new_round: RoundModel = await self.round_store.create_round(
@@ -159,13 +251,32 @@ class BotBase:
         await self.game_store.set_current_round(
             session_id=session_id, round_id=new_round.id
         )
+        self.publish(
+            GameEventType.ROUND_STARTED,
+            chat_id=current_chat_id,
+            session_id=session_id,
+            round_id=new_round.id,
+            question_id=rand_question.id,
+            players=len(players_is_active_is_ready),
+        )
 
-        await self.app.store.tg_api.send_message(
+        await self.app.store.tg_api.post_message(
             chat_id=current_chat_id,
             text=consts.RUPOR_QUEST.format(
                 theme=rand_question.theme.title, question=rand_question.title
             ),
         )
+        if self.board_mode:
+            self.board.update(
+                current_chat_id,
+                phase=consts.BOARD_PHASE_DISCUSSION,
+                roster={
+                    player.user.username_tg: True
+                    for player in players_is_active_is_ready
+                },
+                reply_markup=None,
+                deadline=time.monotonic() + consts.QUESTION_DISCUTION_TIMEOUT,
+            )
 
         self.app.store.timer_manager.start_timer(
             chat_id=current_chat_id,
@@ -187,7 +298,7 @@ class BotBase:
             chat_id=current_chat_id, inload_players=True
         )
         if curr_sess is None:
-            await self.app.store.tg_api.send_message(
+            await self.app.store.tg_api.post_message(
                 chat_id=current_chat_id,
                 text=(
                     "*У вас нет активной игровой сессии.*\n" "Начните её /start"
@@ -200,7 +311,7 @@ class BotBase:
             [f"· @{player.user.username_tg}" for player in curr_sess.players]
         )
 
-        await self.app.store.tg_api.send_message(
+        await self.app.store.tg_api.post_message(
             chat_id=current_chat_id,
             text=consts.MESSAGE_FOR_CAPTAIN.format(
                 players_for_answer=players_for_answer
@@ -209,6 +320,12 @@ class BotBase:
         await self.app.store.fsm.set_state(
             chat_id=current_chat_id, new_state=GameState.VERDICT_CAPTAIN
         )
+        if self.board_mode:
+            self.board.update(
+                current_chat_id,
+                phase=consts.BOARD_PHASE_VERDICT_CAPTAIN,
+                deadline=time.monotonic() + consts.VERDICT_CAPTAIN_TIMEOUT,
+            )
         # Устанавливаем таймер на 2 минуты
         # Если за две минуты капитан не выберет
         # отвечающего - игра отменится автоматически.
@@ -227,16 +344,37 @@ class BotBase:
         self,
         session_id: int,
         chat_id: int,
+        score: dict | None,
     ) -> bool:
-        score = await self.game_store.gen_score(session_id=session_id)
+        """Объявляет счет, который вернул close_round, и завершает игру,
+        если кто-то набрал MAX_SCORE.
+        score равен None, если раунд уже закрыл другой обработчик:
+        тогда объявлять нечего.
+        :return: Продолжать ли игру
+        """
+        if score is None:
+            return False
 
-        await self.app.store.tg_api.send_message(
+        self.publish(
+            GameEventType.SCORE_CHANGED,
             chat_id=chat_id,
-            text=consts.RUPOR_SCORE.format(
-                experts=score.get("experts"), bot=score.get("bot")
-            ),
+            session_id=session_id,
+            experts=score.get("experts"),
+            bot=score.get("bot"),
         )
 
+        if self.board_mode:
+            self.board.update(
+                chat_id, experts=score.get("experts"), bot=score.get("bot")
+            )
+        else:
+            await self.app.store.tg_api.post_message(
+                chat_id=chat_id,
+                text=consts.RUPOR_SCORE.format(
+                    experts=score.get("experts"), bot=score.get("bot")
+                ),
+            )
+
         if score.get("experts") == consts.MAX_SCORE:
             await self.cancel_game(
                 session_id=session_id,
@@ -264,22 +402,22 @@ class BotBase:
             session_id=session_id
         )
 
-        await self.round_store.set_is_correct_answer(
-            session_id=session_id, new_is_correct_answer=False
-        )
-        await self.round_store.set_is_active_to_false(session_id=session_id)
-        await self.check_and_notify_score(
-            session_id=session_id, chat_id=current_chat_id
+        score = await self.round_store.close_round(
+            session_id=session_id, is_correct=False
         )
-
-        mess = await self.app.store.tg_api.send_message(
+        self.publish(
+            GameEventType.ROUND_CLOSED,
             chat_id=current_chat_id,
-            text=text,
-            reply_markup=are_ready_keyboard,
+            session_id=session_id,
+            is_correct=False,
         )
-        await self.add_message_in_unnecessary_messages(
-            chat_id=current_chat_id, message_id=mess.message_id
+        should_continue = await self.check_and_notify_score(
+            session_id=session_id, chat_id=current_chat_id, score=score
         )
+        if not should_continue:
+            return
+
+        await self.ask_ready(chat_id=current_chat_id, text=text)
 
         await self.app.store.fsm.set_state(
             chat_id=current_chat_id,
@@ -291,13 +429,8 @@ class BotBase:
             session_id=session_id
         )
 
-        mess = await self.app.store.tg_api.send_message(
-            chat_id=chat_id,
-            text=text,
-            reply_markup=are_ready_keyboard,
-        )
-        await self.add_message_in_unnecessary_messages(
-            chat_id=chat_id, message_id=mess.message_id
+        await self.ask_ready(
+            chat_id=chat_id, text=text, timeout=consts.ARE_READY_TIMEOUT
         )
 
         await self.app.store.fsm.set_state(
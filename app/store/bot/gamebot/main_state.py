@@ -8,6 +8,7 @@ from app.store.bot.utils import (
     TypeFilter,
     filtered_handler,
 )
+from app.store.events.bus import GameEventType
 from app.store.rabbit.dataclasses import CallbackTG, CommandTG
 
 
@@ -25,7 +26,7 @@ class MainGameBot(BotBase):
         )
 
         if active_sess is None:
-            await self.app.store.tg_api.send_message(
+            await self.app.store.tg_api.post_message(
                 chat_id=chat_id, text=consts.DONT_EXIST_GAME_IN_CHAT
             )
             return
@@ -42,7 +43,7 @@ class MainGameBot(BotBase):
                     current_chat_id=chat_id, session_id=active_sess.id
                 )
                 return
-            await self.app.store.tg_api.send_message(
+            await self.app.store.tg_api.post_message(
                 text=consts.CANCEL_GAME_ONLY_CAP,
                 chat_id=chat_id,
             )
@@ -60,10 +61,20 @@ class MainGameBot(BotBase):
             chat_id=chat_id
         )
         if active_sess is None:
-            await self.game_store.create_session(
+            new_sess = await self.game_store.create_session(
                 chat_id=chat_id,
                 status=StatusSession.PENDING,
             )
+            if new_sess is None:
+                # Параллельный /start успел создать игру раньше
+                text = consts.EXIST_GAME_CAN_EXIT
+                reply = None
+            else:
+                self.publish(
+                    GameEventType.SESSION_CREATED,
+                    chat_id=chat_id,
+                    session_id=new_sess.id,
+                )
 
         elif active_sess.status == StatusSession.PENDING:
             pass
@@ -108,6 +119,13 @@ class MainGameBot(BotBase):
             username_tg=callback.from_.username,
             is_captain=True,
         )
+        self.publish(
+            GameEventType.PLAYER_JOINED,
+            chat_id=chat_id,
+            session_id=curr_sess.id,
+            username=callback.from_.username,
+            is_captain=True,
+        )
 
         await self.deleted_unnecessary_messages(chat_id=chat_id)
 
@@ -115,25 +133,36 @@ class MainGameBot(BotBase):
             callback_query_id=callback.id_,
             text=consts.ALERT_FOR_CAP,
         )
-        mess = await self.app.store.tg_api.send_message(
-            chat_id=chat_id,
-            text=consts.INFORMATION_ABOUT_CAP.format(
-                username=callback.from_.username
-            ),
-            reply_markup=start_game_keyboard,
-        )
+        if self.board_mode:
+            await self.board.open(
+                chat_id=chat_id,
+                captain=callback.from_.username,
+                reply_markup=start_game_keyboard,
+            )
+        else:
+            mess = await self.app.store.tg_api.send_message(
+                chat_id=chat_id,
+                text=consts.INFORMATION_ABOUT_CAP.format(
+                    username=callback.from_.username
+                ),
+                reply_markup=start_game_keyboard,
+            )
+            await self.add_message_in_unnecessary_messages(
+                chat_id=chat_id, message_id=mess.message_id
+            )
 
-        # Меняем статусы и состояние, также добавляем
-        # mess.id в ненужные сообщение
+        # Меняем статусы и состояние
         await self.game_store.set_status(
             session_id=curr_sess.id, new_status=StatusSession.PROCESSING
         )
+        self.publish(
+            GameEventType.SESSION_STARTED,
+            chat_id=chat_id,
+            session_id=curr_sess.id,
+        )
         await self.app.store.fsm.set_state(
             chat_id=chat_id, new_state=GameState.WAITING_FOR_PLAYERS
         )
-        await self.add_message_in_unnecessary_messages(
-            chat_id=chat_id, message_id=mess.message_id
-        )
 
     @filtered_handler(TypeFilter(CallbackTG), CallbackDataFilter("show_rules"))
     async def handle_show_rules(
@@ -152,29 +181,49 @@ class MainGameBot(BotBase):
         self, callback: CallbackTG, context: GameState | None
     ) -> None:
         """Выдает рейтинг чата"""
-        completed_sessions = await self.game_store.get_completed_sessions(
+        rating = await self.app.store.ratings.get_chat_rating(
             chat_id=callback.chat.id_
         )
-        if completed_sessions is None or len(completed_sessions) == 0:
-            experts = 0
-            bot = 0
-
-        else:
-            last_game_sess = completed_sessions[0]
-            score: dict = await self.game_store.gen_score(
-                session_id=last_game_sess.id
-            )
-            experts = score.get("experts")
-            bot = score.get("bot")
 
         bot_message = await self.app.store.tg_api.send_message(
             callback.chat.id_,
             consts.RATING_INFO.format(
-                count=len(completed_sessions),
-                experts=experts,
-                bot=bot,
+                count=rating.games_played if rating else 0,
+                expert_wins=rating.expert_wins if rating else 0,
+                bot_wins=rating.bot_wins if rating else 0,
+                experts=rating.last_experts_score if rating else 0,
+                bot=rating.last_bot_score if rating else 0,
             ),
         )
         await self.add_message_in_unnecessary_messages(
             chat_id=callback.chat.id_, message_id=bot_message.message_id
         )
+
+    @filtered_handler(TypeFilter(CommandTG), TextFilter("/top"))
+    async def handle_top_command(
+        self, command: CommandTG, context: GameState | None
+    ) -> None:
+        """Лучшие игроки по всем чатам"""
+        chat_id = command.chat.id_
+        players = await self.app.store.ratings.top_players(
+            limit=consts.TOP_PLAYERS_LIMIT
+        )
+        if players:
+            text = consts.TOP_PLAYERS_TITLE + "\n".join(
+                consts.TOP_PLAYER.format(
+                    place=place,
+                    username=player["username_tg"],
+                    wins=player["wins"],
+                    correct=player["correct_answers"],
+                )
+                for place, player in enumerate(players, start=1)
+            )
+        else:
+            text = consts.TOP_PLAYERS_EMPTY
+
+        mess = await self.app.store.tg_api.send_message(
+            chat_id=chat_id, text=text
+        )
+        await self.add_message_in_unnecessary_messages(
+            chat_id=chat_id, message_id=mess.message_id
+        )
@@ -1,3 +1,5 @@
+import time
+
 from app.bot.game.models import GameState
 from app.store.bot import consts
 from app.store.bot.gamebot.base import BotBase
@@ -14,12 +16,7 @@ class VerdictCaptain(BotBase):
     ) -> None:
         chat_id = message.chat.id_
         if message.entities is None:
-            mess = await self.app.store.tg_api.send_message(
-                chat_id=chat_id, text=consts.CAPTAIN_INSTUCTION
-            )
-            await self.add_message_in_unnecessary_messages(
-                chat_id=chat_id, message_id=mess.message_id
-            )
+            await self.notify(chat_id=chat_id, text=consts.CAPTAIN_INSTUCTION)
             return
 
         for entity in message.entities:
@@ -32,12 +29,9 @@ class VerdictCaptain(BotBase):
                     session_id=curr_sess.id, id_tg=message.from_.id_
                 )
                 if curr_player is None or not curr_player.is_captain:
-                    mess = await self.app.store.tg_api.send_message(
+                    await self.notify(
                         chat_id=chat_id, text=consts.WARNING_CAPTAIN_ONLY
                     )
-                    await self.add_message_in_unnecessary_messages(
-                        chat_id=chat_id, message_id=mess.message_id
-                    )
                     return
 
                 chosen_player = (
@@ -64,6 +58,15 @@ class VerdictCaptain(BotBase):
                     await self.app.store.fsm.set_state(
                         chat_id=chat_id, new_state=GameState.WAIT_ANSWER
                     )
+                    if self.board_mode:
+                        self.board.update(
+                            chat_id,
+                            phase=consts.BOARD_PHASE_WAIT_ANSWER.format(
+                                username=chosen_player.user.username_tg
+                            ),
+                            deadline=time.monotonic()
+                            + consts.WAIT_ANSWER_TIMEOUT,
+                        )
                     mess = await self.app.store.tg_api.send_message(
                         chat_id=chat_id,
                         text=consts.PLAYER_QUESTION_INSTRUCTION.format(
@@ -86,9 +89,6 @@ class VerdictCaptain(BotBase):
                         "Готовы к следующему вопросу?",
                     )
                     return
-                mess = await self.app.store.tg_api.send_message(
+                await self.notify(
                     chat_id=chat_id, text=consts.WARNING_CAP_DONT_EXIST_PLAYER
                 )
-                await self.add_message_in_unnecessary_messages(
-                    chat_id=chat_id, message_id=mess.message_id
-                )
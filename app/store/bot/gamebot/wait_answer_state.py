@@ -10,6 +10,7 @@ from app.store.bot.utils import (
     escape_markdown,
     filtered_handler,
 )
+from app.store.events.bus import GameEventType
 from app.store.rabbit.dataclasses import MessageTG
 
 
@@ -30,7 +31,7 @@ class WaitAnswer(BotBase):
         """
         chat_id = message.chat.id_
         curr_sess = await self.game_store.get_active_session_by_chat_id(
-            chat_id=chat_id,
+            chat_id=chat_id, include_curr_round=True
         )
         current_round: RoundModel = curr_sess.current_round
         question: QuestionModel = current_round.question
@@ -50,7 +51,7 @@ class WaitAnswer(BotBase):
 
         is_correct_answer = question.is_answer_is_true(message.text)
         if is_correct_answer and question.true_answer.description:
-            await self.app.store.tg_api.send_message(
+            await self.app.store.tg_api.post_message(
                 chat_id=chat_id,
                 text=consts.DESCRIPTION_ANSWER.format(
                     description=escape_markdown(
@@ -62,7 +63,7 @@ class WaitAnswer(BotBase):
             await asyncio.sleep(3)
 
         if is_correct_answer:
-            await self.app.store.tg_api.send_message(
+            await self.app.store.tg_api.post_message(
                 chat_id=chat_id,
                 text=consts.IS_ANSWER_TRUE.format(
                     answer=question.true_answer.title
@@ -70,20 +71,25 @@ class WaitAnswer(BotBase):
             )
 
         else:
-            await self.app.store.tg_api.send_message(
+            await self.app.store.tg_api.post_message(
                 chat_id=chat_id,
                 text=consts.IS_ANSWER_FALSE.format(
                     answer=question.true_answer.title
                 ),
             )
 
-        await self.round_store.set_is_correct_answer(
-            session_id=curr_sess.id, new_is_correct_answer=is_correct_answer
+        score = await self.round_store.close_round(
+            session_id=curr_sess.id, is_correct=is_correct_answer
+        )
+        self.publish(
+            GameEventType.ROUND_CLOSED,
+            chat_id=chat_id,
+            session_id=curr_sess.id,
+            is_correct=is_correct_answer,
         )
-        await self.round_store.set_is_active_to_false(session_id=curr_sess.id)
 
         should_continue = await self.check_and_notify_score(
-            session_id=curr_sess.id, chat_id=chat_id
+            session_id=curr_sess.id, chat_id=chat_id, score=score
         )
         if should_continue:
             await self.next_quest(
@@ -8,6 +8,7 @@ from app.store.bot.utils import (
     TypeFilter,
     filtered_handler,
 )
+from app.store.events.bus import GameEventType
 from app.store.rabbit.dataclasses import CallbackTG
 
 
@@ -68,14 +69,20 @@ class WaitingPlayersProcessGameBot(BotBase):
                 id_tg=user_id,
                 username_tg=callback.from_.username,
             )
+        self.publish(
+            GameEventType.PLAYER_JOINED,
+            chat_id=chat_id,
+            session_id=curr_sess.id,
+            username=callback.from_.username,
+            is_captain=False,
+        )
 
-        mess = await self.app.store.tg_api.send_message(
+        if self.board_mode:
+            self.board.set_player(chat_id, callback.from_.username)
+        await self.notify(
             chat_id=chat_id,
             text=PLAYER_JOINED.format(username=callback.from_.username),
         )
-        await self.add_message_in_unnecessary_messages(
-            chat_id=chat_id, message_id=mess.message_id
-        )
         await self.app.store.tg_api.answer_callback_query(
             callback_query_id=callback.id_, text=consts.YOU_PLAYER_WITH_GAME
         )
@@ -131,6 +138,11 @@ class WaitingPlayersProcessGameBot(BotBase):
             )
             await self.deleted_unnecessary_messages(chat_id=callback.chat.id_)
 
+            await self.game_store.draw_question_deck(
+                session_id=curr_sess.id,
+                chat_id=chat_id,
+                size=consts.QUESTION_DECK_SIZE,
+            )
             await self.next_quest(
                 text=consts.ARE_YOU_READY_FIRST_QUEST,
                 chat_id=chat_id,
@@ -192,16 +204,23 @@ class WaitingPlayersProcessGameBot(BotBase):
             await self.player_store.set_player_is_active(
                 session_id=curr_sess.id, id_tg=user_id, new_active=False
             )
+            self.publish(
+                GameEventType.PLAYER_LEFT,
+                chat_id=chat_id,
+                session_id=curr_sess.id,
+                username=callback.from_.username,
+            )
 
-            mess = await self.app.store.tg_api.send_message(
+            if self.board_mode:
+                self.board.set_player(
+                    chat_id, callback.from_.username, is_ready=None
+                )
+            await self.notify(
                 chat_id=chat_id,
                 text=consts.PLAYER_EXIT.format(
                     username=callback.from_.username
                 ),
             )
-            await self.add_message_in_unnecessary_messages(
-                chat_id=chat_id, message_id=mess.message_id
-            )
             await self.app.store.tg_api.answer_callback_query(
                 callback_query_id=callback.id_, text=consts.YOU_EXIT_GAME
             )
@@ -1,7 +1,12 @@
+import asyncio
+import time
+from dataclasses import dataclass as std_dataclass
+from logging import getLogger
 from typing import TYPE_CHECKING, Any
+from uuid import uuid4
 
 from attr import dataclass
-from sqlalchemy import URL
+from sqlalchemy import URL, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -9,11 +14,28 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.store.database.sqlalchemy_base import BaseModel
 
 if TYPE_CHECKING:
     from app.web.app import Application
+    from app.web.config import (
+        DatabaseConfig as WebDatabaseConfig,
+        ReplicaConfig,
+    )
+
+# Отставание реплики в секундах. Если реплика проиграла все, что получила,
+# отставания нет, даже если последняя транзакция была давно.
+# Отдельная БД не в режиме восстановления считается актуальной копией.
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE("
+    "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
 
 
 @dataclass
@@ -25,13 +47,93 @@ class DatabaseConfig:
     password: str | None = None
 
 
+@std_dataclass
+class PoolMetrics:
+    """Время ожидания свободного соединения из пула"""
+
+    waits: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+    def observe_wait(self, seconds: float) -> None:
+        self.waits += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+
+
+def instrumented_pool(metrics: PoolMetrics) -> type[AsyncAdaptedQueuePool]:
+    """Класс пула, который пишет время выдачи соединения в metrics.
+    Класс, а не экземпляр, потому что пул пересоздается движком.
+    """
+
+    class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                metrics.observe_wait(time.perf_counter() - started)
+
+    return InstrumentedQueuePool
+
+
+def engine_options(db_config: "WebDatabaseConfig") -> dict[str, Any]:
+    """Параметры пула и драйвера для create_async_engine"""
+    connect_args: dict[str, Any] = {
+        "server_settings": {"application_name": db_config.application_name},
+        "statement_cache_size": db_config.statement_cache_size,
+        "prepared_statement_cache_size": db_config.statement_cache_size,
+    }
+    if db_config.pgbouncer:
+        # PgBouncer отдает каждой транзакции любое серверное соединение,
+        # поэтому подготовленные запросы не кэшируются, а имена у них
+        # уникальные, чтобы не пересечься с чужими на том же соединении
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = (
+            lambda: f"__asyncpg_{uuid4()}__"
+        )
+
+    return {
+        "pool_size": db_config.pool_size,
+        "max_overflow": db_config.max_overflow,
+        "pool_timeout": db_config.pool_timeout,
+        "pool_recycle": db_config.pool_recycle,
+        "pool_pre_ping": db_config.pool_pre_ping,
+        "connect_args": connect_args,
+    }
+
+
+def replica_url(
+    db_config: "WebDatabaseConfig", replica: "ReplicaConfig"
+) -> URL:
+    return URL.create(
+        drivername="postgresql+asyncpg",
+        host=replica.host,
+        database=replica.database or db_config.database,
+        username=replica.user or db_config.user,
+        password=replica.password or db_config.password,
+        port=replica.port or db_config.port,
+    )
+
+
 class Database:
     def __init__(self, app: "Application") -> None:
         self.app = app
+        self.logger = getLogger("database")
 
         self.engine: AsyncEngine | None = None
         self._db: type[DeclarativeBase] = BaseModel
         self.session: async_sessionmaker[AsyncSession] | None = None
+        self.pool_metrics = PoolMetrics()
+
+        # Реплика только для чтения, см. get_read_session
+        self.replica_engine: AsyncEngine | None = None
+        self.replica_session: async_sessionmaker[AsyncSession] | None = None
+        self.replica_healthy = False
+        self.replica_lag: float | None = None
+        self._replica_checked_at: float | None = None
+        self._replica_check_lock = asyncio.Lock()
 
     async def connect(self, *args: Any, **kwargs: Any) -> None:
         if self.engine:
@@ -47,6 +149,8 @@ class Database:
                 password=db_config.password,
                 port=db_config.port,
             ),
+            poolclass=instrumented_pool(self.pool_metrics),
+            **engine_options(db_config),
             # echo=True,
         )
         self.session = async_sessionmaker(
@@ -56,11 +160,108 @@ class Database:
             autoflush=False,
         )
 
+        if db_config.replica is not None:
+            self.replica_engine = create_async_engine(
+                replica_url(db_config, db_config.replica),
+                **engine_options(db_config),
+            )
+            self.replica_session = async_sessionmaker(
+                bind=self.replica_engine,
+                class_=AsyncSession,
+                expire_on_commit=False,
+                autoflush=False,
+            )
+
     async def disconnect(self, *args: Any, **kwargs: Any) -> None:
         if self.engine:
             await self.engine.dispose()
+        if self.replica_engine:
+            await self.replica_engine.dispose()
 
     async def get_session(self) -> AsyncSession:
         if not self.session:
             raise RuntimeError("Database is not connected")
         return self.session()
+
+    async def get_read_session(self) -> AsyncSession:
+        """Сессия для запросов только на чтение.
+        Идет на реплику, если она настроена, отвечает и отстает
+        не больше max_lag, иначе на основную БД.
+        """
+        if await self.replica_available():
+            return self.replica_session()
+        return await self.get_session()
+
+    async def replica_available(self) -> bool:
+        """Состояние реплики перепроверяется не чаще check_interval"""
+        replica = self.app.config.database.replica
+        if replica is None or self.replica_session is None:
+            return False
+
+        if self._replica_check_due(replica):
+            async with self._replica_check_lock:
+                if self._replica_check_due(replica):
+                    await self.check_replica()
+        return self.replica_healthy
+
+    def _replica_check_due(self, replica: "ReplicaConfig") -> bool:
+        checked_at = self._replica_checked_at
+        return (
+            checked_at is None
+            or time.monotonic() - checked_at >= replica.check_interval
+        )
+
+    async def check_replica(self) -> None:
+        replica = self.app.config.database.replica
+        try:
+            lag = await asyncio.wait_for(
+                self._fetch_replica_lag(), replica.check_timeout
+            )
+        except Exception as e:
+            if self.replica_healthy or self._replica_checked_at is None:
+                self.logger.warning(
+                    "Реплика недоступна, чтение идет в основную БД",
+                    exc_info=e,
+                )
+            self.replica_lag = None
+            self.replica_healthy = False
+        else:
+            healthy = lag <= replica.max_lag
+            if not healthy and self.replica_healthy:
+                self.logger.warning(
+                    "Реплика отстает на %.1f сек, чтение идет в основную БД",
+                    lag,
+                )
+            self.replica_lag = lag
+            self.replica_healthy = healthy
+        self._replica_checked_at = time.monotonic()
+
+    async def _fetch_replica_lag(self) -> float:
+        async with self.replica_engine.connect() as conn:
+            return float(await conn.scalar(REPLICA_LAG_QUERY))
+
+    @property
+    def pool_stats(self) -> dict[str, Any]:
+        """Состояние пула для /service.metrics"""
+        metrics = self.pool_metrics
+        stats: dict[str, Any] = {
+            "waits": metrics.waits,
+            "wait_avg": metrics.wait_total / metrics.waits
+            if metrics.waits
+            else 0.0,
+            "wait_max": metrics.wait_max,
+        }
+        if self.engine is not None:
+            pool = self.engine.pool
+            stats.update(
+                size=pool.size(),
+                in_use=pool.checkedout(),
+                idle=pool.checkedin(),
+                overflow=pool.overflow(),
+            )
+        if self.replica_session is not None:
+            stats["replica"] = {
+                "healthy": self.replica_healthy,
+                "lag": self.replica_lag,
+            }
+        return stats
@@ -0,0 +1,79 @@
+"""Keyset-пагинация списков по (created_at, id).
+
+Следующая страница начинается строго после последней строки
+предыдущей, поэтому ее стоимость не зависит от номера страницы
+(в отличие от OFFSET) и строки не дублируются при вставках.
+"""
+
+import base64
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import Select, literal, tuple_
+
+
+@dataclass(slots=True, frozen=True)
+class Cursor:
+    """Позиция последней строки страницы"""
+
+    created_at: datetime
+    id: int
+
+    def encode(self) -> str:
+        raw = f"{self.created_at.isoformat()}|{self.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @classmethod
+    def decode(cls, token: str) -> "Cursor":
+        """:raises ValueError: если курсор испорчен"""
+        raw = base64.urlsafe_b64decode(token.encode()).decode()
+        created_at, _, id_ = raw.rpartition("|")
+        return cls(created_at=datetime.fromisoformat(created_at), id=int(id_))
+
+
+@dataclass(slots=True, frozen=True)
+class Page:
+    limit: int
+    after: Cursor | None = None
+
+
+def paginate(
+    stmt: Select,
+    created_at,
+    id_,
+    page: Page | None,
+    descending: bool = False,
+) -> Select:
+    """Сортирует stmt по (created_at, id) и, если задана страница,
+    оставляет строки после page.after. Выбирается на одну строку
+    больше limit, чтобы split_page узнал, есть ли продолжение.
+    """
+    if descending:
+        stmt = stmt.order_by(created_at.desc(), id_.desc())
+    else:
+        stmt = stmt.order_by(created_at, id_)
+    if page is None:
+        return stmt
+
+    if page.after is not None:
+        key = tuple_(created_at, id_)
+        after = tuple_(
+            literal(page.after.created_at, created_at.type),
+            literal(page.after.id, id_.type),
+        )
+        stmt = stmt.where(key < after if descending else key > after)
+    return stmt.limit(page.limit + 1)
+
+
+def split_page(
+    items: Sequence, page: Page | None
+) -> tuple[Sequence, str | None]:
+    """Отрезает лишнюю строку, выбранную paginate
+    :return: Строки страницы и курсор следующей (None, если это последняя)
+    """
+    if page is None or len(items) <= page.limit:
+        return items, None
+    items = items[: page.limit]
+    last = items[-1]
+    return items, Cursor(created_at=last.created_at, id=last.id).encode()
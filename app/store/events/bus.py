@@ -0,0 +1,165 @@
+import asyncio
+import enum
+import itertools
+import time
+import typing
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+
+class GameEventType(enum.Enum):
+    SESSION_CREATED = "session_created"
+    SESSION_STARTED = "session_started"
+    PLAYER_JOINED = "player_joined"
+    PLAYER_LEFT = "player_left"
+    ROUND_STARTED = "round_started"
+    ROUND_CLOSED = "round_closed"
+    SCORE_CHANGED = "score_changed"
+    SESSION_FINISHED = "session_finished"
+
+
+@dataclass(slots=True, frozen=True)
+class GameEvent:
+    id: int
+    type: GameEventType
+    chat_id: int
+    session_id: int | None
+    created_at: float
+    data: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "type": self.type.value,
+            "chat_id": self.chat_id,
+            "session_id": self.session_id,
+            "created_at": self.created_at,
+            **self.data,
+        }
+
+
+class TooManySubscribersError(Exception):
+    pass
+
+
+class Subscription:
+    """Буфер событий одного подписчика.
+
+    Буфер ограничен: если подписчик не успевает читать, самые старые
+    события вытесняются, а их число копится в dropped. Издатель
+    никогда не ждет подписчика.
+    """
+
+    def __init__(self, chat_id: int | None, buffer_size: int):
+        self.chat_id = chat_id
+        self.dropped = 0
+        self.closed = False
+        self._buffer: deque[GameEvent] = deque(maxlen=buffer_size)
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def matches(self, event: GameEvent) -> bool:
+        return self.chat_id is None or self.chat_id == event.chat_id
+
+    def put(self, event: GameEvent) -> None:
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append(event)
+        self._ready.set()
+
+    def close(self) -> None:
+        self.closed = True
+        self._ready.set()
+
+    def take_dropped(self) -> int:
+        """Число вытесненных событий с прошлого вызова"""
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+    async def get(self, timeout: float) -> list[GameEvent] | None:
+        """Ждет событий не дольше timeout
+        :return: Все накопленные события (пустой список по таймауту)
+        или None, если подписка закрыта и буфер пуст
+        """
+        if not self._buffer and not self.closed:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except TimeoutError:
+                pass
+        self._ready.clear()
+        if self.closed and not self._buffer:
+            return None
+        events = list(self._buffer)
+        self._buffer.clear()
+        return events
+
+
+class EventBus:
+    """Шина событий игр внутри процесса.
+
+    Обработчики бота публикуют события жизненного цикла игр,
+    потоковые ручки admin API подписываются на них. Если подписчиков
+    нет, publish ничего не делает.
+    """
+
+    def __init__(self, app: "Application"):
+        self.app = app
+        self._subscriptions: set[Subscription] = set()
+        self._ids = itertools.count(1)
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, chat_id: int | None = None) -> Subscription:
+        """:raises TooManySubscribersError: если достигнут лимит подписчиков"""
+        config = self.app.config.events
+        if len(self._subscriptions) >= config.max_subscribers:
+            raise TooManySubscribersError
+        subscription = Subscription(
+            chat_id=chat_id, buffer_size=config.buffer_size
+        )
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.close()
+        self._subscriptions.discard(subscription)
+
+    def publish(
+        self,
+        event_type: GameEventType,
+        chat_id: int,
+        session_id: int | None = None,
+        **data: Any,
+    ) -> GameEvent | None:
+        """Раздает событие подписчикам чата без ожидания
+        :return: Событие или None, если подписчиков нет
+        """
+        if not self._subscriptions:
+            return None
+        event = GameEvent(
+            id=next(self._ids),
+            type=event_type,
+            chat_id=chat_id,
+            session_id=session_id,
+            created_at=time.time(),
+            data=data,
+        )
+        for subscription in self._subscriptions:
+            if subscription.matches(event):
+                subscription.put(event)
+        return event
+
+    async def close(self, app: "Application") -> None:
+        """Закрывает подписки, чтобы потоковые ответы завершились
+        до остановки сервера
+        """
+        for subscription in self._subscriptions:
+            subscription.close()
+        self._subscriptions.clear()
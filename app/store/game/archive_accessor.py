@@ -0,0 +1,239 @@
+import asyncio
+import contextlib
+from datetime import UTC, date, datetime, timedelta
+
+from sqlalchemy import (
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+)
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
+
+from app.base.base_accessor import BaseAccessor
+from app.bot.game.models import (
+    PlayerModel,
+    RoundModel,
+    SessionArchiveModel,
+    SessionModel,
+    StateModel,
+    StatusSession,
+)
+from app.web.config import ArchiveConfig
+
+FINISHED_STATUSES = (StatusSession.COMPLETED, StatusSession.CANCELLED)
+
+
+def add_months(day: date, months: int) -> date:
+    """Первое число месяца, отстоящего от day на months"""
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+class ArchiveAccessor(BaseAccessor):
+    """Фоновое обслуживание таблиц игры.
+
+    Заранее создает месячные секции players и rounds и переносит
+    давно закончившиеся игры в sessions_archive, чтобы в рабочих
+    таблицах и их индексах оставались в основном текущие игры.
+    """
+
+    def __init__(self, app, *args, **kwargs):
+        super().__init__(app, *args, **kwargs)
+        self._task: asyncio.Task | None = None
+
+    @property
+    def config(self) -> ArchiveConfig:
+        return self.app.config.archive or ArchiveConfig()
+
+    async def connect(self, app):
+        if self.config.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def disconnect(self, app):
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.logger.error("Архиватор игр упал", exc_info=e)
+            await asyncio.sleep(self.config.interval)
+
+    async def run_once(self) -> int:
+        """Один проход архиватора
+        :return: Сколько игр перенесено в архив
+        """
+        config = self.config
+        await self.create_partitions(months_ahead=config.partitions_ahead)
+
+        older_than = datetime.now(UTC) - timedelta(
+            days=config.archive_after_days
+        )
+        total = 0
+        while True:
+            moved = await self.archive_finished_sessions(
+                older_than=older_than, batch_size=config.batch_size
+            )
+            total += moved
+            if moved < config.batch_size:
+                break
+
+        if total:
+            self.logger.info("В архив перенесено игр: %s", total)
+        return total
+
+    async def create_partitions(self, months_ahead: int) -> None:
+        """Секции players и rounds с текущего месяца на months_ahead вперед"""
+        today = datetime.now(UTC).date()
+        async with await self.app.database.get_session() as session:
+            for table in (PlayerModel.__tablename__, RoundModel.__tablename__):
+                await session.execute(
+                    select(
+                        func.create_monthly_partitions(
+                            table, today, add_months(today, months_ahead)
+                        )
+                    )
+                )
+            await session.commit()
+
+    async def archive_finished_sessions(
+        self, older_than: datetime, batch_size: int
+    ) -> int:
+        """Переносит до batch_size игр, закончившихся раньше older_than.
+        Одним запросом: строка в sessions_archive, удаление state
+        и сессии, игроки и раунды удаляются каскадом.
+        :return: Сколько игр перенесено
+        """
+        finished = (
+            select(SessionModel.id)
+            .where(
+                SessionModel.status.in_(FINISHED_STATUSES),
+                func.coalesce(SessionModel.updated_at, SessionModel.created_at)
+                < older_than,
+            )
+            .order_by(SessionModel.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("finished")
+        )
+        archived = (
+            insert(SessionArchiveModel)
+            .from_select(
+                [
+                    SessionArchiveModel.id,
+                    SessionArchiveModel.chat_id,
+                    SessionArchiveModel.status,
+                    SessionArchiveModel.experts_score,
+                    SessionArchiveModel.bot_score,
+                    SessionArchiveModel.rounds_played,
+                    SessionArchiveModel.created_at,
+                    SessionArchiveModel.finished_at,
+                    SessionArchiveModel.data,
+                ],
+                select(
+                    SessionModel.id,
+                    SessionModel.chat_id,
+                    SessionModel.status,
+                    SessionModel.experts_score,
+                    SessionModel.bot_score,
+                    SessionModel.rounds_played,
+                    SessionModel.created_at,
+                    func.coalesce(
+                        SessionModel.updated_at, SessionModel.created_at
+                    ),
+                    self._session_document(),
+                ).where(SessionModel.id.in_(select(finished.c.id))),
+            )
+            .returning(SessionArchiveModel.id)
+            .cte("archived")
+        )
+        dropped_states = (
+            delete(StateModel)
+            .where(StateModel.session_id.in_(select(archived.c.id)))
+            .cte("dropped_states")
+        )
+        stmt = (
+            delete(SessionModel)
+            .where(SessionModel.id.in_(select(archived.c.id)))
+            .returning(SessionModel.id)
+            .add_cte(dropped_states)
+            # Иначе ORM синхронизирует сессию через свой RETURNING
+            # и теряет наш: ResourceClosedError
+            .execution_options(synchronize_session=False)
+        )
+
+        async with await self.app.database.get_session() as session:
+            moved = (await session.execute(stmt)).scalars().all()
+            await session.commit()
+        return len(moved)
+
+    @staticmethod
+    def _session_document():
+        """Документ со строками сессии, ее игроков и раундов"""
+        sessions = SessionModel.__table__
+        players = PlayerModel.__table__
+        rounds = RoundModel.__table__
+        empty = literal([], JSONB)
+
+        players_json = (
+            select(
+                func.coalesce(
+                    func.jsonb_agg(
+                        aggregate_order_by(
+                            func.to_jsonb(players.table_valued()),
+                            players.c.id,
+                        )
+                    ),
+                    empty,
+                )
+            )
+            .where(players.c.session_id == sessions.c.id)
+            .scalar_subquery()
+        )
+        round_json = func.to_jsonb(rounds.table_valued()).op("||")(
+            func.jsonb_build_object(
+                literal_column("'answer_user_id'"), players.c.user_id
+            )
+        )
+        rounds_json = (
+            select(
+                func.coalesce(
+                    func.jsonb_agg(aggregate_order_by(round_json, rounds.c.id)),
+                    empty,
+                )
+            )
+            .select_from(
+                rounds.outerjoin(
+                    players, players.c.id == rounds.c.answer_player_id
+                )
+            )
+            .where(rounds.c.session_id == sessions.c.id)
+            .scalar_subquery()
+        )
+        return func.jsonb_build_object(
+            literal_column("'session'"),
+            func.to_jsonb(sessions.table_valued()),
+            literal_column("'players'"),
+            players_json,
+            literal_column("'rounds'"),
+            rounds_json,
+        ).label("data")
+
+
+def archived_rows(key: str):
+    """Строки из sessions_archive.data[key] ("players" или "rounds")
+    как табличная функция с колонкой value (jsonb одной строки)
+    """
+    return func.jsonb_array_elements(
+        SessionArchiveModel.data[key]
+    ).table_valued(column("value", JSONB), joins_implicitly=True)
@@ -0,0 +1,49 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from app.bot.game.models import GameState, StatusSession
+
+
+@dataclass(slots=True)
+class UserRead:
+    id_tg: int
+    username_tg: str
+
+
+@dataclass(slots=True)
+class PlayerRead:
+    id: int
+    is_active: bool
+    is_ready: bool
+    is_captain: bool
+    user: UserRead
+
+
+@dataclass(slots=True)
+class StateRead:
+    current_state: GameState | None
+
+
+@dataclass(slots=True)
+class SessionRead:
+    """Сессия для списков: строится из Core запросов без ORM"""
+
+    id: int
+    chat_id: int
+    status: StatusSession
+    current_round_id: int | None
+    experts_score: int
+    bot_score: int
+    rounds_played: int
+    created_at: datetime | None = None
+    state: StateRead | None = None
+    players: list[PlayerRead] = field(default_factory=list)
+
+    @property
+    def score(self) -> dict:
+        """Счет в формате GameSessionAccessor.gen_score"""
+        return {
+            "experts": self.experts_score,
+            "bot": self.bot_score,
+            "total_rounds": self.rounds_played,
+        }
@@ -0,0 +1,258 @@
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger,
+    Select,
+    Text,
+    cast,
+    false,
+    func,
+    literal,
+    literal_column,
+    select,
+    true,
+)
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
+
+from app.base.base_accessor import BaseAccessor
+from app.bot.game.models import (
+    PlayerModel,
+    RoundModel,
+    SessionArchiveModel,
+    SessionModel,
+)
+from app.bot.user.models import UserModel
+from app.quiz.models import AnswerModel, QuestionModel
+from app.store.game.archive_accessor import FINISHED_STATUSES, archived_rows
+
+# Сколько строк забирается из серверного курсора за раз
+EXPORT_BATCH_SIZE = 500
+# Размер куска ответа до сжатия
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def json_object(**fields):
+    """jsonb_build_object с ключами из имен аргументов"""
+    args = []
+    for key, value in fields.items():
+        args += [literal_column(f"'{key}'"), value]
+    return func.jsonb_build_object(*args)
+
+
+def json_list(item, order_by):
+    """Упорядоченный jsonb-массив, пустой вместо NULL"""
+    return func.coalesce(
+        func.jsonb_agg(aggregate_order_by(item, order_by)), literal([], JSONB)
+    )
+
+
+async def ndjson_chunks(
+    lines: AsyncIterable[str],
+    compress: bool = False,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """Склеивает строки NDJSON в куски по chunk_size байт,
+    при compress=True сжимает их одним потоком gzip
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    buffer: list[bytes] = []
+    size = 0
+    async for line in lines:
+        data = line.encode() + b"\n"
+        buffer.append(data)
+        size += len(data)
+        if size < chunk_size:
+            continue
+        chunk = b"".join(buffer)
+        buffer.clear()
+        size = 0
+        if compressor is not None:
+            chunk = compressor.compress(chunk)
+        if chunk:
+            yield chunk
+
+    chunk = b"".join(buffer)
+    if compressor is not None:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
+
+
+class HistoryExportAccessor(BaseAccessor):
+    """Выгрузка истории завершенных игр для аналитики.
+
+    Одна строка NDJSON на игру: сессия, состав и раунды с вопросами
+    и ответами. Документ собирает Postgres, приложение только
+    передает готовый текст дальше, читая его серверным курсором.
+    Сначала идут игры из архива, затем из рабочих таблиц.
+    Оба курсора читают один снимок (REPEATABLE READ), поэтому игра,
+    которую архивируют во время выгрузки, не попадет в нее дважды
+    и не пропадет.
+    """
+
+    async def stream_history(
+        self,
+        chat_id: int | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> AsyncIterator[str]:
+        statements = (
+            self._archived_documents(chat_id=chat_id, since=since, until=until),
+            self._live_documents(chat_id=chat_id, since=since, until=until),
+        )
+        async with await self.app.database.get_read_session() as session:
+            await session.connection(
+                execution_options={
+                    "isolation_level": "REPEATABLE READ",
+                    "postgresql_readonly": True,
+                }
+            )
+            for stmt in statements:
+                documents = await session.stream_scalars(
+                    stmt, execution_options={"yield_per": batch_size}
+                )
+                async for document in documents:
+                    yield document
+
+    @staticmethod
+    def _filter(model, chat_id, since, until) -> list:
+        criteria = [model.status.in_(FINISHED_STATUSES)]
+        if chat_id is not None:
+            criteria.append(model.chat_id == chat_id)
+        if since is not None:
+            criteria.append(model.created_at >= since)
+        if until is not None:
+            criteria.append(model.created_at < until)
+        return criteria
+
+    @staticmethod
+    def _round_json(**fields):
+        return json_object(
+            **fields, question=QuestionModel.title, answer=AnswerModel.title
+        )
+
+    @staticmethod
+    def _with_question(stmt: Select, question_id) -> Select:
+        return stmt.outerjoin(
+            QuestionModel, QuestionModel.id == question_id
+        ).outerjoin(AnswerModel, AnswerModel.question_id == QuestionModel.id)
+
+    def _live_documents(self, chat_id, since, until) -> Select:
+        players = (
+            select(
+                json_list(
+                    json_object(
+                        user_id=PlayerModel.user_id,
+                        username_tg=UserModel.username_tg,
+                        is_captain=PlayerModel.is_captain,
+                    ),
+                    PlayerModel.id,
+                )
+            )
+            .outerjoin(UserModel, UserModel.id == PlayerModel.user_id)
+            .where(PlayerModel.session_id == SessionModel.id)
+            .scalar_subquery()
+        )
+        rounds = (
+            self._with_question(
+                select(
+                    json_list(
+                        self._round_json(
+                            id=RoundModel.id,
+                            question_id=RoundModel.question_id,
+                            is_correct_answer=RoundModel.is_correct_answer,
+                            answer_user_id=PlayerModel.user_id,
+                            created_at=RoundModel.created_at,
+                        ),
+                        RoundModel.id,
+                    )
+                ).outerjoin(
+                    PlayerModel, PlayerModel.id == RoundModel.answer_player_id
+                ),
+                RoundModel.question_id,
+            )
+            .where(RoundModel.session_id == SessionModel.id)
+            .scalar_subquery()
+        )
+        document = json_object(
+            id=SessionModel.id,
+            chat_id=SessionModel.chat_id,
+            status=SessionModel.status,
+            experts_score=SessionModel.experts_score,
+            bot_score=SessionModel.bot_score,
+            rounds_played=SessionModel.rounds_played,
+            created_at=SessionModel.created_at,
+            finished_at=func.coalesce(
+                SessionModel.updated_at, SessionModel.created_at
+            ),
+            archived=false(),
+            players=players,
+            rounds=rounds,
+        )
+        return (
+            select(cast(document, Text))
+            .where(*self._filter(SessionModel, chat_id, since, until))
+            .order_by(SessionModel.id)
+        )
+
+    def _archived_documents(self, chat_id, since, until) -> Select:
+        player = archived_rows("players").alias("player")
+        round_ = archived_rows("rounds").alias("archived_round")
+
+        players = (
+            select(
+                json_list(
+                    json_object(
+                        user_id=player.c.value["user_id"],
+                        username_tg=UserModel.username_tg,
+                        is_captain=player.c.value["is_captain"],
+                    ),
+                    cast(player.c.value["id"].astext, BigInteger),
+                )
+            )
+            .select_from(player)
+            .outerjoin(
+                UserModel,
+                UserModel.id
+                == cast(player.c.value["user_id"].astext, BigInteger),
+            )
+            .scalar_subquery()
+        )
+        round_id = cast(round_.c.value["id"].astext, BigInteger)
+        rounds = self._with_question(
+            select(
+                json_list(
+                    self._round_json(
+                        id=round_.c.value["id"],
+                        question_id=round_.c.value["question_id"],
+                        is_correct_answer=round_.c.value["is_correct_answer"],
+                        answer_user_id=round_.c.value["answer_user_id"],
+                        created_at=round_.c.value["created_at"],
+                    ),
+                    round_id,
+                )
+            ).select_from(round_),
+            cast(round_.c.value["question_id"].astext, BigInteger),
+        ).scalar_subquery()
+
+        document = json_object(
+            id=SessionArchiveModel.id,
+            chat_id=SessionArchiveModel.chat_id,
+            status=SessionArchiveModel.status,
+            experts_score=SessionArchiveModel.experts_score,
+            bot_score=SessionArchiveModel.bot_score,
+            rounds_played=SessionArchiveModel.rounds_played,
+            created_at=SessionArchiveModel.created_at,
+            finished_at=SessionArchiveModel.finished_at,
+            archived=true(),
+            players=players,
+            rounds=rounds,
+        )
+        return (
+            select(cast(document, Text))
+            .where(*self._filter(SessionArchiveModel, chat_id, since, until))
+            .order_by(SessionArchiveModel.id)
+        )
@@ -1,8 +1,10 @@
-from sqlalchemy import select
+from sqlalchemy import BigInteger, Update, insert, literal, select, update
+from sqlalchemy.orm import contains_eager, joinedload
 
 from app.base.base_accessor import BaseAccessor
 from app.bot.game.models import PlayerModel
 from app.bot.user.models import UserModel
+from app.store.game.user_accessor import UserAccessor
 
 
 class PlayerAccessor(BaseAccessor):
@@ -15,22 +17,37 @@ class PlayerAccessor(BaseAccessor):
         is_ready: bool = False,
         is_captain: bool = False,
     ) -> PlayerModel:
-        user = await self.app.store.users.get_or_create(
-            id_tg=id_tg,
-            username_tg=username_tg,
+        """Создает игрока, а пользователя заводит или обновляет
+        тем же запросом (CTE с upsert в users).
+        """
+        user = (
+            UserAccessor.upsert(username_tg=username_tg, id_tg=id_tg)
+            .returning(UserModel.id)
+            .cte("upserted_user")
         )
-
-        async with await self.app.database.get_session() as session:
-            new_player = PlayerModel(
-                session_id=session_id,
-                is_active=is_active,
-                is_ready=is_ready,
-                is_captain=is_captain,
-                user_id=user.id,
+        stmt = (
+            insert(PlayerModel)
+            .from_select(
+                [
+                    "session_id",
+                    "is_active",
+                    "is_ready",
+                    "is_captain",
+                    "user_id",
+                ],
+                select(
+                    literal(session_id, BigInteger),
+                    literal(is_active),
+                    literal(is_ready),
+                    literal(is_captain),
+                    user.c.id,
+                ),
             )
-            session.add(new_player)
+            .returning(PlayerModel)
+        )
+        async with await self.app.database.get_session() as session:
+            new_player = await session.scalar(stmt)
             await session.commit()
-            await session.refresh(new_player)
             return new_player
 
     async def get_player_by_id(
@@ -38,7 +55,11 @@ class PlayerAccessor(BaseAccessor):
         player_id: int,
     ) -> PlayerModel | None:
         async with await self.app.database.get_session() as session:
-            stmt = select(PlayerModel).filter_by(id=player_id)
+            stmt = (
+                select(PlayerModel)
+                .filter_by(id=player_id)
+                .options(joinedload(PlayerModel.user))
+            )
 
             result = await session.execute(stmt)
             return result.unique().scalar_one_or_none()
@@ -52,6 +73,7 @@ class PlayerAccessor(BaseAccessor):
             stmt = (
                 select(PlayerModel)
                 .join(PlayerModel.user)
+                .options(contains_eager(PlayerModel.user))
                 .where(
                     PlayerModel.session_id == session_id,
                     UserModel.username_tg == username_tg,
@@ -69,6 +91,7 @@ class PlayerAccessor(BaseAccessor):
             stmt = (
                 select(PlayerModel)
                 .join(PlayerModel.user)
+                .options(contains_eager(PlayerModel.user))
                 .where(
                     PlayerModel.session_id == session_id,
                     UserModel.id_tg == id_tg,
@@ -79,49 +102,46 @@ class PlayerAccessor(BaseAccessor):
 
     async def set_player_is_active(
         self, session_id: int, id_tg: int, new_active: bool
-    ) -> PlayerModel | None:
+    ) -> None:
         async with await self.app.database.get_session() as session:
-            stmt = (
-                select(PlayerModel)
-                .join(PlayerModel.user)
-                .where(
-                    PlayerModel.session_id == session_id,
-                    UserModel.id_tg == id_tg,
+            await session.execute(
+                self._update_player(session_id, id_tg).values(
+                    is_active=new_active
                 )
             )
-            result = await session.execute(stmt)
-            exist_player: PlayerModel = result.unique().scalar_one_or_none()
-            exist_player.is_active = new_active
             await session.commit()
-            return exist_player
 
     async def set_player_is_ready(
         self, session_id: int, id_tg: int, new_active: bool
-    ) -> PlayerModel | None:
+    ) -> None:
         async with await self.app.database.get_session() as session:
-            stmt = (
-                select(PlayerModel)
-                .join(PlayerModel.user)
-                .where(
-                    PlayerModel.session_id == session_id,
-                    UserModel.id_tg == id_tg,
+            await session.execute(
+                self._update_player(session_id, id_tg).values(
+                    is_ready=new_active
                 )
             )
-            result = await session.execute(stmt)
-            exist_player: PlayerModel = result.unique().scalar_one_or_none()
-            exist_player.is_ready = new_active
             await session.commit()
-            return exist_player
 
     async def set_all_players_is_ready_false(self, session_id: int) -> None:
         async with await self.app.database.get_session() as session:
-            stmt = select(PlayerModel).where(
-                PlayerModel.session_id == session_id,
-                PlayerModel.is_active.is_(True),
-                PlayerModel.is_ready.is_(True),
+            await session.execute(
+                update(PlayerModel)
+                .where(
+                    PlayerModel.session_id == session_id,
+                    PlayerModel.is_active.is_(True),
+                    PlayerModel.is_ready.is_(True),
+                )
+                .values(is_ready=False)
             )
-            result = await session.execute(stmt)
-            players = result.unique().scalars().all()
-            for player in players:
-                player.is_ready = False
             await session.commit()
+
+    @staticmethod
+    def _update_player(session_id: int, id_tg: int) -> Update:
+        """UPDATE игрока сессии по Telegram id пользователя"""
+        return update(PlayerModel).where(
+            PlayerModel.session_id == session_id,
+            PlayerModel.user_id
+            == select(UserModel.id)
+            .where(UserModel.id_tg == id_tg)
+            .scalar_subquery(),
+        )
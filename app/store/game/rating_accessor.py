@@ -0,0 +1,95 @@
+from collections.abc import Sequence
+
+from sqlalchemy import Integer, Select, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import Insert, insert
+
+from app.base.base_accessor import BaseAccessor
+from app.bot.game.models import ChatRatingModel
+from app.bot.user.models import UserModel, UserStatsModel
+
+
+class RatingAccessor(BaseAccessor):
+    async def get_chat_rating(self, chat_id: int) -> ChatRatingModel | None:
+        """Рейтинг чата одной строкой или None, если игр в нем не было"""
+        async with await self.app.database.get_session() as session:
+            return await session.scalar(
+                select(ChatRatingModel).where(
+                    ChatRatingModel.chat_id == chat_id
+                )
+            )
+
+    async def top_chats(self, limit: int = 10) -> Sequence[ChatRatingModel]:
+        """Чаты с наибольшим числом побед знатоков"""
+        stmt = (
+            select(ChatRatingModel)
+            .order_by(
+                ChatRatingModel.expert_wins.desc(),
+                ChatRatingModel.games_played.desc(),
+            )
+            .limit(limit)
+        )
+        async with await self.app.database.get_read_session() as session:
+            return (await session.scalars(stmt)).all()
+
+    async def top_players(self, limit: int = 10) -> list[dict]:
+        """Игроки с наибольшим числом побед по всем чатам"""
+        stmt = (
+            select(
+                UserModel.username_tg,
+                UserStatsModel.games_played,
+                UserStatsModel.wins,
+                UserStatsModel.correct_answers,
+            )
+            .join(UserModel, UserStatsModel.user_id == UserModel.id)
+            .order_by(
+                UserStatsModel.wins.desc(),
+                UserStatsModel.correct_answers.desc(),
+            )
+            .limit(limit)
+        )
+        async with await self.app.database.get_read_session() as session:
+            rows = await session.execute(stmt)
+        return [row._asdict() for row in rows]
+
+    @staticmethod
+    def add_game(games: Select) -> Insert:
+        """INSERT ... ON CONFLICT (chat_id) DO UPDATE, засчитывающий
+        чатам завершенные игры из games (chat_id, experts_score, bot_score).
+        В одном запросе у чата может закончиться только одна игра.
+        """
+        game = games.subquery("game")
+        expert_won = game.c.experts_score > game.c.bot_score
+        stmt = insert(ChatRatingModel).from_select(
+            [
+                ChatRatingModel.chat_id,
+                ChatRatingModel.games_played,
+                ChatRatingModel.expert_wins,
+                ChatRatingModel.bot_wins,
+                ChatRatingModel.last_experts_score,
+                ChatRatingModel.last_bot_score,
+                ChatRatingModel.last_game_at,
+            ],
+            select(
+                game.c.chat_id,
+                literal(1, Integer),
+                cast(expert_won, Integer),
+                cast(~expert_won, Integer),
+                game.c.experts_score,
+                game.c.bot_score,
+                func.now(),
+            ),
+        )
+        excluded = stmt.excluded
+        return stmt.on_conflict_do_update(
+            index_elements=[ChatRatingModel.chat_id],
+            set_={
+                "games_played": ChatRatingModel.games_played + 1,
+                "expert_wins": ChatRatingModel.expert_wins
+                + excluded.expert_wins,
+                "bot_wins": ChatRatingModel.bot_wins + excluded.bot_wins,
+                "last_experts_score": excluded.last_experts_score,
+                "last_bot_score": excluded.last_bot_score,
+                "last_game_at": excluded.last_game_at,
+                "updated_at": func.now(),
+            },
+        )
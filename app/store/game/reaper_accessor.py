@@ -0,0 +1,195 @@
+import asyncio
+import contextlib
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import and_, func, literal, or_, select, update
+
+from app.base.base_accessor import BaseAccessor
+from app.bot.game.models import (
+    GameState,
+    SessionModel,
+    StateModel,
+    StatusSession,
+)
+from app.store.bot import consts
+from app.store.events.bus import GameEventType
+from app.web.config import ReaperConfig
+
+
+@dataclass(slots=True)
+class ReapReport:
+    """Итог прохода: сколько игр отменено из каждого статуса"""
+
+    pending: int = 0
+    processing: int = 0
+    # (id сессии, chat_id) отмененных игр
+    sessions: list[tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return self.pending + self.processing
+
+
+class SessionReaperAccessor(BaseAccessor):
+    """Отмена брошенных игр.
+
+    PENDING-сессия остается, если после /start никто не начал игру,
+    а PROCESSING - если таймеры игры умерли вместе с процессом.
+    Такие сессии занимают чат и раздувают выборки незавершенных игр.
+    Последней активностью считается самый поздний updated_at сессии
+    и ее state (или created_at, если строки не менялись).
+    """
+
+    def __init__(self, app, *args, **kwargs):
+        super().__init__(app, *args, **kwargs)
+        self._task: asyncio.Task | None = None
+
+    @property
+    def config(self) -> ReaperConfig:
+        return self.app.config.reaper or ReaperConfig()
+
+    async def connect(self, app):
+        if self.config.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def disconnect(self, app):
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.logger.error("Очистка брошенных игр упала", exc_info=e)
+            await asyncio.sleep(self.config.interval)
+
+    async def run_once(self) -> ReapReport:
+        """Один проход: отменяет брошенные игры пачками по batch_size,
+        затем снимает их таймеры и доски в этом процессе
+        и сообщает чатам об отмене
+        :return: Сколько игр отменено и какие
+        """
+        config = self.config
+        now = datetime.now(UTC)
+        pending_before = now - timedelta(seconds=config.pending_timeout)
+        processing_before = now - timedelta(seconds=config.processing_timeout)
+
+        report = ReapReport()
+        while True:
+            reaped = await self.reap_sessions(
+                pending_before=pending_before,
+                processing_before=processing_before,
+                batch_size=config.batch_size,
+            )
+            for session_id, chat_id, status in reaped:
+                if status == StatusSession.PENDING:
+                    report.pending += 1
+                else:
+                    report.processing += 1
+                report.sessions.append((session_id, chat_id))
+            if len(reaped) < config.batch_size:
+                break
+
+        for session_id, chat_id in report.sessions:
+            try:
+                await self._finish_in_chat(session_id, chat_id)
+            except Exception as e:
+                self.logger.error(
+                    "Не удалось завершить отмененную игру в чате %s",
+                    chat_id,
+                    exc_info=e,
+                )
+
+        if report.total:
+            self.logger.info(
+                "Отменено брошенных игр: %s (ожидали старта: %s, зависли: %s)",
+                report.total,
+                report.pending,
+                report.processing,
+            )
+        return report
+
+    async def _finish_in_chat(self, session_id: int, chat_id: int) -> None:
+        """То же, что делает BotBase.cancel_game после смены статуса"""
+        store = self.app.store
+        store.timer_manager.clean_timers(chat_id=chat_id)
+        store.events.publish(
+            GameEventType.SESSION_FINISHED,
+            chat_id=chat_id,
+            session_id=session_id,
+            status=StatusSession.CANCELLED.value,
+            reaped=True,
+        )
+        await store.tg_api.post_message(
+            chat_id=chat_id, text=consts.GAME_REAPED
+        )
+        if self.app.config.bot.board_mode is True:
+            await store.board.close(chat_id, phase=consts.BOARD_PHASE_FINISHED)
+
+    async def reap_sessions(
+        self,
+        pending_before: datetime,
+        processing_before: datetime,
+        batch_size: int,
+    ) -> list[tuple[int, int, StatusSession]]:
+        """Отменяет до batch_size игр, неактивных с pending_before
+        (PENDING) или processing_before (PROCESSING). Одним запросом:
+        статус CANCELLED, state сбрасывается в INACTIVE с пустыми data.
+        :return: (id сессии, chat_id, статус до отмены) для каждой игры
+        """
+        last_activity = func.greatest(
+            func.coalesce(SessionModel.updated_at, SessionModel.created_at),
+            StateModel.updated_at,
+        )
+        stale = (
+            select(SessionModel.id, SessionModel.status)
+            .outerjoin(StateModel, StateModel.session_id == SessionModel.id)
+            .where(
+                or_(
+                    and_(
+                        SessionModel.status == StatusSession.PENDING,
+                        last_activity < pending_before,
+                    ),
+                    and_(
+                        SessionModel.status == StatusSession.PROCESSING,
+                        last_activity < processing_before,
+                    ),
+                )
+            )
+            .order_by(SessionModel.id)
+            .limit(batch_size)
+            .with_for_update(of=SessionModel, skip_locked=True)
+            .cte("stale")
+        )
+        reset_states = (
+            update(StateModel)
+            .where(StateModel.session_id.in_(select(stale.c.id)))
+            .values(
+                current_state=literal(
+                    GameState.INACTIVE, StateModel.current_state.type
+                ),
+                data=literal({}, StateModel.data.type),
+            )
+            .cte("reset_states")
+        )
+        stmt = (
+            update(SessionModel)
+            .where(SessionModel.id == stale.c.id)
+            .values(status=StatusSession.CANCELLED)
+            .returning(SessionModel.id, SessionModel.chat_id, stale.c.status)
+            .add_cte(reset_states)
+            # Иначе ORM синхронизирует сессию через свой RETURNING
+            # и теряет наш: ResourceClosedError
+            .execution_options(synchronize_session=False)
+        )
+
+        async with await self.app.database.get_session() as session:
+            reaped = (await session.execute(stmt)).all()
+            await session.commit()
+        return [(row.id, row.chat_id, row.status) for row in reaped]
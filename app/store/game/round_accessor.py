@@ -1,7 +1,19 @@
-from sqlalchemy import select
+from sqlalchemy import (
+    Integer,
+    Update,
+    cast,
+    literal,
+    or_,
+    select,
+    union_all,
+    update,
+)
 
 from app.base.base_accessor import BaseAccessor
-from app.bot.game.models import RoundModel
+from app.bot.game.models import PlayerModel, RoundModel, SessionModel
+from app.store.bot.consts import MAX_SCORE
+from app.store.game.rating_accessor import RatingAccessor
+from app.store.game.user_accessor import UserAccessor
 
 
 class RoundAccessor(BaseAccessor):
@@ -29,45 +41,141 @@ class RoundAccessor(BaseAccessor):
         self,
         session_id: int,
         answer_player_id: int,
-    ) -> RoundModel | None:
+    ) -> None:
         async with await self.app.database.get_session() as session:
-            stmt = select(RoundModel).where(
-                RoundModel.session_id == session_id,
-                RoundModel.is_active.is_(True),
+            await session.execute(
+                self._update_active_round(session_id).values(
+                    answer_player_id=answer_player_id
+                )
             )
-            result = await session.execute(stmt)
-            exist_round: RoundModel = result.unique().scalar_one_or_none()
-            exist_round.answer_player_id = answer_player_id
             await session.commit()
-            return exist_round
 
     async def set_is_active_to_false(
         self,
         session_id: int,
-    ) -> RoundModel | None:
+    ) -> None:
         async with await self.app.database.get_session() as session:
-            stmt = select(RoundModel).where(
-                RoundModel.session_id == session_id,
-                RoundModel.is_active.is_(True),
+            await session.execute(
+                self._update_active_round(session_id).values(is_active=False)
             )
-            result = await session.execute(stmt)
-            exist_round: RoundModel = result.unique().scalar_one_or_none()
-            exist_round.is_active = False
             await session.commit()
-            return exist_round
 
     async def set_is_correct_answer(
         self,
         session_id: int,
         new_is_correct_answer: bool,
-    ) -> RoundModel | None:
-        async with await self.app.database.get_session() as session:
-            stmt = select(RoundModel).where(
-                RoundModel.session_id == session_id,
-                RoundModel.is_active.is_(True),
+    ) -> dict | None:
+        """Выносит вердикт активному раунду и одним запросом
+        обновляет счет сессии. Повторный вердикт раунду не засчитывается.
+        :return: Новый счет как у GameSessionAccessor.gen_score
+        или None, если раунда без вердикта нет
+        """
+        return await self._judge_round(session_id, new_is_correct_answer)
+
+    async def close_round(
+        self, session_id: int, is_correct: bool
+    ) -> dict | None:
+        """То же, что set_is_correct_answer и set_is_active_to_false,
+        но одним запросом и одной транзакцией.
+        :return: Новый счет как у GameSessionAccessor.gen_score
+        или None, если раунда без вердикта нет
+        """
+        return await self._judge_round(session_id, is_correct, is_active=False)
+
+    async def _judge_round(
+        self, session_id: int, is_correct: bool, **round_values
+    ) -> dict | None:
+        """Вердикт раунду, счет сессии, user_stats и chat_ratings
+        одним запросом: ответ засчитывается ответившему, а если счет
+        дошел до MAX_SCORE - игра засчитывается всем активным игрокам
+        и чату.
+        """
+        points = int(is_correct)
+        judged_round = (
+            self._update_active_round(session_id)
+            .where(RoundModel.is_correct_answer.is_(None))
+            .values(is_correct_answer=is_correct, **round_values)
+            .returning(RoundModel.session_id, RoundModel.answer_player_id)
+            .cte("judged_round")
+        )
+        scored = (
+            update(SessionModel)
+            .where(SessionModel.id == judged_round.c.session_id)
+            .values(
+                experts_score=SessionModel.experts_score + points,
+                bot_score=SessionModel.bot_score + (1 - points),
+                rounds_played=SessionModel.rounds_played + 1,
+            )
+            .returning(
+                SessionModel.id,
+                SessionModel.chat_id,
+                SessionModel.experts_score,
+                SessionModel.bot_score,
+                SessionModel.rounds_played,
+            )
+            .cte("scored")
+        )
+
+        game_over = or_(
+            scored.c.experts_score >= MAX_SCORE,
+            scored.c.bot_score >= MAX_SCORE,
+        )
+        zero = literal(0, Integer)
+        one = literal(1, Integer)
+        answer = select(
+            PlayerModel.user_id,
+            one.label("total_answers"),
+            literal(points, Integer).label("correct_answers"),
+            literal(1 - points, Integer).label("incorrect_answers"),
+            zero.label("games_played"),
+            zero.label("wins"),
+        ).join_from(
+            judged_round,
+            PlayerModel,
+            PlayerModel.id == judged_round.c.answer_player_id,
+        )
+        finished_game = (
+            select(
+                PlayerModel.user_id,
+                zero,
+                zero,
+                zero,
+                one,
+                cast(scored.c.experts_score >= MAX_SCORE, Integer),
             )
-            result = await session.execute(stmt)
-            exist_round: RoundModel = result.unique().scalar_one_or_none()
-            exist_round.is_correct_answer = new_is_correct_answer
+            .distinct()
+            .join_from(
+                scored, PlayerModel, PlayerModel.session_id == scored.c.id
+            )
+            .where(PlayerModel.is_active.is_(True), game_over)
+        )
+        user_stats = UserAccessor.add_stats(
+            union_all(answer, finished_game)
+        ).cte("user_stats")
+        chat_rating = RatingAccessor.add_game(
+            select(
+                scored.c.chat_id, scored.c.experts_score, scored.c.bot_score
+            ).where(game_over)
+        ).cte("chat_rating")
+
+        stmt = select(
+            scored.c.experts_score, scored.c.bot_score, scored.c.rounds_played
+        ).add_cte(user_stats, chat_rating)
+        async with await self.app.database.get_session() as session:
+            row = (await session.execute(stmt)).one_or_none()
             await session.commit()
-            return exist_round
+
+        if row is None:
+            return None
+        return {
+            "experts": row.experts_score,
+            "bot": row.bot_score,
+            "total_rounds": row.rounds_played,
+        }
+
+    @staticmethod
+    def _update_active_round(session_id: int) -> Update:
+        return update(RoundModel).where(
+            RoundModel.session_id == session_id,
+            RoundModel.is_active.is_(True),
+        )
@@ -1,14 +1,40 @@
-from sqlalchemy import func, select
-from sqlalchemy.orm import joinedload, selectinload
+import random
+from collections.abc import Collection
+
+from sqlalchemy import delete, insert, literal, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import aliased, joinedload, selectinload
 
 from app.base.base_accessor import BaseAccessor
 from app.bot.game.models import (
+    ACTIVE_SESSION_WHERE,
+    ChatSeenQuestionModel,
     GameState,
+    PlayerModel,
     RoundModel,
     SessionModel,
     StateModel,
     StatusSession,
 )
+from app.bot.user.models import UserModel
+from app.quiz.models import QuestionModel
+from app.store.database.pagination import Page, paginate
+from app.store.game.dataclasses import (
+    PlayerRead,
+    SessionRead,
+    StateRead,
+    UserRead,
+)
+
+# Колонки sessions, которые _read_sessions читает по запросу
+SESSION_LIST_COLUMNS = (
+    "chat_id",
+    "status",
+    "current_round_id",
+    "experts_score",
+    "bot_score",
+    "rounds_played",
+)
 
 
 class GameSessionAccessor(BaseAccessor):
@@ -38,25 +64,40 @@ class GameSessionAccessor(BaseAccessor):
         self,
         chat_id: int,
         status: StatusSession,
-    ) -> SessionModel:
-        """Создает сессию и состояние к ней автоматически.
+    ) -> SessionModel | None:
+        """Создает сессию и состояние к ней одним запросом.
         :param chat_id: Telegram chat_id
         :param status: StatusSession ->
                 [PENDING, PROCESSING,COMPLETED, CANCELLED]
-        :return:
+        :return: SessionModel или None, если в чате уже есть
+        незавершенная игра (ix_sessions_active_chat_id)
         """
+        new_session = (
+            pg_insert(SessionModel)
+            .values(chat_id=chat_id, status=status)
+            .on_conflict_do_nothing(
+                index_elements=[SessionModel.chat_id],
+                index_where=text(ACTIVE_SESSION_WHERE),
+            )
+            .returning(*SessionModel.__table__.c)
+            .cte("new_session")
+        )
+        new_state = insert(StateModel).from_select(
+            ["session_id", "current_state", "data"],
+            select(
+                new_session.c.id,
+                literal(GameState.INACTIVE, StateModel.current_state.type),
+                literal({}, StateModel.data.type),
+            ),
+        )
+        stmt = select(aliased(SessionModel, new_session)).add_cte(
+            new_state.cte("new_state")
+        )
         async with await self.app.database.get_session() as session:
-            new_session = SessionModel(chat_id=chat_id, status=status)
-            session.add(new_session)
+            result = await session.execute(stmt)
+            game_session = result.unique().scalar_one_or_none()
             await session.commit()
-            await session.refresh(new_session)
-
-            await self.create_state(
-                session_id=new_session.id,
-                current_state=GameState.INACTIVE,
-                data={},
-            )
-            return new_session
+            return game_session
 
     async def get_session_by_id(
         self,
@@ -67,7 +108,11 @@ class GameSessionAccessor(BaseAccessor):
         :return: SessionModel
         """
         async with await self.app.database.get_session() as session:
-            stmt = select(SessionModel).filter_by(id=session_id)
+            stmt = (
+                select(SessionModel)
+                .filter_by(id=session_id)
+                .options(joinedload(SessionModel.current_round))
+            )
             result = await session.execute(stmt)
             return result.unique().scalar_one_or_none()
 
@@ -82,7 +127,10 @@ class GameSessionAccessor(BaseAccessor):
         [StatusSession.PENDING, StatusSession.PROCESSING].
         Вызывается исключение в случае если в БД не один такой экземпляр.
         :param chat_id: Telegram chat_id
-        :param inload_players: Подгрузить ли связных игроков?
+        :param inload_players: Подгрузить ли связных игроков
+        (вместе с их пользователями)?
+        :param include_curr_round: Подгрузить ли текущий раунд
+        с вопросом, ответом и отвечающим игроком?
         :return: SessionModel
         """
         async with await self.app.database.get_session() as session:
@@ -94,131 +142,269 @@ class GameSessionAccessor(BaseAccessor):
                 )
             )
             if inload_players:
-                stmt = stmt.options(selectinload(SessionModel.players))
+                stmt = stmt.options(
+                    selectinload(SessionModel.players).joinedload(
+                        PlayerModel.user
+                    )
+                )
 
             if include_curr_round:
-                stmt = stmt.options(selectinload(SessionModel.current_round))
+                current_round = joinedload(SessionModel.current_round)
+                stmt = stmt.options(
+                    current_round.joinedload(RoundModel.question).joinedload(
+                        QuestionModel.true_answer
+                    ),
+                    current_round.joinedload(
+                        RoundModel.answer_player
+                    ).joinedload(PlayerModel.user),
+                )
 
             result = await session.execute(stmt)
             return result.unique().scalars().one_or_none()
 
     async def get_active_sessions(
         self,
-    ) -> list[SessionModel] | None:
+        page: Page | None = None,
+        fields: Collection[str] | None = None,
+    ) -> list[SessionRead]:
         """Возвращает сессии у которой:
         SessionModel.status in
         [StatusSession.PROCESSING].
-        :return: Список всех активных сессий
+        :param page: Страница (см. paginate), None - все сессии
+        :param fields: Поля SessionSchema, None - все
+        :return: Список активных сессий
         """
-        async with await self.app.database.get_session() as session:
-            stmt = select(SessionModel).options(
-                joinedload(SessionModel.state),
-                joinedload(SessionModel.players),
-                joinedload(SessionModel.rounds),
-            )
-
-            stmt = stmt.where(
-                SessionModel.status.in_([StatusSession.PROCESSING])
-            )
-
-            result = await session.execute(stmt)
-            return result.unique().scalars().all()
+        return await self._read_sessions(
+            SessionModel.status == StatusSession.PROCESSING,
+            page=page,
+            fields=fields,
+        )
 
     async def get_completed_sessions(
-        self, chat_id: str | None
-    ) -> list[SessionModel] | None:
+        self,
+        chat_id: str | None,
+        page: Page | None = None,
+        fields: Collection[str] | None = None,
+    ) -> list[SessionRead]:
         """Возвращает сессии у которой:
         SessionModel.status in
         [StatusSession.COMPLETED].
-        :return: Список всех активных сессий
+        Последние завершенные идут первыми.
+        :return: Список завершенных сессий
         """
+        criteria = [SessionModel.status == StatusSession.COMPLETED]
         if chat_id is not None:
-            chat_id = int(chat_id)
+            criteria.append(SessionModel.chat_id == int(chat_id))
+        return await self._read_sessions(*criteria, page=page, fields=fields)
 
-        async with await self.app.database.get_session() as session:
-            stmt = select(SessionModel).options(
-                joinedload(SessionModel.state),
-                joinedload(SessionModel.players),
-                joinedload(SessionModel.rounds),
-            )
+    async def _read_sessions(
+        self,
+        *criteria,
+        page: Page | None = None,
+        fields: Collection[str] | None = None,
+    ) -> list[SessionRead]:
+        """Сессии с состоянием и игроками для списков, новые первыми.
+        Два запроса: сессии со state и игроки с пользователями,
+        без декартова произведения игроков на раунды. Если state
+        или players не нужны, соответствующий запрос не делается.
+        Читается с реплики, если она есть.
+        """
 
-            stmt = stmt.where(
-                SessionModel.status.in_([StatusSession.COMPLETED])
-            )
+        def wanted(name: str) -> bool:
+            return fields is None or name in fields
 
-            if chat_id is not None:
-                stmt = stmt.where(SessionModel.chat_id == chat_id)
+        columns = [SessionModel.id, SessionModel.created_at] + [
+            getattr(SessionModel, name)
+            for name in SESSION_LIST_COLUMNS
+            if wanted(name)
+        ]
+        sessions_stmt = select(*columns).where(*criteria)
+        if wanted("state"):
+            sessions_stmt = sessions_stmt.add_columns(
+                StateModel.current_state
+            ).outerjoin(StateModel, StateModel.session_id == SessionModel.id)
+        sessions_stmt = paginate(
+            sessions_stmt,
+            SessionModel.created_at,
+            SessionModel.id,
+            page,
+            descending=True,
+        )
 
-            result = await session.execute(stmt)
-            return result.unique().scalars().all()
+        async with await self.app.database.get_read_session() as session:
+            sessions = {}
+            for row in await session.execute(sessions_stmt):
+                values = row._asdict()
+                sessions[row.id] = SessionRead(
+                    id=row.id,
+                    created_at=row.created_at,
+                    chat_id=values.get("chat_id"),
+                    status=values.get("status"),
+                    current_round_id=values.get("current_round_id"),
+                    experts_score=values.get("experts_score"),
+                    bot_score=values.get("bot_score"),
+                    rounds_played=values.get("rounds_played"),
+                    state=StateRead(current_state=row.current_state)
+                    if "current_state" in values
+                    else None,
+                )
+            if not sessions or not wanted("players"):
+                return list(sessions.values())
+
+            players_stmt = (
+                select(
+                    PlayerModel.session_id,
+                    PlayerModel.id,
+                    PlayerModel.is_active,
+                    PlayerModel.is_ready,
+                    PlayerModel.is_captain,
+                    UserModel.id_tg,
+                    UserModel.username_tg,
+                )
+                .join(UserModel, UserModel.id == PlayerModel.user_id)
+                .where(PlayerModel.session_id.in_(sessions))
+                .order_by(PlayerModel.id)
+            )
+            for row in await session.execute(players_stmt):
+                sessions[row.session_id].players.append(
+                    PlayerRead(
+                        id=row.id,
+                        is_active=row.is_active,
+                        is_ready=row.is_ready,
+                        is_captain=row.is_captain,
+                        user=UserRead(
+                            id_tg=row.id_tg, username_tg=row.username_tg
+                        ),
+                    )
+                )
+        return list(sessions.values())
 
     async def set_status(
         self, session_id: int, new_status: StatusSession
-    ) -> SessionModel:
+    ) -> SessionModel | None:
         """Обновляет SessionModel.status
         :param session_id: SessionModel.id
         :param new_status: StatusSession ->
                 [PENDING, PROCESSING, COMPLETED, CANCELLED]
-        :return: Обновленный SessionModel
+        :return: Обновленный SessionModel без связей
         """
         async with await self.app.database.get_session() as session:
-            stmt = select(SessionModel).filter_by(id=session_id)
-
-            result = await session.execute(stmt)
-            game_session: SessionModel = result.unique().scalars().one_or_none()
-            game_session.status = new_status
+            stmt = (
+                update(SessionModel)
+                .where(SessionModel.id == session_id)
+                .values(status=new_status)
+                .returning(SessionModel)
+            )
+            game_session = await session.scalar(stmt)
             await session.commit()
             return game_session
 
-    async def set_current_round(
-        self, session_id: int, round_id: int
-    ) -> SessionModel:
+    async def set_current_round(self, session_id: int, round_id: int) -> None:
         """Обновляет SessionModel.current_round_id
         :param session_id: SessionModel.id
         :param round_id: id текущего раунда
-        :return: Обновленный SessionModel
         """
         async with await self.app.database.get_session() as session:
-            stmt = select(SessionModel).filter_by(id=session_id)
-
-            result = await session.execute(stmt)
-            game_session: SessionModel = result.unique().scalars().one_or_none()
-            game_session.current_round_id = round_id
+            await session.execute(
+                update(SessionModel)
+                .where(SessionModel.id == session_id)
+                .values(current_round_id=round_id)
+            )
             await session.commit()
-            return game_session
 
-    async def gen_score(self, session_id: int) -> dict:
-        """Генерирует счет игры на основе завершенных раундов
+    async def draw_question_deck(
+        self, session_id: int, chat_id: int, size: int
+    ) -> list[int]:
+        """Вытягивает вопросы на всю игру и сохраняет их в сессии.
+        Вопросы, которые чат уже видел, не попадают в колоду. Если
+        невиданных вопросов меньше size - история чата начинается заново.
+        :param session_id: SessionModel.id
+        :param chat_id: Telegram chat_id
+        :param size: Сколько вопросов вытянуть
+        :return: id вопросов в порядке, в котором они будут заданы
+        """
+        quizzes = self.app.store.quizzes
+        if not quizzes.bank.loaded:
+            await quizzes.load_bank()
+        question_ids = quizzes.bank.ids
+
+        async with await self.app.database.get_session() as session:
+            seen = set(
+                await session.scalars(
+                    select(ChatSeenQuestionModel.question_id).where(
+                        ChatSeenQuestionModel.chat_id == chat_id
+                    )
+                )
+            )
+            candidates = [id_ for id_ in question_ids if id_ not in seen]
+            if len(candidates) < size:
+                await session.execute(
+                    delete(ChatSeenQuestionModel).where(
+                        ChatSeenQuestionModel.chat_id == chat_id
+                    )
+                )
+                candidates = question_ids
 
-        RoundModel.is_correct_answer == True - балл в пользу Знатоков
-        RoundModel.is_correct_answer == False - балл в пользу Бота
+            deck = random.sample(candidates, min(size, len(candidates)))
+            await session.execute(
+                update(SessionModel)
+                .where(SessionModel.id == session_id)
+                .values(question_deck=deck)
+            )
+            await session.commit()
+            return deck
 
-        :param session_id: ID сессии
-        :return: Словарь с результатами
-        {'experts': int, 'bot': int, 'total_rounds': int}
+    async def pop_deck_question(
+        self, session_id: int, chat_id: int
+    ) -> int | None:
+        """Забирает следующий вопрос из колоды сессии
+        и отмечает его увиденным в чате.
+        :return: id вопроса или None, если колода пуста
         """
         async with await self.app.database.get_session() as session:
-            experts_score_query = select(func.count(RoundModel.id)).where(
-                RoundModel.session_id == session_id,
-                RoundModel.is_correct_answer.is_(True),
+            deck = await session.scalar(
+                select(SessionModel.question_deck)
+                .where(SessionModel.id == session_id)
+                .with_for_update()
             )
+            if not deck:
+                return None
 
-            bot_score_query = select(func.count(RoundModel.id)).where(
-                RoundModel.session_id == session_id,
-                RoundModel.is_correct_answer.is_(False),
+            question_id, *rest = deck
+            await session.execute(
+                update(SessionModel)
+                .where(SessionModel.id == session_id)
+                .values(question_deck=rest)
             )
-
-            total_rounds_query = select(func.count(RoundModel.id)).where(
-                RoundModel.session_id == session_id,
-                RoundModel.is_correct_answer.isnot(None),
+            await session.execute(
+                pg_insert(ChatSeenQuestionModel)
+                .values(chat_id=chat_id, question_id=question_id)
+                .on_conflict_do_nothing(constraint="uq_chat_seen_questions")
             )
+            await session.commit()
+            return question_id
+
+    async def gen_score(self, session_id: int) -> dict:
+        """Счет игры. Счетчики ведет RoundAccessor.set_is_correct_answer,
+        здесь они только читаются по первичному ключу.
+        Если сессия уже загружена - достаточно SessionModel.score.
 
-            experts_score = await session.scalar(experts_score_query)
-            bot_score = await session.scalar(bot_score_query)
-            total_rounds = await session.scalar(total_rounds_query)
+        :param session_id: ID сессии
+        :return: Словарь с результатами
+        {'experts': int, 'bot': int, 'total_rounds': int}
+        """
+        async with await self.app.database.get_session() as session:
+            stmt = select(
+                SessionModel.experts_score,
+                SessionModel.bot_score,
+                SessionModel.rounds_played,
+            ).where(SessionModel.id == session_id)
+            row = (await session.execute(stmt)).one_or_none()
 
-            return {
-                "experts": experts_score or 0,
-                "bot": bot_score or 0,
-                "total_rounds": total_rounds or 0,
-            }
+        if row is None:
+            return {"experts": 0, "bot": 0, "total_rounds": 0}
+        return {
+            "experts": row.experts_score,
+            "bot": row.bot_score,
+            "total_rounds": row.rounds_played,
+        }
@@ -1,8 +1,29 @@
-from sqlalchemy import Integer, func, select
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    CompoundSelect,
+    Integer,
+    Select,
+    cast,
+    delete,
+    func,
+    literal,
+    select,
+    true,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import Insert, insert
 
 from app.base.base_accessor import BaseAccessor
-from app.bot.game.models import PlayerModel, RoundModel
-from app.bot.user.models import UserModel
+from app.bot.game.models import (
+    PlayerModel,
+    RoundModel,
+    SessionArchiveModel,
+    SessionModel,
+    StatusSession,
+)
+from app.bot.user.models import STATS_COLUMNS, UserModel, UserStatsModel
+from app.store.game.archive_accessor import archived_rows
 
 
 class UserAccessor(BaseAccessor):
@@ -19,52 +40,173 @@ class UserAccessor(BaseAccessor):
         :return: UserModel
         """
         async with await self.app.database.get_session() as session:
-            stmt = select(UserModel).filter_by(id_tg=id_tg)
-            result = await session.execute(stmt)
-            instance: UserModel = result.scalars().one_or_none()
-
-            if instance is not None:
-                if instance.username_tg != username_tg:
-                    instance.username_tg = username_tg
-                    await session.commit()
-                return instance
-
-            new_user = UserModel(username_tg=username_tg, id_tg=id_tg)
-            session.add(new_user)
+            stmt = self.upsert(username_tg=username_tg, id_tg=id_tg).returning(
+                UserModel
+            )
+            user = await session.scalar(stmt)
             await session.commit()
-            return new_user
+            return user
+
+    @staticmethod
+    def upsert(username_tg: str, id_tg: int) -> Insert:
+        """INSERT ... ON CONFLICT (id_tg) DO UPDATE для пользователя.
+        Username обновляется, если пользователь его сменил.
+        """
+        stmt = insert(UserModel).values(username_tg=username_tg, id_tg=id_tg)
+        return stmt.on_conflict_do_update(
+            index_elements=[UserModel.id_tg],
+            set_={"username_tg": stmt.excluded.username_tg},
+        )
 
     async def get_player_stats_by_username(self, username_tg: str) -> dict:
-        """Возвращает полную статистику игрока по username
+        """Возвращает полную статистику игрока по username.
+        Читает одну строку user_stats.
 
         :param username_tg: username пользователя в Telegram
         :return: Словарь со статистикой
         """
+        stmt = (
+            select(*(getattr(UserStatsModel, name) for name in STATS_COLUMNS))
+            .join(UserModel, UserStatsModel.user_id == UserModel.id)
+            .where(UserModel.username_tg == username_tg)
+        )
+        async with await self.app.database.get_read_session() as session:
+            stats = (await session.execute(stmt)).one_or_none()
+
+        return {
+            "username": username_tg,
+            **{name: getattr(stats, name, 0) for name in STATS_COLUMNS},
+        }
+
+    @staticmethod
+    def add_stats(deltas: Select | CompoundSelect) -> Insert:
+        """INSERT ... ON CONFLICT (user_id) DO UPDATE, прибавляющий
+        к user_stats строки deltas с колонками (user_id, *STATS_COLUMNS).
+        Строки одного пользователя складываются заранее.
+        """
+        delta = deltas.subquery("delta")
+        stmt = insert(UserStatsModel).from_select(
+            ["user_id", *STATS_COLUMNS],
+            select(
+                delta.c.user_id,
+                *(func.sum(delta.c[name]) for name in STATS_COLUMNS),
+            ).group_by(delta.c.user_id),
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[UserStatsModel.user_id],
+            set_={
+                **{
+                    name: getattr(UserStatsModel, name)
+                    + getattr(stmt.excluded, name)
+                    for name in STATS_COLUMNS
+                },
+                "updated_at": func.now(),
+            },
+        )
+
+    async def rebuild_stats(self) -> int:
+        """Пересчитывает user_stats по всей истории,
+        включая игры из sessions_archive.
+        :return: Сколько пользователей получили статистику
+        """
         async with await self.app.database.get_session() as session:
-            stmt = (
-                select(
-                    func.count(RoundModel.id).label("total_answers"),
-                    func.sum(
-                        func.cast(RoundModel.is_correct_answer, Integer)
-                    ).label("correct_answers"),
-                )
-                .select_from(RoundModel)
-                .join(
-                    PlayerModel, RoundModel.answer_player_id == PlayerModel.id
-                )
-                .join(UserModel, PlayerModel.user_id == UserModel.id)
-                .where(UserModel.username_tg == username_tg)
+            await session.execute(delete(UserStatsModel))
+            result = await session.execute(
+                self.add_stats(union_all(*self._history_deltas()))
             )
+            await session.commit()
+        return result.rowcount
 
-            result = await session.execute(stmt)
-            stats = result.first()
+    @staticmethod
+    def _history_deltas() -> list[Select]:
+        """Вклад каждого ответа и каждой завершенной игры в статистику.
+        Ответ считается, только когда раунду вынесен вердикт,
+        как и в close_round.
+        """
+        zero = literal(0, Integer)
+        one = literal(1, Integer)
+        correct = RoundModel.is_correct_answer.is_(True)
+        live_answers = (
+            select(
+                PlayerModel.user_id,
+                one.label("total_answers"),
+                cast(correct, Integer).label("correct_answers"),
+                cast(~correct, Integer).label("incorrect_answers"),
+                zero.label("games_played"),
+                zero.label("wins"),
+            )
+            .join(RoundModel, RoundModel.answer_player_id == PlayerModel.id)
+            .where(RoundModel.is_correct_answer.is_not(None))
+        )
+
+        live_games = (
+            select(
+                PlayerModel.user_id,
+                zero,
+                zero,
+                zero,
+                one,
+                cast(
+                    SessionModel.experts_score > SessionModel.bot_score,
+                    Integer,
+                ),
+            )
+            # Игрок мог перезайти в игру, засчитываем ее один раз
+            .distinct(SessionModel.id, PlayerModel.user_id)
+            .join(SessionModel, PlayerModel.session_id == SessionModel.id)
+            .where(
+                SessionModel.status == StatusSession.COMPLETED,
+                PlayerModel.is_active.is_(True),
+            )
+        )
 
-            total_answers = stats.total_answers or 0
-            correct_answers = stats.correct_answers or 0
+        archived_round = archived_rows("rounds")
+        archived_correct = archived_round.c.value[
+            "is_correct_answer"
+        ].astext.cast(Boolean)
+        archived_answers = (
+            select(
+                archived_round.c.value["answer_user_id"].astext.cast(
+                    BigInteger
+                ),
+                one,
+                cast(archived_correct.is_(True), Integer),
+                cast(archived_correct.is_(False), Integer),
+                zero,
+                zero,
+            )
+            .select_from(SessionArchiveModel)
+            .join(archived_round, true())
+            .where(
+                archived_round.c.value["answer_user_id"].astext.is_not(None),
+                # JSON null дает SQL NULL у ->>
+                archived_correct.is_not(None),
+            )
+        )
 
-            return {
-                "username": username_tg,
-                "total_answers": total_answers,
-                "correct_answers": correct_answers,
-                "incorrect_answers": total_answers - correct_answers,
-            }
+        archived_player = archived_rows("players")
+        archived_games = (
+            select(
+                archived_player.c.value["user_id"].astext.cast(BigInteger),
+                zero,
+                zero,
+                zero,
+                one,
+                cast(
+                    SessionArchiveModel.experts_score
+                    > SessionArchiveModel.bot_score,
+                    Integer,
+                ),
+            )
+            .distinct(
+                SessionArchiveModel.id,
+                archived_player.c.value["user_id"].astext,
+            )
+            .select_from(SessionArchiveModel)
+            .join(archived_player, true())
+            .where(
+                SessionArchiveModel.status == StatusSession.COMPLETED,
+                archived_player.c.value["is_active"].astext.cast(Boolean),
+            )
+        )
+        return [live_answers, live_games, archived_answers, archived_games]
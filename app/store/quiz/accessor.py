@@ -1,6 +1,20 @@
-from collections.abc import Sequence
+import asyncio
+import time
+import typing
+from collections.abc import AsyncIterable, AsyncIterator, Collection, Sequence
 
-from sqlalchemy import func, select
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Integer,
+    MetaData,
+    SmallInteger,
+    Table,
+    Text,
+    select,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import joinedload, load_only
 
 from app.base.base_accessor import BaseAccessor
 from app.quiz.models import (
@@ -8,6 +22,45 @@ from app.quiz.models import (
     QuestionModel,
     ThemeModel,
 )
+from app.store.database.pagination import Page, paginate
+from app.store.quiz.importer import (
+    ImportReport,
+    RowError,
+    parse_rows,
+)
+from app.store.quiz.question_bank import CachedQuestion, QuestionBank
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Application
+
+# Временная таблица массового импорта, живет до конца транзакции.
+# Отдельные метаданные, чтобы ее не видели alembic и очистка БД в тестах
+question_import = Table(
+    "question_import",
+    MetaData(),
+    Column("line", Integer, nullable=False),
+    Column("theme", Text, nullable=False),
+    Column("title", Text, nullable=False),
+    Column("answer", Text, nullable=False),
+    Column("description", Text),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+
+# Счетчик изменений тем, вопросов и ответов. Его увеличивают триггеры
+# в транзакции записи (миграция 7c3e9a1d5b28), так что он общий
+# для всех процессов, включая cli.py. Таблица не в метаданных моделей,
+# чтобы очистка БД в тестах не сбрасывала версию
+quiz_version = Table(
+    "quiz_version",
+    MetaData(),
+    Column("id", SmallInteger, primary_key=True),
+    Column("version", BigInteger, nullable=False),
+)
+
+# Как часто бот сверяет банк вопросов с версией в БД, сек
+BANK_CHECK_INTERVAL = 5.0
 
 
 class DontExistOneQuestionError(Exception):
@@ -15,11 +68,69 @@ class DontExistOneQuestionError(Exception):
 
 
 class QuizAccessor(BaseAccessor):
+    def __init__(self, app: "Application", *args, **kwargs):
+        super().__init__(app, *args, **kwargs)
+        self.bank = QuestionBank()
+        self._bank_lock = asyncio.Lock()
+        # Версия БД, с которой загружен банк, и время последней сверки
+        self._bank_version: int | None = None
+        self._bank_checked_at = 0.0
+
+    async def get_version(self) -> int:
+        """Версия тем и вопросов из БД (для ETag кэшированных ответов).
+        Если она сменилась с загрузки банка, банк будет перечитан.
+        """
+        async with await self.app.database.get_session() as session:
+            version = await session.scalar(select(quiz_version.c.version))
+        self._bank_checked_at = time.monotonic()
+        if version != self._bank_version:
+            self.bank.invalidate()
+        return version
+
+    async def _ensure_bank(self) -> None:
+        """Загружает банк, сверяя его с БД не чаще BANK_CHECK_INTERVAL"""
+        if (
+            self.bank.loaded
+            and time.monotonic() - self._bank_checked_at >= BANK_CHECK_INTERVAL
+        ):
+            await self.get_version()
+        if not self.bank.loaded:
+            await self.load_bank()
+
+    async def connect(self, app: "Application"):
+        await self.load_bank()
+
+    async def load_bank(self) -> None:
+        """Читает все темы и вопросы (с ответами) в банк"""
+        async with self._bank_lock:
+            if self.bank.loaded:
+                return
+            async with await self.app.database.get_session() as session:
+                # Версия читается до данных: запись между ними даст
+                # лишнюю перезагрузку, но не устаревший банк
+                self._bank_version = await session.scalar(
+                    select(quiz_version.c.version)
+                )
+                self._bank_checked_at = time.monotonic()
+                themes = (await session.execute(select(ThemeModel))).scalars()
+                questions = (
+                    await session.execute(
+                        select(QuestionModel).options(
+                            joinedload(QuestionModel.true_answer)
+                        )
+                    )
+                ).scalars()
+                self.bank.fill(themes=themes, questions=questions)
+            self.logger.info(
+                "Загружено вопросов в банк: %s", len(self.bank.ids)
+            )
+
     async def create_theme(self, title: str) -> ThemeModel:
         async with await self.app.database.get_session() as session:
             new_theme = ThemeModel(title=title)
             session.add(new_theme)
             await session.commit()
+        self.bank.add_theme(new_theme)
         return new_theme
 
     async def get_theme_by_title(self, title: str) -> ThemeModel | None:
@@ -34,9 +145,20 @@ class QuizAccessor(BaseAccessor):
             result = await session.execute(stmt)
         return result.scalars().first()
 
-    async def list_themes(self) -> Sequence[ThemeModel]:
+    async def list_themes(
+        self,
+        page: Page | None = None,
+        fields: Collection[str] | None = None,
+    ) -> Sequence[ThemeModel]:
+        """Темы по (created_at, id)
+        :param page: Страница (см. paginate), None - все темы
+        :param fields: Нужные поля, None - все. Остальные колонки не читаются
+        """
+        stmt = select(ThemeModel).options(
+            load_only(*self._columns(ThemeModel, ("title",), fields))
+        )
+        stmt = paginate(stmt, ThemeModel.created_at, ThemeModel.id, page)
         async with await self.app.database.get_session() as session:
-            stmt = select(ThemeModel)
             result = await session.execute(stmt)
         return result.scalars().all()
 
@@ -49,17 +171,27 @@ class QuizAccessor(BaseAccessor):
             )
             session.add(new_question)
             await session.commit()
+        self.bank.add_question(new_question)
         return new_question
 
-    async def random_question(self) -> QuestionModel:
-        async with await self.app.database.get_session() as session:
-            stmt = select(QuestionModel).order_by(func.random()).limit(1)
-            result = await session.execute(stmt)
-            random_question = result.scalar()
-            if random_question is None:
-                raise DontExistOneQuestionError("Нет ни одного вопроса")
+    async def random_question(
+        self, theme_id: int | None = None
+    ) -> CachedQuestion:
+        """Случайный вопрос из банка, без запроса вопросов в БД"""
+        await self._ensure_bank()
+
+        random_question = self.bank.sample(theme_id=theme_id)
+        if random_question is None:
+            raise DontExistOneQuestionError("Нет ни одного вопроса")
         return random_question
 
+    async def get_cached_question(
+        self, question_id: int
+    ) -> CachedQuestion | None:
+        """Вопрос из банка по id, без запроса вопросов в БД"""
+        await self._ensure_bank()
+        return self.bank.questions.get(question_id)
+
     async def get_question_by_title(self, title: str) -> QuestionModel | None:
         async with await self.app.database.get_session() as session:
             stmt = select(QuestionModel).where(QuestionModel.title == title)
@@ -67,14 +199,142 @@ class QuizAccessor(BaseAccessor):
         return result.scalars().first()
 
     async def list_questions(
-        self, theme_id: int | None = None
+        self,
+        theme_id: int | None = None,
+        page: Page | None = None,
+        fields: Collection[str] | None = None,
     ) -> Sequence[QuestionModel]:
+        """Вопросы по (created_at, id), параметры как у list_themes.
+        Ответ присоединяется, только если нужно поле true_answer.
+        """
+        stmt = select(QuestionModel).options(
+            load_only(
+                *self._columns(QuestionModel, ("title", "theme_id"), fields)
+            )
+        )
+        if fields is None or "true_answer" in fields:
+            stmt = stmt.options(joinedload(QuestionModel.true_answer))
+        if theme_id is not None:
+            stmt = stmt.where(QuestionModel.theme_id == theme_id)
+        stmt = paginate(stmt, QuestionModel.created_at, QuestionModel.id, page)
+        # Не с реплики: ответ кэшируется по версии, а реплика может
+        # еще не получить только что записанный вопрос
         async with await self.app.database.get_session() as session:
-            if theme_id is not None:
-                stmt = select(QuestionModel).where(
-                    QuestionModel.theme_id == theme_id
-                )
-            else:
-                stmt = select(QuestionModel)
             result = await session.execute(stmt)
         return result.scalars().all()
+
+    @staticmethod
+    def _columns(model, names: Sequence[str], fields) -> list:
+        """Колонки для load_only: ключ страницы и запрошенные поля"""
+        return [model.id, model.created_at] + [
+            getattr(model, name)
+            for name in names
+            if fields is None or name in fields
+        ]
+
+    async def import_questions(
+        self, lines: AsyncIterable[str], fmt: str
+    ) -> ImportReport:
+        """Массовый импорт вопросов из CSV или JSONL.
+
+        Строки проверяются по мере чтения, корректные сразу уходят
+        через COPY во временную таблицу, затем одним запросом
+        вливаются в themes, questions и answers. Вопросы, которые уже
+        есть в базе или повторяются в файле, попадают в отчет.
+        """
+        report = ImportReport()
+
+        async def records() -> AsyncIterator[tuple]:
+            async for row in parse_rows(lines, fmt):
+                report.total += 1
+                if isinstance(row, RowError):
+                    report.invalid += 1
+                    report.add_error(row)
+                    continue
+                yield tuple(row)
+
+        async with await self.app.database.get_session() as session:
+            connection = await session.connection()
+            await connection.run_sync(question_import.create)
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                question_import.name,
+                records=records(),
+                columns=[column.name for column in question_import.columns],
+            )
+
+            await session.execute(self._merge_themes())
+            skipped = await session.stream(self._merge_questions())
+            async for line, title in skipped:
+                report.duplicates += 1
+                report.add_error(
+                    RowError(line=line, error=f"Вопрос уже есть: {title}")
+                )
+            await session.commit()
+
+        report.imported = report.total - report.invalid - report.duplicates
+        if report.imported:
+            self.bank.invalidate()
+        return report
+
+    @staticmethod
+    def _merge_themes():
+        return (
+            insert(ThemeModel)
+            .from_select(
+                [ThemeModel.title], select(question_import.c.theme).distinct()
+            )
+            .on_conflict_do_nothing(index_elements=[ThemeModel.title])
+        )
+
+    @staticmethod
+    def _merge_questions():
+        """Вставляет вопросы с ответами из question_import.
+        Из повторов в файле берется первая строка, вопросы, которые уже
+        есть в базе, пропускаются.
+        :return: SELECT (line, title) непринятых строк
+        """
+        imported = question_import.alias("imported")
+        first_rows = (
+            select(imported)
+            .distinct(imported.c.title)
+            .order_by(imported.c.title, imported.c.line)
+            .cte("first_rows")
+        )
+        new_questions = (
+            insert(QuestionModel)
+            .from_select(
+                [QuestionModel.title, QuestionModel.theme_id],
+                select(first_rows.c.title, ThemeModel.id).join(
+                    ThemeModel, ThemeModel.title == first_rows.c.theme
+                ),
+            )
+            .on_conflict_do_nothing(index_elements=[QuestionModel.title])
+            .returning(QuestionModel.id, QuestionModel.title)
+            .cte("new_questions")
+        )
+        new_answers = (
+            insert(AnswerModel)
+            .from_select(
+                [
+                    AnswerModel.question_id,
+                    AnswerModel.title,
+                    AnswerModel.description,
+                ],
+                select(
+                    new_questions.c.id,
+                    first_rows.c.answer,
+                    first_rows.c.description,
+                ).join(first_rows, first_rows.c.title == new_questions.c.title),
+            )
+            .cte("new_answers")
+        )
+        accepted = select(first_rows.c.line).join(
+            new_questions, new_questions.c.title == first_rows.c.title
+        )
+        return (
+            select(question_import.c.line, question_import.c.title)
+            .where(question_import.c.line.not_in(accepted))
+            .order_by(question_import.c.line)
+            .add_cte(new_answers)
+        )
@@ -0,0 +1,172 @@
+"""Разбор файлов массового импорта вопросов.
+
+Файл читается построчно и сразу превращается в поток строк
+для COPY, поэтому память не зависит от размера файла.
+Поддерживаются CSV с заголовком и JSONL с объектами вида
+{"theme": ..., "question": ..., "answer": ..., "description": ...}.
+"""
+
+import csv
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+FORMATS = ("csv", "jsonl")
+REQUIRED_FIELDS = ("theme", "question", "answer")
+OPTIONAL_FIELDS = ("description",)
+# Сколько ошибок попадает в отчет, остальные только считаются
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportFormatError(Exception):
+    """Файл нельзя разобрать целиком (неизвестный формат, нет заголовка)"""
+
+
+class ImportRow(NamedTuple):
+    """Строка временной таблицы импорта"""
+
+    line: int
+    theme: str
+    title: str
+    answer: str
+    description: str | None
+
+
+@dataclass(slots=True)
+class RowError:
+    line: int
+    error: str
+
+
+@dataclass
+class ImportReport:
+    total: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    errors: list[RowError] = field(default_factory=list)
+
+    def add_error(self, error: RowError) -> None:
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(error)
+
+
+def format_from_path(path: str) -> str:
+    """Формат по расширению файла, по умолчанию csv"""
+    return "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+
+
+async def decode_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Строки тела запроса в utf-8, BOM в начале файла отбрасывается"""
+    first = True
+    async for chunk in chunks:
+        try:
+            line = chunk.decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise ImportFormatError("Файл должен быть в кодировке UTF-8") from e
+        if first:
+            line = line.removeprefix("\ufeff")
+            first = False
+        yield line
+
+
+def validate_row(line: int, raw: object) -> ImportRow | RowError:
+    if not isinstance(raw, dict):
+        return RowError(line=line, error="Ожидался объект")
+
+    values = {}
+    for name in REQUIRED_FIELDS + OPTIONAL_FIELDS:
+        value = raw.get(name)
+        if value is not None and not isinstance(value, str):
+            return RowError(line=line, error=f"Поле {name} должно быть строкой")
+        values[name] = (value or "").strip()
+
+    missing = [name for name in REQUIRED_FIELDS if not values[name]]
+    if missing:
+        return RowError(
+            line=line, error=f"Не заполнены поля: {', '.join(missing)}"
+        )
+    return ImportRow(
+        line=line,
+        theme=values["theme"],
+        title=values["question"],
+        answer=values["answer"],
+        description=values["description"] or None,
+    )
+
+
+async def parse_jsonl(
+    lines: AsyncIterable[str],
+) -> AsyncIterator[ImportRow | RowError]:
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            raw = json.loads(line)
+        except ValueError as e:
+            yield RowError(line=line_no, error=f"Некорректный JSON: {e}")
+            continue
+        yield validate_row(line_no, raw)
+
+
+async def parse_csv(
+    lines: AsyncIterable[str],
+) -> AsyncIterator[ImportRow | RowError]:
+    """Запись CSV может занимать несколько строк файла, если перевод
+    строки стоит внутри кавычек. Строки копятся, пока число кавычек
+    нечетное, номер в ошибках - первая строка записи.
+    """
+    header: list[str] | None = None
+    pending: list[str] = []
+    quotes = 0
+    start = line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not pending:
+            start = line_no
+        pending.append(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+
+        record = next(csv.reader(pending), [])
+        pending.clear()
+        quotes = 0
+        if not any(value.strip() for value in record):
+            continue
+
+        if header is None:
+            header = [name.strip().lower() for name in record]
+            missing = [name for name in REQUIRED_FIELDS if name not in header]
+            if missing:
+                raise ImportFormatError(
+                    f"В заголовке CSV нет колонок: {', '.join(missing)}"
+                )
+            continue
+
+        if len(record) != len(header):
+            yield RowError(
+                line=start,
+                error=f"Ожидалось колонок: {len(header)}, "
+                f"получено: {len(record)}",
+            )
+            continue
+        yield validate_row(start, dict(zip(header, record, strict=True)))
+
+    if pending:
+        yield RowError(line=start, error="Незакрытая кавычка")
+    if header is None:
+        raise ImportFormatError("Пустой файл")
+
+
+def parse_rows(
+    lines: AsyncIterable[str], fmt: str
+) -> AsyncIterator[ImportRow | RowError]:
+    if fmt == "csv":
+        return parse_csv(lines)
+    if fmt == "jsonl":
+        return parse_jsonl(lines)
+    raise ImportFormatError(f"Неизвестный формат: {fmt}")
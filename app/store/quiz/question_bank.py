@@ -0,0 +1,100 @@
+import random
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from app.quiz.models import QuestionModel, ThemeModel
+
+
+@dataclass(slots=True, frozen=True)
+class CachedTheme:
+    id: int
+    title: str
+
+
+@dataclass(slots=True, frozen=True)
+class CachedAnswer:
+    title: str
+    description: str | None
+
+
+@dataclass(slots=True, frozen=True)
+class CachedQuestion:
+    """Вопрос из банка. Повторяет поля QuestionModel,
+    которые нужны боту, но не привязан к сессии БД.
+    """
+
+    id: int
+    title: str
+    theme_id: int
+    theme: CachedTheme
+    true_answer: CachedAnswer | None
+
+
+@dataclass
+class QuestionBank:
+    """Копия вопросов в памяти процесса.
+
+    Идентификаторы лежат плотными списками (общим и по темам),
+    поэтому случайный вопрос выбирается за O(1) без запроса в БД.
+    """
+
+    loaded: bool = False
+    themes: dict[int, CachedTheme] = field(default_factory=dict)
+    questions: dict[int, CachedQuestion] = field(default_factory=dict)
+    ids: list[int] = field(default_factory=list)
+    ids_by_theme: dict[int, list[int]] = field(default_factory=dict)
+
+    def fill(
+        self,
+        themes: Iterable[ThemeModel],
+        questions: Iterable[QuestionModel],
+    ) -> None:
+        """Полностью заменяет содержимое банка"""
+        self.themes.clear()
+        self.questions.clear()
+        self.ids.clear()
+        self.ids_by_theme.clear()
+
+        for theme in themes:
+            self.add_theme(theme)
+        for question in questions:
+            self.add_question(question)
+        self.loaded = True
+
+    def invalidate(self) -> None:
+        """Банк будет перечитан из БД при следующем обращении"""
+        self.loaded = False
+
+    def add_theme(self, theme: ThemeModel) -> None:
+        self.themes[theme.id] = CachedTheme(id=theme.id, title=theme.title)
+        self.ids_by_theme.setdefault(theme.id, [])
+
+    def add_question(self, question: QuestionModel) -> None:
+        """Добавляет вопрос. Тема вопроса уже должна быть в банке,
+        иначе банк помечается устаревшим.
+        """
+        theme = self.themes.get(question.theme_id)
+        if theme is None:
+            self.invalidate()
+            return
+
+        answer = question.true_answer
+        self.questions[question.id] = CachedQuestion(
+            id=question.id,
+            title=question.title,
+            theme_id=question.theme_id,
+            theme=theme,
+            true_answer=CachedAnswer(
+                title=answer.title, description=answer.description
+            )
+            if answer is not None
+            else None,
+        )
+        self.ids.append(question.id)
+        self.ids_by_theme[question.theme_id].append(question.id)
+
+    def sample(self, theme_id: int | None = None) -> CachedQuestion | None:
+        ids = self.ids if theme_id is None else self.ids_by_theme.get(theme_id)
+        if not ids:
+            return None
+        return self.questions[random.choice(ids)]
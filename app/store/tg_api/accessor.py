@@ -1,37 +1,143 @@
-import json
+import asyncio
 from logging import getLogger
 from typing import TYPE_CHECKING, Any
-from urllib.parse import urlencode, urljoin
 
 from aiohttp import TCPConnector
 from aiohttp.client import ClientSession
 
 from app.base.base_accessor import BaseAccessor
 from app.store.rabbit.dataclasses import MessageTG
+from app.store.tg_api.markup import PreparedMarkup, dump_json
+from app.store.tg_api.outbox import TelegramOutbox
 
 if TYPE_CHECKING:
     from app.web.app import Application
 
-API_PATH = "https://api.telegram.org/"
+# Максимум id сообщений в одном запросе deleteMessages
+DELETE_MESSAGES_LIMIT = 100
+# Сколько одиночных deleteMessage выполняется одновременно
+DELETE_MESSAGE_CONCURRENCY = 5
+
+# Сколько раз повторяется запрос, на который Bot API ответил 429
+RATE_LIMIT_RETRIES = 3
+
+# Все запросы уходят POST-ом с JSON телом, заголовки общие
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+API_METHODS = (
+    "sendMessage",
+    "answerCallbackQuery",
+    "editMessageText",
+    "pinChatMessage",
+    "deleteMessage",
+    "deleteMessages",
+)
+
+
+class TelegramApiError(Exception):
+    """Bot API ответил ok: false"""
+
+    def __init__(self, method: str, data: dict):
+        self.method = method
+        self.error_code = data.get("error_code")
+        self.description = data.get("description")
+        super().__init__(f"{method}: {self.error_code} {self.description}")
 
 
 class TelegramApiAccessor(BaseAccessor):
     def __init__(self, app: "Application", *args, **kwargs):
         super().__init__(app, *args, **kwargs)
         self.session: ClientSession | None = None
-        self.server: str = f"{API_PATH}bot{self.app.config.bot.token}/"
+        bot_config = self.app.config.bot
+        self.server: str = f"{bot_config.api_url}bot{bot_config.token}/"
+        # URL методов собираются один раз
+        self.urls: dict[str, str] = {
+            method: f"{self.server}{method}" for method in API_METHODS
+        }
         self.logger = getLogger("TelegramApiAccessor")
+        # Выключается, если Bot API не знает метод deleteMessages
+        self.bulk_delete_supported = True
+        # Все запросы к Bot API идут через очередь с порядком внутри чата
+        self.outbox = TelegramOutbox(
+            workers=self.app.config.bot.outbox_workers,
+            max_size=self.app.config.bot.outbox_max_size,
+        )
 
     async def connect(self, app: "Application") -> None:
         self.session = ClientSession(connector=TCPConnector(verify_ssl=False))
 
     async def disconnect(self, app: "Application") -> None:
+        await self.outbox.drain()
         if self.session:
             await self.session.close()
 
     @staticmethod
-    def _build_query(host: str, method: str, params: dict) -> str:
-        return f"{urljoin(host, method)}?{urlencode(params)}"
+    def _build_body(
+        params: dict[str, Any], reply_markup: dict[str, Any] | None = None
+    ) -> bytes:
+        """Собирает JSON тело запроса.
+        Для PreparedMarkup подставляется уже готовая строка.
+        """
+        body = dump_json(params)
+        if reply_markup:
+            if isinstance(reply_markup, PreparedMarkup):
+                markup = reply_markup.json
+            else:
+                markup = dump_json(reply_markup)
+            body = f'{body[:-1]},"reply_markup":{markup}}}'
+        return body.encode("utf-8")
+
+    async def _call(self, method: str, body: bytes) -> dict:
+        """Выполняет запрос. На 429 ждет parameters.retry_after
+        и повторяет, не больше RATE_LIMIT_RETRIES раз. Запрос идет
+        из воркера очереди чата, так что порядок в чате сохраняется.
+        :return: Ответ Bot API как есть, в том числе с ok: false
+        """
+        attempt = 0
+        while True:
+            async with self.session.post(
+                self.urls[method], data=body, headers=JSON_HEADERS
+            ) as response:
+                data = await response.json()
+
+            retry_after = (data.get("parameters") or {}).get("retry_after")
+            if data.get("ok") or retry_after is None:
+                return data
+            if attempt == RATE_LIMIT_RETRIES:
+                self.logger.warning(
+                    "%s: лимит Bot API, повторы закончились", method
+                )
+                return data
+            attempt += 1
+            self.logger.warning(
+                "%s: лимит Bot API, повтор через %s с", method, retry_after
+            )
+            await asyncio.sleep(retry_after)
+
+    async def _send_message(self, body: bytes) -> MessageTG:
+        """:raises TelegramApiError: если сообщение не отправлено"""
+        data = await self._call("sendMessage", body)
+        if not data.get("ok"):
+            raise TelegramApiError("sendMessage", data)
+        getLogger("send_message_tg_api").info("Result: ok")
+
+        return MessageTG.from_dict(data.get("result"))
+
+    async def post_message(
+        self,
+        chat_id: int,
+        text: str,
+        reply_markup: dict[str, Any] | None = None,
+        parse_mode: str = "Markdown",
+    ) -> None:
+        """Ставит СООБЩЕНИЕ в очередь чата и не ждет отправки.
+        Для сообщений, чей message_id не нужен: порядок в чате
+        сохраняется, ошибки только логируются.
+        """
+        params = {"chat_id": chat_id, "text": text, "parse_mode": parse_mode}
+        body = self._build_body(params, reply_markup)
+
+        await self.outbox.post(chat_id, lambda: self._send_message(body))
 
     async def send_message(
         self,
@@ -45,25 +151,15 @@ class TelegramApiAccessor(BaseAccessor):
         :param text: str
         :param reply_markup: dict
         :param parse_mode: str (По дефолту Markdown)
-        :return:
+        :return: Отправленное сообщение
+        :raises TelegramApiError: если Bot API не принял сообщение
         """
         params = {"chat_id": chat_id, "text": text, "parse_mode": parse_mode}
+        body = self._build_body(params, reply_markup)
 
-        if reply_markup:
-            params["reply_markup"] = json.dumps(reply_markup)
-
-        async with self.session.get(
-            self._build_query(
-                self.server,
-                "sendMessage",
-                params=params,
-            )
-        ) as response:
-            data = await response.json()
-
-            getLogger("send_message_tg_api").info("Result: ok")
-
-            return MessageTG.from_dict(data.get("result"))
+        return await (
+            await self.outbox.submit(chat_id, lambda: self._send_message(body))
+        )
 
     async def answer_callback_query(
         self,
@@ -72,7 +168,9 @@ class TelegramApiAccessor(BaseAccessor):
         show_alert: bool = False,
         cache_time: int = 0,
     ) -> None:
-        """Отправляет УВЕДОМЛЕНИЕ в конкретному пользователю"""
+        """Отправляет УВЕДОМЛЕНИЕ в конкретному пользователю.
+        Запрос только ставится в очередь, хендлер его не ждет.
+        """
         params = {
             "callback_query_id": callback_query_id,
             "show_alert": show_alert,
@@ -82,28 +180,118 @@ class TelegramApiAccessor(BaseAccessor):
         if text:
             params["text"] = text
 
-        async with self.session.get(
-            self._build_query(
-                self.server,
-                "answerCallbackQuery",
-                params=params,
-            )
-        ):
+        body = self._build_body(params)
+
+        async def answer() -> None:
+            await self._call("answerCallbackQuery", body)
             getLogger("answer_tg_api").info("Result: ok")
 
+        await self.outbox.post(callback_query_id, answer)
+
+    async def edit_message_text(
+        self,
+        chat_id: int,
+        message_id: int,
+        text: str,
+        reply_markup: dict[str, Any] | None = None,
+        parse_mode: str = "Markdown",
+    ) -> None:
+        """Меняет текст уже отправленного сообщения.
+        Без reply_markup кнопки у сообщения убираются.
+        """
+        params = {
+            "chat_id": chat_id,
+            "message_id": message_id,
+            "text": text,
+            "parse_mode": parse_mode,
+        }
+        body = self._build_body(params, reply_markup)
+
+        await (
+            await self.outbox.submit(
+                chat_id, lambda: self._call("editMessageText", body)
+            )
+        )
+
+    async def pin_chat_message(self, chat_id: int, message_id: int) -> None:
+        """Закрепляет сообщение в чате без уведомления участников"""
+        params = {
+            "chat_id": chat_id,
+            "message_id": message_id,
+            "disable_notification": True,
+        }
+        body = self._build_body(params)
+
+        await self.outbox.post(
+            chat_id, lambda: self._call("pinChatMessage", body)
+        )
+
     async def delete_message(self, chat_id: int, message_id: int) -> None:
-        """Отправляет УВЕДОМЛЕНИЕ в конкретному пользователю"""
+        """Удаляет одно сообщение из чата"""
         params = {"chat_id": chat_id, "message_id": message_id}
 
-        async with self.session.get(
-            self._build_query(
-                self.server,
-                "deleteMessage",
-                params=params,
-            )
-        ):
-            getLogger("deleted_tg_api").info("Result: ok")
+        await self._call("deleteMessage", self._build_body(params))
+        getLogger("deleted_tg_api").info("Result: ok")
+
+    async def _delete_messages_bulk(
+        self, chat_id: int, message_ids: list[int]
+    ) -> dict:
+        """Удаляет до DELETE_MESSAGES_LIMIT сообщений одним запросом"""
+        params = {"chat_id": chat_id, "message_ids": message_ids}
+
+        return await self._call("deleteMessages", self._build_body(params))
+
+    async def _delete_messages_one_by_one(
+        self, chat_id: int, message_ids: list[int]
+    ) -> None:
+        """Удаляет сообщения по одному, но не более
+        DELETE_MESSAGE_CONCURRENCY запросов одновременно.
+        """
+        semaphore = asyncio.Semaphore(DELETE_MESSAGE_CONCURRENCY)
+
+        async def delete(message_id: int) -> None:
+            async with semaphore:
+                await self.delete_message(chat_id, message_id)
+
+        await asyncio.gather(
+            *(delete(message_id) for message_id in message_ids),
+            return_exceptions=True,
+        )
 
     async def delete_messages(self, chat_id: int, message_ids: list[int]):
-        for message_id in message_ids:
-            await self.delete_message(chat_id, message_id)
+        """Удаляет список сообщений.
+        Использует deleteMessages пачками по DELETE_MESSAGES_LIMIT,
+        если метод недоступен - одиночные deleteMessage.
+        """
+        for start in range(0, len(message_ids), DELETE_MESSAGES_LIMIT):
+            chunk = message_ids[start : start + DELETE_MESSAGES_LIMIT]
+
+            if self.bulk_delete_supported:
+                data = await self._delete_messages_bulk(chat_id, chunk)
+                if data.get("ok"):
+                    continue
+                if data.get("error_code") == 404:
+                    self.logger.warning(
+                        "deleteMessages недоступен, удаляем по одному"
+                    )
+                    self.bulk_delete_supported = False
+                else:
+                    self.logger.warning(
+                        "deleteMessages не удался: %s", data.get("description")
+                    )
+
+            await self._delete_messages_one_by_one(chat_id, chunk)
+
+    async def delete_messages_in_background(
+        self, chat_id: int, message_ids: list[int]
+    ) -> None:
+        """Ставит delete_messages в очередь чата,
+        чтобы хендлер не ждал удаления сообщений.
+        """
+        if not message_ids:
+            return
+
+        message_ids = list(message_ids)
+        await self.outbox.post(
+            chat_id, lambda: self.delete_messages(chat_id, message_ids)
+        )
@@ -0,0 +1,19 @@
+import json
+from typing import Any
+
+
+def dump_json(data: Any) -> str:
+    """Сериализует данные для тела запроса к Bot API"""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+class PreparedMarkup(dict):
+    """reply_markup, который сериализуется один раз при создании.
+
+    Остается обычным dict, но TelegramApiAccessor
+    берет готовую строку из PreparedMarkup.json.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.json: str = dump_json(self)
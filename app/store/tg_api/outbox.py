@@ -0,0 +1,153 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from logging import getLogger
+from typing import Any
+
+# Сколько секунд ждем отправки очереди при остановке приложения
+DRAIN_TIMEOUT = 10
+
+OutboxCall = Callable[[], Awaitable[Any]]
+
+
+class OutboxClosedError(Exception):
+    pass
+
+
+class _Lane:
+    """Очередь одного ключа и ее воркер"""
+
+    def __init__(self, max_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        # Ожидающие места в очереди встают в порядке вызова
+        self.put_lock = asyncio.Lock()
+        self.task: asyncio.Task | None = None
+
+
+class TelegramOutbox:
+    """Фоновая отправка исходящих запросов в Bot API.
+
+    У каждого ключа (обычно chat_id) своя очередь и свой воркер,
+    поэтому запросы одного чата выполняются строго по порядку,
+    а медленный запрос одного чата не задерживает другие.
+    Воркер запускается с первым запросом ключа и завершается,
+    когда его очередь опустела.
+    Одновременно выполняется не больше workers запросов.
+
+    Очереди ограничены max_size. Если очередь полна, submit и post
+    ждут освобождения места (ожидания считаются в stats["blocked"]):
+    хендлер притормаживает, но ни один запрос не теряется.
+    """
+
+    def __init__(self, workers: int = 16, max_size: int = 1000):
+        self.workers = workers
+        self.max_size = max_size
+        self.logger = getLogger("tg_outbox")
+
+        self._lanes: dict[Hashable, _Lane] = {}
+        self._slots = asyncio.Semaphore(workers)
+        self._closed = False
+
+        self.submitted = 0
+        self.processed = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.blocked = 0
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._lanes)
+
+    @property
+    def depth(self) -> int:
+        return sum(lane.queue.qsize() for lane in self._lanes.values())
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": self.workers,
+            "lanes": len(self._lanes),
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "submitted": self.submitted,
+            "processed": self.processed,
+            "failed": self.failed,
+            "blocked": self.blocked,
+        }
+
+    async def _put(
+        self, key: Hashable, call: OutboxCall, future: asyncio.Future | None
+    ) -> None:
+        if self._closed:
+            raise OutboxClosedError("Очередь исходящих запросов закрыта")
+
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = _Lane(self.max_size)
+            lane.task = asyncio.create_task(self._worker(key, lane))
+        async with lane.put_lock:
+            if lane.queue.full():
+                self.blocked += 1
+            await lane.queue.put((call, future))
+
+        self.submitted += 1
+        self.max_depth = max(self.max_depth, self.depth)
+
+    async def submit(self, key: Hashable, call: OutboxCall) -> asyncio.Future:
+        """Ставит запрос в очередь и возвращает future с его результатом"""
+        future = asyncio.get_running_loop().create_future()
+        await self._put(key, call, future)
+        return future
+
+    async def post(self, key: Hashable, call: OutboxCall) -> None:
+        """Ставит запрос в очередь без ожидания результата.
+        Ошибки только логируются.
+        """
+        await self._put(key, call, None)
+
+    async def _worker(self, key: Hashable, lane: _Lane) -> None:
+        try:
+            # Пока кто-то ждет места в очереди, она еще не закончилась
+            while not lane.queue.empty() or lane.put_lock.locked():
+                call, future = await lane.queue.get()
+                try:
+                    async with self._slots:
+                        result = await call()
+                except Exception as e:
+                    self.failed += 1
+                    if future is None:
+                        self.logger.error("Запрос в Bot API упал", exc_info=e)
+                    elif not future.done():
+                        future.set_exception(e)
+                else:
+                    self.processed += 1
+                    if future is not None and not future.done():
+                        future.set_result(result)
+                finally:
+                    lane.queue.task_done()
+        finally:
+            if self._lanes.get(key) is lane:
+                del self._lanes[key]
+
+    async def drain(self, timeout: float = DRAIN_TIMEOUT) -> None:
+        """Дожидается отправки всего, что уже в очереди,
+        после чего останавливает воркеров.
+        """
+        self._closed = True
+        lanes = list(self._lanes.values())
+        if not lanes:
+            return
+
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(lane.queue.join() for lane in lanes)),
+                timeout=timeout,
+            )
+        except TimeoutError:
+            self.logger.warning("Не дождались отправки %s запросов", self.depth)
+
+        tasks = [lane.task for lane in lanes]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._lanes.clear()
+        self.logger.info("Очередь исходящих запросов остановлена")
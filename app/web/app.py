@@ -7,9 +7,10 @@ from aiohttp_apispec import setup_aiohttp_apispec
 from aiohttp_session import setup as setup_session
 from aiohttp_session.cookie_storage import EncryptedCookieStorage
 
-from app.admin.models import AdminModel
+from app.admin.tokens import AdminPrincipal
 from app.store import Store, setup_store
 from app.store.database.database import Database
+from app.web.cache import ResponseCache
 from app.web.config import Config, setup_config
 from app.web.logger import setup_logging
 from app.web.middlewares import setup_middlewares
@@ -20,10 +21,11 @@ class Application(AiohttpApplication):
     config: Config | None = None
     store: Store | None = None
     database: Database | None = None
+    response_cache: ResponseCache | None = None
 
 
 class Request(AiohttpRequest):
-    admin: AdminModel | None = None
+    admin: AdminPrincipal | None = None
 
     @property
     def app(self) -> Application:
@@ -62,4 +64,5 @@ def setup_app(config_path: str, test_=False) -> Application:
         )
     setup_middlewares(app)
     setup_store(app)
+    app.response_cache = ResponseCache()
     return app
@@ -0,0 +1,122 @@
+import functools
+import gzip
+import hashlib
+import typing
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from aiohttp.web import Response
+
+if typing.TYPE_CHECKING:
+    from app.web.app import Request, View
+
+# Ответы меньше этого размера не сжимаются
+GZIP_MIN_SIZE = 1024
+MAX_CACHED_RESPONSES = 256
+# Клиент может хранить ответ, но должен перепроверять его по ETag
+CACHE_CONTROL = "no-cache"
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    etag: str
+    body: bytes
+    gzipped: bytes | None
+    content_type: str
+
+    def to_response(self, accept_gzip: bool) -> Response:
+        response = Response(
+            body=self.gzipped if accept_gzip and self.gzipped else self.body,
+            content_type=self.content_type,
+            headers={"Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"},
+        )
+        if accept_gzip and self.gzipped:
+            response.headers["Content-Encoding"] = "gzip"
+        response.etag = self.etag
+        return response
+
+
+class ResponseCache:
+    """Готовые ответы GET-ручек, у данных которых есть версия.
+
+    ETag ответа считается из версии данных, пути и строки запроса,
+    поэтому после записи (новая версия) старые ответы просто перестают
+    находиться и вытесняются из LRU. Тело сжимается gzip один раз
+    при сохранении.
+    """
+
+    def __init__(self, max_size: int = MAX_CACHED_RESPONSES):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, etag: str) -> CachedResponse | None:
+        entry = self._entries.get(etag)
+        if entry is not None:
+            self._entries.move_to_end(etag)
+        return entry
+
+    def put(self, etag: str, response: Response) -> CachedResponse:
+        body = response.body
+        entry = CachedResponse(
+            etag=etag,
+            body=body,
+            gzipped=gzip.compress(body) if len(body) >= GZIP_MIN_SIZE else None,
+            content_type=response.content_type,
+        )
+        self._entries[etag] = entry
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def make_etag(version: str, request: "Request") -> str:
+    """Версия данных плюс хеш пути и параметров (без учета их порядка)"""
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query.items()))
+    digest = hashlib.blake2b(
+        f"{request.path}?{query}".encode(), digest_size=8
+    ).hexdigest()
+    return f"{version}-{digest}"
+
+
+def cached_response(version: Callable[["View"], Awaitable[str]]):
+    """Кэширует успешные ответы GET-ручки в app.response_cache.
+
+    version(view) - текущая версия данных ручки. Если If-None-Match
+    совпадает с ETag этой версии, отвечает 304 без вызова ручки.
+    """
+
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(view: "View") -> Response:
+            request = view.request
+            etag = make_etag(await version(view), request)
+            if any(
+                tag.value in (etag, "*") for tag in request.if_none_match or ()
+            ):
+                response = Response(
+                    status=304, headers={"Cache-Control": CACHE_CONTROL}
+                )
+                response.etag = etag
+                return response
+
+            cache = request.app.response_cache
+            entry = cache.get(etag)
+            if entry is None:
+                response = await handler(view)
+                if response.status != 200:
+                    return response
+                entry = cache.put(etag, response)
+
+            accept_gzip = "gzip" in request.headers.get("Accept-Encoding", "")
+            return entry.to_response(accept_gzip=accept_gzip)
+
+        return wrapper
+
+    return decorator
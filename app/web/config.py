@@ -10,6 +10,11 @@ if typing.TYPE_CHECKING:
 @dataclass
 class SessionConfig:
     key: str
+    # Срок жизни токена администратора, сек
+    token_ttl: int = 3600
+    # Сколько держать проверенный токен в памяти и сколько токенов
+    token_cache_ttl: float = 60.0
+    token_cache_size: int = 1024
 
 
 @dataclass
@@ -22,6 +27,30 @@ class AdminConfig:
 class BotConfig:
     token: str
     group_id: int
+    # Адрес Bot API, для нагрузочных тестов можно указать fake_tg_api
+    api_url: str = "https://api.telegram.org/"
+    # Сколько запросов в Bot API выполняется одновременно
+    # и сколько их может ждать в очереди одного чата
+    outbox_workers: int = 16
+    outbox_max_size: int = 1000
+    # Одно закрепленное сообщение на игру вместо отправки и удаления
+    board_mode: bool = False
+
+
+@dataclass
+class ReplicaConfig:
+    """Реплика только для чтения. Пустые поля берутся у основной БД"""
+
+    host: str
+    port: int | None = None
+    user: str | None = None
+    password: str | None = None
+    database: str | None = None
+    # Отставание, после которого чтение уходит на основную БД, сек
+    max_lag: float = 10.0
+    # Как часто перепроверять доступность и отставание реплики, сек
+    check_interval: float = 5.0
+    check_timeout: float = 2.0
 
 
 @dataclass
@@ -31,6 +60,21 @@ class DatabaseConfig:
     user: str = "postgres"
     password: str = "postgres"
     database: str = "project"
+    # Пул соединений
+    pool_size: int = 10
+    max_overflow: int = 20
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    # Проверка соединения перед выдачей из пула: лишний запрос
+    # на каждый checkout, включается, если соединения рвутся извне
+    pool_pre_ping: bool = False
+    # Кэш подготовленных запросов asyncpg на соединение
+    statement_cache_size: int = 100
+    application_name: str = "what_where_when"
+    # Работа за PgBouncer в transaction mode: без кэша и именованных
+    # подготовленных запросов, которые живут на серверном соединении
+    pgbouncer: bool = False
+    replica: ReplicaConfig | None = None
 
 
 @dataclass
@@ -41,6 +85,39 @@ class RabbitConfig:
     password: str
 
 
+@dataclass
+class ArchiveConfig:
+    # Как часто запускать архиватор, сек. 0 - не запускать
+    interval: int = 3600
+    # Через сколько дней после окончания игра уходит в архив
+    archive_after_days: int = 30
+    # Сколько игр переносится одним запросом
+    batch_size: int = 500
+    # На сколько месяцев вперед создаются секции players и rounds
+    partitions_ahead: int = 2
+
+
+@dataclass
+class ReaperConfig:
+    # Как часто искать брошенные игры, сек. 0 - не запускать
+    interval: int = 300
+    # Сколько PENDING-игра может ждать старта, сек
+    pending_timeout: int = 3600
+    # Сколько PROCESSING-игра может стоять без изменений, сек
+    processing_timeout: int = 1800
+    # Сколько игр отменяется одним запросом
+    batch_size: int = 500
+
+
+@dataclass
+class EventsConfig:
+    # Сколько событий держится для отстающего подписчика
+    buffer_size: int = 256
+    max_subscribers: int = 100
+    # Интервал комментариев-пингов в потоке SSE, сек
+    keepalive: float = 15.0
+
+
 @dataclass
 class Config:
     admin: AdminConfig
@@ -48,6 +125,9 @@ class Config:
     bot: BotConfig | None = None
     database: DatabaseConfig | None = None
     rabbit: RabbitConfig | None = None
+    archive: ArchiveConfig | None = None
+    events: EventsConfig | None = None
+    reaper: ReaperConfig | None = None
 
 
 def get_config_to_dict(config_path: str) -> dict:
@@ -55,12 +135,19 @@ def get_config_to_dict(config_path: str) -> dict:
         return yaml.safe_load(f)
 
 
+def setup_database_config(raw_database: dict) -> DatabaseConfig:
+    raw_database = dict(raw_database)
+    raw_replica = raw_database.pop("replica", None)
+    return DatabaseConfig(
+        **raw_database,
+        replica=ReplicaConfig(**raw_replica) if raw_replica else None,
+    )
+
+
 def setup_config(app: "Application", config_path: str):
     raw_config = get_config_to_dict(config_path=config_path)
     app.config = Config(
-        session=SessionConfig(
-            key=raw_config["session"]["key"],
-        ),
+        session=SessionConfig(**raw_config["session"]),
         admin=AdminConfig(
             email=raw_config["admin"]["email"],
             password=raw_config["admin"]["password"],
@@ -68,7 +155,16 @@ def setup_config(app: "Application", config_path: str):
         bot=BotConfig(
             token=raw_config["bot"]["token"],
             group_id=raw_config["bot"]["group_id"],
+            api_url=raw_config["bot"].get(
+                "api_url", "https://api.telegram.org/"
+            ),
+            outbox_workers=raw_config["bot"].get("outbox_workers", 16),
+            outbox_max_size=raw_config["bot"].get("outbox_max_size", 1000),
+            board_mode=raw_config["bot"].get("board_mode", False),
         ),
-        database=DatabaseConfig(**raw_config["database"]),
+        database=setup_database_config(raw_config["database"]),
         rabbit=RabbitConfig(**raw_config["rabbit"]),
+        archive=ArchiveConfig(**raw_config.get("archive") or {}),
+        events=EventsConfig(**raw_config.get("events") or {}),
+        reaper=ReaperConfig(**raw_config.get("reaper") or {}),
     )
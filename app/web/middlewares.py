@@ -19,6 +19,7 @@ HTTP_ERROR_CODES = {
     405: "not_implemented",
     409: "conflict",
     500: "internal_server_error",
+    503: "service_unavailable",
 }
 
 
@@ -48,22 +49,23 @@ async def error_handling_middleware(request: "Request", handler):
     return response
 
 
+# Пути, которые не требуют авторизации
+PUBLIC_PATHS = frozenset(["/admin.login", "/admin.current"])
+ADMIN_COOKIE = "session_id"
+
+
 @middleware
 async def auth_middleware(request: "Request", handler):
-    # Список путей, которые не требуют авторизации
-    public_paths = ["/admin.login", "/admin.current"]
+    """Проверяет токен из куки и кладет администратора в request.admin"""
+    token = request.cookies.get(ADMIN_COOKIE)
+    request.admin = (
+        request.app.store.admins.verify_token(token) if token else None
+    )
 
-    if request.path in public_paths:
-        return await handler(request)
-
-    # Получаем куку с токеном (название куки зависит от вашей реализации)
-    auth_cookie = request.cookies.get("session_id")  # Или другое название куки
-    if not auth_cookie:
+    if request.admin is None and request.path not in PUBLIC_PATHS:
         return error_json_response(
             http_status=401, status=HTTP_ERROR_CODES[401]
         )
-
-    # Добавить проверку валидности
     return await handler(request)
 
 
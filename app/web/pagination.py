@@ -0,0 +1,53 @@
+from marshmallow import Schema, ValidationError, fields, post_load, validate
+
+from app.store.database.pagination import Cursor, Page
+from app.web.serializers import CompiledSchema, compile_schema
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+
+
+class PageSchema(Schema):
+    """Параметры страницы списка.
+
+    Наследник задает item_schema - схему элемента списка, по ее полям
+    проверяется fields=. После загрузки в данных лежат page (Page)
+    и only (frozenset имен полей или None - все поля).
+    """
+
+    item_schema: type[Schema]
+
+    limit = fields.Int(
+        load_default=DEFAULT_PAGE_LIMIT,
+        validate=validate.Range(min=1, max=MAX_PAGE_LIMIT),
+    )
+    cursor = fields.Str()
+    only = fields.Str(data_key="fields")
+
+    @post_load
+    def make_page(self, data: dict, **kwargs) -> dict:
+        after = None
+        if "cursor" in data:
+            try:
+                after = Cursor.decode(data.pop("cursor"))
+            except ValueError as e:
+                raise ValidationError("Некорректный курсор", "cursor") from e
+        data["page"] = Page(limit=data.pop("limit"), after=after)
+
+        only = data.pop("only", None)
+        if only is not None:
+            only = frozenset(name.strip() for name in only.split(","))
+            unknown = only - self.item_schema._declared_fields.keys()
+            if unknown:
+                raise ValidationError(
+                    f"Неизвестные поля: {', '.join(sorted(unknown))}", "fields"
+                )
+        data["only"] = only
+        return data
+
+
+def list_schema(
+    schema: type[Schema], only: frozenset[str] | None
+) -> CompiledSchema:
+    """Собранный дамп для списка, один на набор полей"""
+    return compile_schema(schema, only=only, many=True)
@@ -5,9 +5,11 @@ def setup_routes(app: Application):
     from app.admin.routes import setup_routes as admin_setup_routes
     from app.bot.game.routes import setup_routes as game_setup_routes
     from app.bot.user.routes import setup_routes as user_setup_routes
+    from app.monitoring.routes import setup_routes as monitoring_setup_routes
     from app.quiz.routes import setup_routes as quiz_setup_routes
 
     admin_setup_routes(app)
     quiz_setup_routes(app)
     game_setup_routes(app)
     user_setup_routes(app)
+    monitoring_setup_routes(app)
@@ -0,0 +1,80 @@
+"""Бенчмарк сериализации списка игр на 10 000 строк.
+
+Сравнивает прежний путь (SessionSchema().dump на каждую строку
+и json.dumps внутри aiohttp.json_response) с новым (собранный
+дамп compile_schema и app.web.serializers.dumps).
+
+Запуск: python -m benchmarks.serializers
+"""
+
+import json
+import timeit
+
+import app.web.app  # noqa: F401 - порядок импорта моделей
+from app.bot.game.models import GameState, StatusSession
+from app.bot.game.schemas import SessionSchema
+from app.store.game.dataclasses import (
+    PlayerRead,
+    SessionRead,
+    StateRead,
+    UserRead,
+)
+from app.web.serializers import JSON_BACKEND, compile_schema, dumps
+
+ROWS = 10_000
+PLAYERS = 5
+REPEAT = 5
+
+
+def make_sessions() -> list[SessionRead]:
+    return [
+        SessionRead(
+            id=i,
+            chat_id=-100_000 - i,
+            status=StatusSession.PROCESSING,
+            current_round_id=i,
+            experts_score=i % 6,
+            bot_score=i % 5,
+            rounds_played=i % 11,
+            state=StateRead(current_state=GameState.QUESTION_DISCUTION),
+            players=[
+                PlayerRead(
+                    id=i * PLAYERS + p,
+                    is_active=True,
+                    is_ready=p % 2 == 0,
+                    is_captain=p == 0,
+                    user=UserRead(id_tg=p, username_tg=f"user_{p}"),
+                )
+                for p in range(PLAYERS)
+            ],
+        )
+        for i in range(ROWS)
+    ]
+
+
+def main() -> None:
+    sessions = make_sessions()
+    compiled = compile_schema(SessionSchema, many=True)
+
+    def old() -> str:
+        data = [SessionSchema().dump(session) for session in sessions]
+        return json.dumps({"status": "ok", "data": {"active_sessions": data}})
+
+    def new() -> bytes:
+        data = compiled.dump(sessions)
+        return dumps({"status": "ok", "data": {"active_sessions": data}})
+
+    assert json.loads(old()) == json.loads(new())
+
+    timings = {
+        "marshmallow + json": min(timeit.repeat(old, number=1, repeat=REPEAT)),
+        f"compile_schema + {JSON_BACKEND}": min(
+            timeit.repeat(new, number=1, repeat=REPEAT)
+        ),
+    }
+    for name, seconds in timings.items():
+        print(f"{name:<28} {seconds * 1000:8.1f} мс на {ROWS} строк")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
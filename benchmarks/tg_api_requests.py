@@ -0,0 +1,47 @@
+"""Микро-бенчмарк подготовки запроса sendMessage.
+
+Сравнивает старый путь (GET, urljoin + urlencode + json.dumps клавиатуры
+на каждый вызов) с новым (POST, готовый URL + JSON тело с заранее
+сериализованной клавиатурой).
+
+Запуск: python -m benchmarks.tg_api_requests
+"""
+
+import json
+import timeit
+from urllib.parse import urlencode, urljoin
+
+from app.store.bot import consts
+from app.store.bot.keyboards import start_game_keyboard
+from app.store.tg_api.accessor import TelegramApiAccessor
+
+SERVER = "https://api.telegram.org/bot0000000000:TOKEN/"
+URL = f"{SERVER}sendMessage"
+TEXT = consts.RUPOR_QUEST.format(
+    theme="История", question="Какой город был столицей Руси в X веке? " * 5
+)
+NUMBER = 50_000
+
+
+def old_request() -> str:
+    params = {"chat_id": -100123456789, "text": TEXT, "parse_mode": "Markdown"}
+    params["reply_markup"] = json.dumps(dict(start_game_keyboard))
+    return f"{urljoin(SERVER, 'sendMessage')}?{urlencode(params)}"
+
+
+def new_request() -> tuple[str, bytes]:
+    params = {"chat_id": -100123456789, "text": TEXT, "parse_mode": "Markdown"}
+    return URL, TelegramApiAccessor._build_body(params, start_game_keyboard)
+
+
+def main() -> None:
+    old = min(timeit.repeat(old_request, number=NUMBER, repeat=5)) / NUMBER
+    new = min(timeit.repeat(new_request, number=NUMBER, repeat=5)) / NUMBER
+
+    print(f"GET + urlencode:       {old * 1e6:.2f} мкс/вызов")  # noqa: T201
+    print(f"POST + PreparedMarkup: {new * 1e6:.2f} мкс/вызов")  # noqa: T201
+    print(f"Экономия: {(old - new) * 1e6:.2f} мкс/вызов")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
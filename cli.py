@@ -0,0 +1,132 @@
+"""Служебные команды для обслуживания базы.
+
+Запуск: python cli.py [--config config.yml] <команда>
+
+    rebuild-user-stats  пересчитать user_stats по всей истории игр
+    import-questions    загрузить вопросы из CSV или JSONL
+    export-history      выгрузить историю игр в NDJSON
+    reap-sessions       отменить брошенные игры
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+
+from app.store.game.export_accessor import ndjson_chunks
+from app.store.quiz.importer import FORMATS, format_from_path
+from app.web.app import Application, setup_app
+
+DEFAULT_CONFIG = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "config.yml"
+)
+
+
+async def rebuild_user_stats(app: Application, args: argparse.Namespace):
+    users = await app.store.users.rebuild_stats()
+    print(f"Статистика пересчитана, пользователей: {users}")  # noqa: T201
+
+
+async def file_lines(path: str) -> AsyncIterator[str]:  # noqa: RUF029
+    """Строки файла по одной. Чтение блокирующее, но CLI больше
+    ничего не делает, а COPY все равно ждет следующую строку.
+    """
+    with open(path, encoding="utf-8-sig", newline="") as file:  # noqa: ASYNC101
+        for line in file:
+            yield line
+
+
+async def import_questions(app: Application, args: argparse.Namespace):
+    fmt = args.format or format_from_path(args.path)
+    report = await app.store.quizzes.import_questions(
+        file_lines(args.path), fmt=fmt
+    )
+    print(  # noqa: T201
+        f"Строк: {report.total}, загружено: {report.imported}, "
+        f"повторов: {report.duplicates}, с ошибками: {report.invalid}"
+    )
+    for error in report.errors:
+        print(f"  строка {error.line}: {error.error}")  # noqa: T201
+
+
+async def export_history(app: Application, args: argparse.Namespace):
+    history = app.store.history.stream_history(
+        chat_id=args.chat_id, since=args.since, until=args.until
+    )
+    chunks = ndjson_chunks(history, compress=args.gzip)
+    if args.output == "-":
+        async for chunk in chunks:
+            sys.stdout.buffer.write(chunk)
+        return
+    with open(args.output, "wb") as file:  # noqa: ASYNC101
+        async for chunk in chunks:
+            file.write(chunk)
+
+
+async def reap_sessions(app: Application, args: argparse.Namespace):
+    report = await app.store.reaper.run_once()
+    print(  # noqa: T201
+        f"Отменено игр: {report.total}, ожидали старта: {report.pending}, "
+        f"зависли: {report.processing}"
+    )
+
+
+def timestamp(value: str) -> datetime:
+    """ISO 8601, без часового пояса считается UTC"""
+    moment = datetime.fromisoformat(value)
+    return moment if moment.tzinfo else moment.replace(tzinfo=UTC)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Служебные команды бота")
+    parser.add_argument("--config", default=DEFAULT_CONFIG)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser(
+        "rebuild-user-stats", help="пересчитать user_stats по истории игр"
+    )
+    rebuild.set_defaults(handler=rebuild_user_stats)
+
+    import_ = commands.add_parser(
+        "import-questions", help="загрузить вопросы из CSV или JSONL"
+    )
+    import_.add_argument("path")
+    import_.add_argument(
+        "--format", choices=FORMATS, help="по умолчанию по расширению файла"
+    )
+    import_.set_defaults(handler=import_questions)
+
+    export = commands.add_parser(
+        "export-history", help="выгрузить историю игр в NDJSON"
+    )
+    export.add_argument("--chat-id", type=int)
+    export.add_argument("--since", type=timestamp, help="ISO 8601")
+    export.add_argument("--until", type=timestamp, help="ISO 8601")
+    export.add_argument("--gzip", action="store_true", help="сжать gzip")
+    export.add_argument(
+        "--output", default="-", help="файл, по умолчанию stdout"
+    )
+    export.set_defaults(handler=export_history)
+
+    reap = commands.add_parser("reap-sessions", help="отменить брошенные игры")
+    reap.set_defaults(handler=reap_sessions)
+    return parser
+
+
+async def run(args: argparse.Namespace) -> None:
+    app = setup_app(config_path=args.config)
+    await app.database.connect()
+    try:
+        await args.handler(app, args)
+    finally:
+        await app.database.disconnect()
+
+
+def main() -> None:
+    asyncio.run(run(build_parser().parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Запуск заглушки Bot API.
+
+python -m fake_tg_api.main --port 8081 --latency 0.05 --rate-limit-every 30
+    --chats 100 --players 4
+
+Приложение и поллер направляются на нее через bot.api_url в config.yml:
+    api_url: http://localhost:8081/
+"""
+
+import argparse
+import asyncio
+
+from aiohttp import web
+
+from fake_tg_api.server import FakeApiConfig, FakeTelegramState, create_app
+from fake_tg_api.traffic import run_scripted_games
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fake Telegram Bot API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--rate-limit-every", type=int, default=0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument(
+        "--chats", type=int, default=0, help="Сколько чатов играет сценарий"
+    )
+    parser.add_argument("--players", type=int, default=3)
+    parser.add_argument("--step-delay", type=float, default=1.0)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    state = FakeTelegramState(
+        config=FakeApiConfig(
+            latency=args.latency,
+            jitter=args.jitter,
+            rate_limit_every=args.rate_limit_every,
+            retry_after=args.retry_after,
+        )
+    )
+    app = create_app(state)
+
+    if args.chats:
+
+        async def start_traffic(_: web.Application) -> None:  # noqa: RUF029
+            app["traffic"] = asyncio.create_task(
+                run_scripted_games(
+                    state, args.chats, args.players, args.step_delay
+                )
+            )
+
+        app.on_startup.append(start_traffic)
+
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
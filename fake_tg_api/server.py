@@ -0,0 +1,248 @@
+"""Локальная заглушка Telegram Bot API.
+
+Поддерживает getUpdates (long polling), sendMessage, deleteMessage,
+deleteMessages, answerCallbackQuery, editMessageText и pinChatMessage.
+Умеет добавлять задержку ответа и отдавать 429 каждый N-й запрос.
+
+Служебные ручки для тестов:
+    POST /_fake/updates      - положить апдейты в очередь getUpdates
+    GET  /_fake/stats        - счетчики вызовов методов
+    GET  /_fake/chats/{id}   - сообщения, которые сейчас есть в чате
+"""
+
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import web
+
+BOT_USER = {
+    "id": 7000000000,
+    "is_bot": True,
+    "first_name": "Что? Где? Когда?",
+    "username": "fake_quiz_bot",
+}
+
+
+@dataclass
+class FakeApiConfig:
+    # Задержка каждого ответа и случайная добавка к ней, сек
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Каждый N-й вызов метода (кроме getUpdates) получает 429, 0 - никогда
+    rate_limit_every: int = 0
+    retry_after: int = 1
+
+
+@dataclass
+class FakeTelegramState:
+    config: FakeApiConfig = field(default_factory=FakeApiConfig)
+    updates: list[dict] = field(default_factory=list)
+    chats: dict[int, dict[int, dict]] = field(default_factory=dict)
+    answered_callbacks: list[dict] = field(default_factory=list)
+    calls: Counter = field(default_factory=Counter)
+    rate_limited: int = 0
+
+    _next_update_id: int = 1
+    _next_message_id: int = 1
+    _new_updates: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def push_update(self, update: dict) -> dict:
+        update = {**update, "update_id": self._next_update_id}
+        self._next_update_id += 1
+        self.updates.append(update)
+        self._new_updates.set()
+        return update
+
+    def pending_updates(self, offset: int) -> list[dict]:
+        # Как и настоящий API, offset подтверждает все апдейты до него
+        self.updates = [u for u in self.updates if u["update_id"] >= offset]
+        return list(self.updates)
+
+    async def wait_updates(self, offset: int, timeout: float) -> list[dict]:
+        deadline = time.monotonic() + timeout
+        while not (updates := self.pending_updates(offset)):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return []
+            self._new_updates.clear()
+            try:
+                await asyncio.wait_for(self._new_updates.wait(), remaining)
+            except TimeoutError:
+                return []
+        return updates
+
+    def add_message(self, chat_id: int, text: str, **extra: Any) -> dict:
+        message = {
+            "message_id": self._next_message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "supergroup", "title": "fake"},
+            "from": BOT_USER,
+            "text": text,
+            **extra,
+        }
+        self._next_message_id += 1
+        self.chats.setdefault(chat_id, {})[message["message_id"]] = message
+        return message
+
+    def last_message(self, chat_id: int) -> dict | None:
+        messages = self.chats.get(chat_id)
+        if not messages:
+            return None
+        return messages[max(messages)]
+
+
+def ok(result: Any) -> web.Response:
+    return web.json_response({"ok": True, "result": result})
+
+
+def error(code: int, description: str, **extra: Any) -> web.Response:
+    return web.json_response(
+        {
+            "ok": False,
+            "error_code": code,
+            "description": description,
+            **extra,
+        },
+        status=code,
+    )
+
+
+async def read_params(request: web.Request) -> dict:
+    """Параметры метода из query и из JSON тела, как у Bot API"""
+    params: dict[str, Any] = dict(request.query)
+    if request.can_read_body:
+        params.update(await request.json())
+    return params
+
+
+def state_of(request: web.Request) -> FakeTelegramState:
+    return request.app["state"]
+
+
+async def get_updates(request: web.Request, params: dict) -> web.Response:
+    state = state_of(request)
+    updates = await state.wait_updates(
+        offset=int(params.get("offset", 0)),
+        timeout=float(params.get("timeout", 0)),
+    )
+    return ok(updates)
+
+
+def send_message(request: web.Request, params: dict) -> web.Response:
+    extra = {}
+    if params.get("reply_markup"):
+        extra["reply_markup"] = params["reply_markup"]
+    message = state_of(request).add_message(
+        int(params["chat_id"]), params["text"], **extra
+    )
+    return ok(message)
+
+
+def edit_message_text(request: web.Request, params: dict) -> web.Response:
+    chat = state_of(request).chats.get(int(params["chat_id"]), {})
+    message = chat.get(int(params["message_id"]))
+    if message is None:
+        return error(400, "Bad Request: message to edit not found")
+    message["text"] = params["text"]
+    if params.get("reply_markup"):
+        message["reply_markup"] = params["reply_markup"]
+    return ok(message)
+
+
+def delete_message(request: web.Request, params: dict) -> web.Response:
+    chat = state_of(request).chats.get(int(params["chat_id"]), {})
+    if chat.pop(int(params["message_id"]), None) is None:
+        return error(400, "Bad Request: message to delete not found")
+    return ok(result=True)
+
+
+def delete_messages(request: web.Request, params: dict) -> web.Response:
+    chat = state_of(request).chats.get(int(params["chat_id"]), {})
+    for message_id in params["message_ids"]:
+        chat.pop(int(message_id), None)
+    return ok(result=True)
+
+
+def answer_callback_query(request: web.Request, params: dict) -> web.Response:
+    state_of(request).answered_callbacks.append(params)
+    return ok(result=True)
+
+
+def pin_chat_message(request: web.Request, params: dict) -> web.Response:
+    return ok(result=True)
+
+
+METHODS = {
+    "sendMessage": send_message,
+    "editMessageText": edit_message_text,
+    "deleteMessage": delete_message,
+    "deleteMessages": delete_messages,
+    "answerCallbackQuery": answer_callback_query,
+    "pinChatMessage": pin_chat_message,
+}
+
+
+async def bot_method(request: web.Request) -> web.Response:
+    state = state_of(request)
+    method = request.match_info["method"]
+    if method == "getUpdates":
+        state.calls[method] += 1
+        return await get_updates(request, await read_params(request))
+
+    handler = METHODS.get(method)
+    if handler is None:
+        return error(404, "Not Found")
+
+    state.calls[method] += 1
+    config = state.config
+    if config.latency or config.jitter:
+        await asyncio.sleep(config.latency + random.uniform(0, config.jitter))
+
+    every = config.rate_limit_every
+    if every and state.calls[method] % every == 0:
+        state.rate_limited += 1
+        return error(
+            429,
+            f"Too Many Requests: retry after {config.retry_after}",
+            parameters={"retry_after": config.retry_after},
+        )
+
+    return handler(request, await read_params(request))
+
+
+async def push_updates(request: web.Request) -> web.Response:
+    data = await request.json()
+    if isinstance(data, dict):
+        data = [data]
+    return ok([state_of(request).push_update(update) for update in data])
+
+
+async def stats(request: web.Request) -> web.Response:  # noqa: RUF029
+    state = state_of(request)
+    return ok(
+        {
+            "calls": dict(state.calls),
+            "rate_limited": state.rate_limited,
+            "pending_updates": len(state.updates),
+            "messages": sum(len(chat) for chat in state.chats.values()),
+        }
+    )
+
+
+async def chat_messages(request: web.Request) -> web.Response:  # noqa: RUF029
+    chat = state_of(request).chats.get(int(request.match_info["chat_id"]), {})
+    return ok(list(chat.values()))
+
+
+def create_app(state: FakeTelegramState | None = None) -> web.Application:
+    app = web.Application()
+    app["state"] = state or FakeTelegramState()
+    app.router.add_route("*", "/bot{token}/{method}", bot_method)
+    app.router.add_post("/_fake/updates", push_updates)
+    app.router.add_get("/_fake/stats", stats)
+    app.router.add_get("/_fake/chats/{chat_id}", chat_messages)
+    return app
@@ -0,0 +1,99 @@
+"""Сценарий пользовательского трафика для нагрузочных тестов.
+
+Каждый чат проходит начало игры: /start, "Начать игру" от капитана,
+присоединение игроков, старт от капитана и подтверждение готовности.
+Колбэки ссылаются на последнее сообщение бота в чате,
+поэтому сценарий работает против живого приложения.
+"""
+
+import asyncio
+import time
+
+from fake_tg_api.server import FakeTelegramState
+
+FIRST_CHAT_ID = -1000000000000
+FIRST_USER_ID = 1000
+
+
+def make_user(user_id: int) -> dict:
+    return {
+        "id": user_id,
+        "is_bot": False,
+        "first_name": f"user{user_id}",
+        "username": f"user{user_id}",
+    }
+
+
+def make_chat(chat_id: int) -> dict:
+    return {"id": chat_id, "type": "supergroup", "title": f"chat{chat_id}"}
+
+
+def command_update(chat_id: int, user_id: int, command: str) -> dict:
+    return {
+        "message": {
+            "message_id": 0,
+            "date": int(time.time()),
+            "chat": make_chat(chat_id),
+            "from": make_user(user_id),
+            "text": command,
+            "entities": [
+                {"type": "bot_command", "offset": 0, "length": len(command)}
+            ],
+        }
+    }
+
+
+def callback_update(
+    state: FakeTelegramState, chat_id: int, user_id: int, data: str
+) -> dict | None:
+    message = state.last_message(chat_id)
+    if message is None:
+        return None
+    return {
+        "callback_query": {
+            "id": f"{chat_id}:{user_id}:{data}:{time.monotonic_ns()}",
+            "from": make_user(user_id),
+            "message": message,
+            "chat_instance": str(chat_id),
+            "data": data,
+        }
+    }
+
+
+async def play_chat(
+    state: FakeTelegramState, chat_id: int, players: int, step_delay: float
+) -> None:
+    captain = FIRST_USER_ID + abs(chat_id) % 1_000_000 * 10
+    users = [captain + i for i in range(players)]
+
+    steps = [
+        [(captain, "/start")],
+        [(captain, "start_game")],
+        [(user, "join_game") for user in users[1:]],
+        [(captain, "start_game_from_captain")],
+        [(user, "ready") for user in users],
+    ]
+    for step in steps:
+        for user_id, action in step:
+            if action.startswith("/"):
+                update = command_update(chat_id, user_id, action)
+            else:
+                update = callback_update(state, chat_id, user_id, action)
+            if update is not None:
+                state.push_update(update)
+        await asyncio.sleep(step_delay)
+
+
+async def run_scripted_games(
+    state: FakeTelegramState,
+    chats: int,
+    players: int = 3,
+    step_delay: float = 1.0,
+) -> None:
+    """Параллельно запускает сценарий в chats чатах"""
+    await asyncio.gather(
+        *(
+            play_chat(state, FIRST_CHAT_ID - i, players, step_delay)
+            for i in range(chats)
+        )
+    )
@@ -1,5 +1,5 @@
+import json
 from typing import TYPE_CHECKING
-from urllib.parse import urlencode, urljoin
 
 from aiohttp import TCPConnector
 from aiohttp.client import ClientSession
@@ -10,7 +10,7 @@ from app.store.tg_api.poller import Poller
 if TYPE_CHECKING:
     from app.web.app import Application
 
-API_PATH = "https://api.telegram.org/"
+JSON_HEADERS = {"Content-Type": "application/json"}
 
 
 class TelegramApiAccessor(BaseAccessor):
@@ -20,7 +20,9 @@ class TelegramApiAccessor(BaseAccessor):
         self.poller: Poller | None = None
         self.timeout = 20
         self.offset = 0
-        self.server: str = f"{API_PATH}bot{self.app.config.bot.token}/"
+        bot_config = self.app.config.bot
+        self.server: str = f"{bot_config.api_url}bot{bot_config.token}/"
+        self.get_updates_url: str = f"{self.server}getUpdates"
 
     async def connect(self, app: "Application") -> None:
         self.session = ClientSession(connector=TCPConnector(verify_ssl=False))
@@ -36,17 +38,10 @@ class TelegramApiAccessor(BaseAccessor):
         if self.poller:
             await self.poller.stop()
 
-    @staticmethod
-    def _build_query(host: str, method: str, params: dict) -> str:
-        return f"{urljoin(host, method)}?{urlencode(params)}"
-
     async def poll(self):
-        async with self.session.get(
-            self._build_query(
-                host=self.server,
-                method="getUpdates",
-                params={"timeout": self.timeout, "offset": self.offset},
-            )
+        body = json.dumps({"timeout": self.timeout, "offset": self.offset})
+        async with self.session.post(
+            self.get_updates_url, data=body, headers=JSON_HEADERS
         ) as response:
             result = await response.json()
             mq_manager = self.app.store.mq_manager
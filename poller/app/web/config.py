@@ -11,6 +11,8 @@ if typing.TYPE_CHECKING:
 class BotConfig:
     token: str
     group_id: int
+    # Адрес Bot API, для нагрузочных тестов можно указать fake_tg_api
+    api_url: str = "https://api.telegram.org/"
 
 
 @dataclass
@@ -38,6 +40,9 @@ def setup_config(app: "Application", config_path: str):
         bot=BotConfig(
             token=raw_config["bot"]["token"],
             group_id=raw_config["bot"]["group_id"],
+            api_url=raw_config["bot"].get(
+                "api_url", "https://api.telegram.org/"
+            ),
         ),
         rabbit=RabbitConfig(**raw_config["rabbit"]),
     )
@@ -17,9 +17,11 @@ from sqlalchemy.ext.asyncio import (
 
 from app.store import (
     Database,
+    EventBus,
     FSMContext,
     GameSessionAccessor,
     PlayerAccessor,
+    RatingAccessor,
     RoundAccessor,
     Store,
     TimerManager,
@@ -44,16 +46,22 @@ def mock_app():
     app.store = MagicMock(spec=Store)
     app.store.players = MagicMock(spec=PlayerAccessor)
     app.store.rounds = MagicMock(spec=RoundAccessor)
+    app.store.ratings = MagicMock(spec=RatingAccessor)
     app.store.quizzes = MagicMock(spec=QuizAccessor)
     app.store.timer_manager = MagicMock(spec=TimerManager)
     app.store.game_session = MagicMock(spec=GameSessionAccessor)
     app.store.tg_api = MagicMock(spec=TelegramApiAccessor)
     app.store.fsm = MagicMock(spec=FSMContext)
+    app.store.events = MagicMock(spec=EventBus)
 
     # Мок конфига
     app.config = MagicMock()
     app.config.bot = MagicMock()
     app.config.bot.token = "test_token"
+    app.config.bot.api_url = "https://api.telegram.org/"
+    app.config.bot.outbox_workers = 2
+    app.config.bot.outbox_max_size = 100
+    app.config.bot.board_mode = False
 
     return app
 
@@ -140,13 +148,13 @@ async def clear_db(app: Application) -> Iterator[None]:
         session = AsyncSession(app.database.engine)
         connection = session.connection()
         for table in app.database._db.metadata.tables:
-            await session.execute(text(f"TRUNCATE {table} CASCADE"))
             await session.execute(
-                text(f"ALTER SEQUENCE {table}_id_seq RESTART WITH 1")
+                text(f"TRUNCATE {table} RESTART IDENTITY CASCADE")
             )
 
         await session.commit()
         connection.close()
+        app.store.quizzes.bank.invalidate()
 
 
 @pytest.fixture
@@ -0,0 +1,61 @@
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+from marshmallow import ValidationError
+
+from app.quiz.schemes import QuestionPageSchema
+from app.store.database.pagination import Cursor, Page, split_page
+
+
+def rows(count: int) -> list[SimpleNamespace]:
+    created_at = datetime(2026, 1, 1, tzinfo=UTC)
+    return [SimpleNamespace(id=i, created_at=created_at) for i in range(count)]
+
+
+class TestCursor:
+    def test_round_trip(self):
+        cursor = Cursor(created_at=datetime.now(UTC), id=2**40)
+        assert Cursor.decode(cursor.encode()) == cursor
+
+    @pytest.mark.parametrize("token", ["", "not base64!", "MTIz"])
+    def test_broken(self, token):
+        with pytest.raises(ValueError):  # noqa: PT011
+            Cursor.decode(token)
+
+
+class TestSplitPage:
+    def test_last_page(self):
+        items, next_cursor = split_page(rows(3), Page(limit=3))
+        assert len(items) == 3
+        assert next_cursor is None
+
+    def test_has_next_page(self):
+        items, next_cursor = split_page(rows(4), Page(limit=3))
+        assert [item.id for item in items] == [0, 1, 2]
+        assert Cursor.decode(next_cursor).id == 2
+
+    def test_without_page(self):
+        assert split_page(rows(4), None) == (rows(4), None)
+
+
+class TestPageSchema:
+    def test_defaults(self):
+        data = QuestionPageSchema().load({})
+        assert data == {"page": Page(limit=100), "only": None}
+
+    def test_cursor_and_fields(self):
+        cursor = Cursor(created_at=datetime.now(UTC), id=7)
+        data = QuestionPageSchema().load(
+            {"cursor": cursor.encode(), "fields": "id, title", "limit": "5"}
+        )
+        assert data["page"] == Page(limit=5, after=cursor)
+        assert data["only"] == frozenset({"id", "title"})
+
+    @pytest.mark.parametrize(
+        "query",
+        [{"fields": "id,password"}, {"cursor": "broken"}, {"limit": "0"}],
+    )
+    def test_invalid(self, query):
+        with pytest.raises(ValidationError):
+            QuestionPageSchema().load(query)
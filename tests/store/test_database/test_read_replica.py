@@ -0,0 +1,61 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.store.database.database import Database
+from app.web.config import DatabaseConfig, ReplicaConfig
+
+
+@pytest.fixture
+def database():
+    """Database с поддельными фабриками сессий вместо движков"""
+    app = MagicMock()
+    app.config.database = DatabaseConfig(
+        replica=ReplicaConfig(host="replica", max_lag=5.0, check_interval=60)
+    )
+    database = Database(app)
+    database.session = MagicMock(return_value="primary")
+    database.replica_session = MagicMock(return_value="replica")
+    return database
+
+
+class TestReadReplica:
+    async def test_without_replica_reads_primary(self, database):
+        database.app.config.database.replica = None
+        database.replica_session = None
+
+        assert await database.get_read_session() == "primary"
+
+    async def test_healthy_replica(self, database):
+        database._fetch_replica_lag = AsyncMock(return_value=0.5)
+
+        assert await database.get_read_session() == "replica"
+        assert database.replica_lag == 0.5
+        assert database.pool_stats["replica"] == {"healthy": True, "lag": 0.5}
+
+    async def test_lagging_replica_falls_back(self, database):
+        database._fetch_replica_lag = AsyncMock(return_value=30.0)
+
+        assert await database.get_read_session() == "primary"
+        assert database.replica_healthy is False
+
+    async def test_unavailable_replica_falls_back(self, database):
+        database._fetch_replica_lag = AsyncMock(side_effect=OSError("down"))
+
+        assert await database.get_read_session() == "primary"
+        assert database.replica_lag is None
+
+    async def test_check_is_cached(self, database):
+        database._fetch_replica_lag = AsyncMock(return_value=0.0)
+
+        for _ in range(3):
+            assert await database.get_read_session() == "replica"
+
+        database._fetch_replica_lag.assert_awaited_once()
+
+    async def test_recheck_after_interval(self, database):
+        database.app.config.database.replica.check_interval = 0
+        database._fetch_replica_lag = AsyncMock(side_effect=[0.0, OSError()])
+
+        assert await database.get_read_session() == "replica"
+        assert await database.get_read_session() == "primary"
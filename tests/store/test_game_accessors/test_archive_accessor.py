@@ -0,0 +1,129 @@
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import func, select, text, update
+
+from app.bot.game.models import (
+    PlayerModel,
+    RoundModel,
+    SessionArchiveModel,
+    SessionModel,
+    StateModel,
+    StatusSession,
+)
+
+
+class TestArchiveAccessor:
+    async def test_table_exists(self, inspect_list_tables: list[str]):
+        assert "sessions_archive" in inspect_list_tables
+
+    async def test_nothing_to_archive(self, store):
+        """RETURNING доходит до Postgres и на пустых таблицах"""
+        moved = await store.archive.archive_finished_sessions(
+            older_than=datetime.now(UTC), batch_size=10
+        )
+
+        assert moved == 0
+
+    async def test_archive_finished_session(
+        self,
+        store,
+        db_sessionmaker,
+        active_game_session,
+        active_player,
+        active_round,
+        username_tg,
+    ):
+        await store.rounds.set_answer_player_id(
+            session_id=active_game_session.id,
+            answer_player_id=active_player.id,
+        )
+        await store.rounds.close_round(
+            session_id=active_game_session.id, is_correct=True
+        )
+        await store.game_session.set_status(
+            session_id=active_game_session.id,
+            new_status=StatusSession.COMPLETED,
+        )
+        stats = await store.users.get_player_stats_by_username(username_tg)
+
+        moved = await store.archive.archive_finished_sessions(
+            older_than=datetime.now(UTC) + timedelta(minutes=1),
+            batch_size=10,
+        )
+
+        assert moved == 1
+        async with db_sessionmaker() as sess:
+            for model in (SessionModel, StateModel, PlayerModel, RoundModel):
+                assert await sess.scalar(select(func.count(model.id))) == 0
+            archived = await sess.get(
+                SessionArchiveModel, active_game_session.id
+            )
+
+        assert archived.status == StatusSession.COMPLETED
+        assert archived.experts_score == 1
+        assert [p["id"] for p in archived.data["players"]] == [active_player.id]
+        assert archived.data["rounds"][0]["answer_user_id"] == (
+            active_player.user_id
+        )
+        # Статистика игрока учитывает архивные раунды
+        assert (
+            await store.users.get_player_stats_by_username(username_tg) == stats
+        )
+
+    async def test_keeps_recent_and_active_sessions(
+        self, store, db_sessionmaker, active_game_session
+    ):
+        async with db_sessionmaker() as sess:
+            await sess.execute(
+                update(SessionModel).values(
+                    updated_at=datetime.now(UTC) - timedelta(days=365)
+                )
+            )
+            await sess.commit()
+
+        moved = await store.archive.archive_finished_sessions(
+            older_than=datetime.now(UTC) - timedelta(days=30),
+            batch_size=10,
+        )
+
+        assert moved == 0
+
+    async def test_create_partitions(self, store, db_sessionmaker):
+        await store.archive.create_partitions(months_ahead=2)
+
+        async with db_sessionmaker() as sess:
+            partitions = await sess.scalar(
+                text(
+                    "SELECT count(*) FROM pg_inherits "
+                    "WHERE inhparent = 'rounds'::regclass"
+                )
+            )
+
+        # Секция по умолчанию и как минимум три месячных
+        assert partitions >= 4
+
+    async def test_create_partitions_moves_default_rows(
+        self, store, db_sessionmaker, active_game_session, active_round
+    ):
+        """Строки месяца без секции лежат в rounds_default и не мешают
+        создать ее позже: они переносятся в новую секцию
+        """
+        created_at = datetime.now(UTC).replace(day=15) + timedelta(days=395)
+        async with db_sessionmaker() as sess:
+            await sess.execute(
+                update(RoundModel)
+                .where(RoundModel.id == active_round.id)
+                .values(created_at=created_at)
+            )
+            await sess.commit()
+
+        await store.archive.create_partitions(months_ahead=14)
+
+        async with db_sessionmaker() as sess:
+            partition = await sess.scalar(
+                text(
+                    "SELECT tableoid::regclass::text FROM rounds WHERE id = :id"
+                ),
+                {"id": active_round.id},
+            )
+        assert partition == f"rounds_{created_at:%Y_%m}"
@@ -9,7 +9,9 @@ from app.bot.game.models import (
     StatusSession,
 )
 from app.quiz.models import AnswerModel, QuestionModel, ThemeModel
+from app.store.database.pagination import Page
 from tests.utils import (
+    QueryCounter,
     game_session_to_dict,
     game_sessions_to_dict,
     game_states_to_dict,
@@ -200,3 +202,109 @@ class TestGameSessionAccessor:
                 "current_round_id": None,
             }
         ]
+
+    @pytest.mark.asyncio
+    async def test_question_deck(
+        self, store, chat_id, active_game_session, question_1, question_2
+    ):
+        deck = await store.game_session.draw_question_deck(
+            session_id=active_game_session.id, chat_id=chat_id, size=5
+        )
+        assert sorted(deck) == sorted([question_1.id, question_2.id])
+
+        popped = [
+            await store.game_session.pop_deck_question(
+                session_id=active_game_session.id, chat_id=chat_id
+            )
+            for _ in range(3)
+        ]
+        assert popped == [*deck, None]
+
+    @pytest.mark.asyncio
+    async def test_question_deck_skips_seen(
+        self, store, chat_id, active_game_session, question_1, question_2
+    ):
+        await store.game_session.draw_question_deck(
+            session_id=active_game_session.id, chat_id=chat_id, size=1
+        )
+        seen = await store.game_session.pop_deck_question(
+            session_id=active_game_session.id, chat_id=chat_id
+        )
+
+        deck = await store.game_session.draw_question_deck(
+            session_id=active_game_session.id, chat_id=chat_id, size=1
+        )
+        assert seen not in deck
+        assert len(deck) == 1
+
+
+class TestSessionLoading:
+    """Связи ленивые: каждый вызов грузит ровно то, что просит"""
+
+    async def test_active_session_with_players(
+        self, store, db_engine, active_game_session, is_active_players
+    ):
+        with QueryCounter(db_engine) as counter:
+            curr_sess = await store.game_session.get_active_session_by_chat_id(
+                chat_id=active_game_session.chat_id, inload_players=True
+            )
+
+        # сессия + игроки вместе с пользователями
+        assert counter.count == 2
+        assert len(curr_sess.players) == len(is_active_players)
+        assert all(player.user.id_tg for player in curr_sess.players)
+
+    async def test_active_session_with_current_round(
+        self, store, db_engine, active_game_session, active_round
+    ):
+        with QueryCounter(db_engine) as counter:
+            curr_sess = await store.game_session.get_active_session_by_chat_id(
+                chat_id=active_game_session.chat_id, include_curr_round=True
+            )
+
+        assert counter.count == 1
+        assert curr_sess.current_round.id == active_round.id
+        assert curr_sess.current_round.question.true_answer.title
+        assert curr_sess.current_round.answer_player is None
+
+    async def test_completed_sessions_without_cartesian_product(
+        self,
+        store,
+        db_engine,
+        active_game_session,
+        is_active_players,
+        active_round,
+    ):
+        await store.game_session.set_status(
+            session_id=active_game_session.id,
+            new_status=StatusSession.COMPLETED,
+        )
+
+        with QueryCounter(db_engine) as counter:
+            sessions = await store.game_session.get_completed_sessions(
+                chat_id=active_game_session.chat_id
+            )
+
+        assert counter.count == 2
+        assert len(sessions) == 1
+        assert len(sessions[0].players) == len(is_active_players)
+        assert sessions[0].state.current_state == GameState.INACTIVE
+
+    async def test_completed_sessions_narrow_fields(
+        self, store, db_engine, active_game_session, is_active_players
+    ):
+        await store.game_session.set_status(
+            session_id=active_game_session.id,
+            new_status=StatusSession.COMPLETED,
+        )
+
+        with QueryCounter(db_engine) as counter:
+            [game] = await store.game_session.get_completed_sessions(
+                chat_id=None, page=Page(limit=10), fields={"id", "status"}
+            )
+
+        # Без players и state - один запрос без join
+        assert counter.count == 1
+        assert game.status == StatusSession.COMPLETED
+        assert game.state is None
+        assert game.players == []
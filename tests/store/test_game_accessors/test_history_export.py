@@ -0,0 +1,184 @@
+import gzip
+import json
+from datetime import UTC, datetime, timedelta
+
+from app.bot.game.models import SessionArchiveModel, StatusSession
+from app.store.game.export_accessor import ndjson_chunks
+
+
+async def aiter_lines(lines: list[str]):  # noqa: RUF029
+    for line in lines:
+        yield line
+
+
+async def finish_game(store, session_id: int, player_id: int) -> None:
+    await store.rounds.set_answer_player_id(
+        session_id=session_id, answer_player_id=player_id
+    )
+    await store.rounds.close_round(session_id=session_id, is_correct=True)
+    await store.game_session.set_status(
+        session_id=session_id, new_status=StatusSession.COMPLETED
+    )
+
+
+class TestHistoryExport:
+    async def test_skips_unfinished_games(
+        self, store, active_game_session, active_player
+    ):
+        lines = [line async for line in store.history.stream_history()]
+        assert lines == []
+
+    async def test_live_and_archived_games(
+        self,
+        store,
+        chat_id,
+        username_tg,
+        active_game_session,
+        active_player,
+        active_round,
+        question,
+    ):
+        await finish_game(store, active_game_session.id, active_player.id)
+        live = [
+            json.loads(line)
+            async for line in store.history.stream_history(chat_id=chat_id)
+        ]
+
+        moved = await store.archive.archive_finished_sessions(
+            older_than=datetime.now(UTC) + timedelta(minutes=1),
+            batch_size=10,
+        )
+        assert moved == 1
+        archived = [
+            json.loads(line)
+            async for line in store.history.stream_history(chat_id=chat_id)
+        ]
+
+        assert len(live) == len(archived) == 1
+        game = live[0]
+        assert game["id"] == active_game_session.id
+        assert game["status"] == "COMPLETED"
+        assert game["experts_score"] == 1
+        assert game["players"] == [
+            {
+                "user_id": active_player.user_id,
+                "username_tg": username_tg,
+                "is_captain": True,
+            }
+        ]
+        [round_] = game["rounds"]
+        assert round_["id"] == active_round.id
+        assert round_["question"] == question.title
+        assert round_["answer"] == question.true_answer.title
+        assert round_["is_correct_answer"] is True
+        assert round_["answer_user_id"] == active_player.user_id
+
+        assert archived[0]["archived"] is True
+        for key in ("id", "status", "players", "rounds"):
+            assert archived[0][key] == game[key]
+
+    async def test_filters(
+        self, store, chat_id, active_game_session, active_player, active_round
+    ):
+        await finish_game(store, active_game_session.id, active_player.id)
+        later = datetime.now(UTC) + timedelta(minutes=1)
+
+        assert [
+            line async for line in store.history.stream_history(since=later)
+        ] == []
+        assert [
+            line
+            async for line in store.history.stream_history(chat_id=chat_id + 1)
+        ] == []
+        assert (
+            len(
+                [
+                    line
+                    async for line in store.history.stream_history(until=later)
+                ]
+            )
+            == 1
+        )
+
+    async def test_archive_then_live(self, store, db_sessionmaker, chat_id):
+        """Сначала архив, затем рабочие таблицы. Строка архива пишется
+        напрямую, чтобы проверить выгрузку отдельно от архиватора
+        """
+        async with db_sessionmaker() as sess:
+            sess.add(
+                SessionArchiveModel(
+                    id=10_000,
+                    chat_id=chat_id,
+                    status=StatusSession.COMPLETED,
+                    experts_score=6,
+                    bot_score=2,
+                    rounds_played=8,
+                    data={"session": {}, "players": [], "rounds": []},
+                )
+            )
+            await sess.commit()
+        live = await store.game_session.create_session(
+            chat_id=chat_id, status=StatusSession.CANCELLED
+        )
+
+        games = [
+            json.loads(line) async for line in store.history.stream_history()
+        ]
+
+        assert [(game["id"], game["archived"]) for game in games] == [
+            (10_000, True),
+            (live.id, False),
+        ]
+        assert games[0]["experts_score"] == 6
+
+    async def test_archiving_during_export(self, store, chat_id):
+        """Игра, перенесенная в архив посреди выгрузки, не теряется:
+        оба курсора читают снимок на момент начала
+        """
+        older_than = datetime.now(UTC) + timedelta(minutes=1)
+        first = await store.game_session.create_session(
+            chat_id=chat_id, status=StatusSession.COMPLETED
+        )
+        assert (
+            await store.archive.archive_finished_sessions(
+                older_than=older_than, batch_size=10
+            )
+            == 1
+        )
+        second = await store.game_session.create_session(
+            chat_id=chat_id + 1, status=StatusSession.COMPLETED
+        )
+
+        lines = store.history.stream_history(batch_size=1)
+        ids = [json.loads(await anext(lines))["id"]]
+        assert (
+            await store.archive.archive_finished_sessions(
+                older_than=older_than, batch_size=10
+            )
+            == 1
+        )
+        ids.extend([json.loads(line)["id"] async for line in lines])
+
+        assert ids == [first.id, second.id]
+
+
+class TestNdjsonChunks:
+    async def test_batches_lines(self):
+        lines = ['{"id": 1}', '{"id": 2}', '{"id": 3}']
+        chunks = [
+            chunk
+            async for chunk in ndjson_chunks(aiter_lines(lines), chunk_size=15)
+        ]
+        assert chunks == [b'{"id": 1}\n{"id": 2}\n', b'{"id": 3}\n']
+
+    async def test_gzip(self):
+        lines = [json.dumps({"id": i}) for i in range(1000)]
+        body = b"".join(
+            [
+                chunk
+                async for chunk in ndjson_chunks(
+                    aiter_lines(lines), compress=True, chunk_size=1024
+                )
+            ]
+        )
+        assert gzip.decompress(body).decode().splitlines() == lines
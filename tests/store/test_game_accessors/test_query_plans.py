@@ -0,0 +1,180 @@
+from collections.abc import Awaitable, Callable
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.bot.game.models import GameState, SessionModel, StatusSession
+
+CHATS = 20
+
+
+def seq_scans(plan: dict) -> list[str]:
+    """Таблицы, которые план читает последовательным сканированием"""
+    found = []
+    if plan["Node Type"] == "Seq Scan":
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+async def explain(
+    session: AsyncSession, statement: str, parameters: tuple
+) -> dict:
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {statement}", parameters
+    )
+    return result.scalar_one()[0]["Plan"]
+
+
+async def capture_sql(
+    engine: AsyncEngine, call: Callable[[], Awaitable]
+) -> list[tuple[str, tuple]]:
+    """Запросы, которые выполняет call, с их параметрами"""
+    statements = []
+
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        if not executemany and statement.lstrip().upper().startswith(
+            ("SELECT", "UPDATE", "DELETE", "WITH")
+        ):
+            statements.append((statement, parameters))
+
+    event.listen(
+        engine.sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+    try:
+        await call()
+    finally:
+        event.remove(
+            engine.sync_engine, "before_cursor_execute", before_cursor_execute
+        )
+    return statements
+
+
+@pytest.fixture
+async def seeded_games(store, question) -> SessionModel:
+    """Несколько чатов с завершенными играми и по одной активной"""
+    active = None
+    for chat_id in range(1, CHATS + 1):
+        await store.game_session.create_session(
+            chat_id=chat_id, status=StatusSession.COMPLETED
+        )
+        active = await store.game_session.create_session(
+            chat_id=chat_id, status=StatusSession.PROCESSING
+        )
+        await store.players.create_player(
+            session_id=active.id,
+            id_tg=chat_id,
+            username_tg=f"user_{chat_id}",
+            is_captain=True,
+        )
+        await store.rounds.create_round(
+            session_id=active.id, question_id=question.id, is_active=True
+        )
+    return active
+
+
+class TestQueryPlans:
+    """Горячие запросы бота не должны читать таблицы целиком.
+    Последовательное сканирование запрещено планировщику, так что оно
+    останется в плане только если подходящего индекса нет.
+    """
+
+    @staticmethod
+    def hot_calls(store, game: SessionModel) -> dict[str, Callable]:
+        """Вызовы аксессоров, которые бот делает на каждое обновление.
+        Проверяются запросы, которые они на самом деле выполняют
+        """
+        chat_id, session_id = game.chat_id, game.id
+        # Игрок активной игры создан с id_tg = chat_id
+        id_tg = chat_id
+        sessions, players = store.game_session, store.players
+        return {
+            "active_session": lambda: sessions.get_active_session_by_chat_id(
+                chat_id=chat_id, inload_players=True
+            ),
+            "active_session_round": lambda: (
+                sessions.get_active_session_by_chat_id(
+                    chat_id=chat_id, include_curr_round=True
+                )
+            ),
+            "fsm_state": lambda: store.fsm.get_state(chat_id),
+            "fsm_data": lambda: store.fsm.get_data(chat_id),
+            "fsm_set_state": lambda: store.fsm.set_state(
+                chat_id, GameState.WAIT_ANSWER
+            ),
+            "player_by_id_tg": lambda: players.get_player_by_idtg(
+                session_id=session_id, id_tg=id_tg
+            ),
+            "set_player_is_ready": lambda: players.set_player_is_ready(
+                session_id=session_id, id_tg=id_tg, new_active=True
+            ),
+            "set_player_is_active": lambda: players.set_player_is_active(
+                session_id=session_id, id_tg=id_tg, new_active=True
+            ),
+            "all_players_not_ready": lambda: (
+                players.set_all_players_is_ready_false(session_id=session_id)
+            ),
+            "close_round": lambda: store.rounds.close_round(
+                session_id=session_id, is_correct=True
+            ),
+            "score": lambda: sessions.gen_score(session_id=session_id),
+        }
+
+    async def test_no_seq_scans(
+        self,
+        store,
+        seeded_games: SessionModel,
+        db_engine: AsyncEngine,
+        db_sessionmaker: async_sessionmaker[AsyncSession],
+    ):
+        captured = {}
+        for name, call in self.hot_calls(store, seeded_games).items():
+            captured[name] = await capture_sql(db_engine, call)
+            assert captured[name], name
+
+        async with db_sessionmaker() as session:
+            await session.execute(text("ANALYZE"))
+            await session.execute(text("SET LOCAL enable_seqscan = off"))
+
+            for name, statements in captured.items():
+                for statement, parameters in statements:
+                    plan = await explain(session, statement, parameters)
+                    assert seq_scans(plan) == [], (name, statement)
+
+    async def test_one_not_finished_session_per_chat(
+        self,
+        store,
+        seeded_games: SessionModel,
+        db_sessionmaker: async_sessionmaker[AsyncSession],
+    ):
+        # Индекс не дает вставить вторую незавершенную игру
+        async with db_sessionmaker() as sess:
+            sess.add(
+                SessionModel(
+                    chat_id=seeded_games.chat_id,
+                    status=StatusSession.PENDING,
+                )
+            )
+            with pytest.raises(IntegrityError):
+                await sess.commit()
+
+        # а create_session сообщает о ней без исключения
+        assert (
+            await store.game_session.create_session(
+                chat_id=seeded_games.chat_id, status=StatusSession.PENDING
+            )
+            is None
+        )
+        # Завершенные игры индекс не ограничивает
+        assert (
+            await store.game_session.create_session(
+                chat_id=seeded_games.chat_id, status=StatusSession.COMPLETED
+            )
+            is not None
+        )
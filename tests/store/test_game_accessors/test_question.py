@@ -6,6 +6,7 @@ from sqlalchemy.future import select
 
 from app.quiz.models import AnswerModel, QuestionModel, ThemeModel
 from app.store import Store
+from app.store.database.pagination import Cursor, Page, split_page
 from tests.utils import answers_to_dict, question_to_dict, questions_to_dict
 
 
@@ -123,3 +124,56 @@ class TestQuestionsAccessor:
             )
 
         assert len(db_answers.all()) == 0
+
+    async def test_list_questions_pages(
+        self, store: Store, question_1: QuestionModel, question_2: QuestionModel
+    ):
+        first = await store.quizzes.list_questions(page=Page(limit=1))
+        items, next_cursor = split_page(first, Page(limit=1))
+        assert [item.id for item in items] == [question_1.id]
+
+        page = Page(limit=1, after=Cursor.decode(next_cursor))
+        second = await store.quizzes.list_questions(page=page)
+        items, next_cursor = split_page(second, page)
+        assert [item.id for item in items] == [question_2.id]
+        assert next_cursor is None
+
+    async def test_list_questions_fields(
+        self, store: Store, question_1: QuestionModel
+    ):
+        [question] = await store.quizzes.list_questions(fields={"id", "title"})
+        assert "true_answer" not in question.__dict__
+        assert "theme_id" not in question.__dict__
+        assert question.title == question_1.title
+
+    async def test_writes_bump_version(self, store: Store, theme_1: ThemeModel):
+        version = await store.quizzes.get_version()
+        await store.quizzes.create_question(
+            self.QUESTION_TITLE_EXAMPLE,
+            theme_1.id,
+            true_answer=AnswerModel(title="1", description="description"),
+        )
+        assert await store.quizzes.get_version() > version
+
+    async def test_external_write_reloads_bank(
+        self, store: Store, db_sessionmaker, theme_1: ThemeModel
+    ):
+        """Запись мимо аксессора (cli.py, другой процесс) меняет версию,
+        и банк перечитывается
+        """
+        await store.quizzes.load_bank()
+        async with db_sessionmaker() as session:
+            session.add(
+                QuestionModel(
+                    title=self.QUESTION_TITLE_EXAMPLE,
+                    theme_id=theme_1.id,
+                    true_answer=AnswerModel(title="1"),
+                )
+            )
+            await session.commit()
+
+        await store.quizzes.get_version()
+
+        assert not store.quizzes.bank.loaded
+        question = await store.quizzes.random_question()
+        assert question.title == self.QUESTION_TITLE_EXAMPLE
@@ -0,0 +1,65 @@
+from app.quiz.models import AnswerModel, QuestionModel, ThemeModel
+from app.store import Store
+from app.store.quiz.question_bank import CachedQuestion, QuestionBank
+
+
+def make_question(id_: int, theme_id: int) -> QuestionModel:
+    return QuestionModel(
+        id=id_,
+        title=f"question {id_}",
+        theme_id=theme_id,
+        true_answer=AnswerModel(title="answer", description="description"),
+    )
+
+
+class TestQuestionBank:
+    def test_sample_by_theme(self):
+        bank = QuestionBank()
+        bank.fill(
+            themes=[
+                ThemeModel(id=1, title="first"),
+                ThemeModel(id=2, title="second"),
+            ],
+            questions=[make_question(i, theme_id=1 + i % 2) for i in range(10)],
+        )
+
+        assert bank.loaded
+        for _ in range(20):
+            question = bank.sample(theme_id=2)
+            assert question.theme_id == 2
+            assert question.theme.title == "second"
+        assert bank.sample(theme_id=3) is None
+
+    def test_question_of_unknown_theme_invalidates(self):
+        bank = QuestionBank()
+        bank.fill(themes=[], questions=[])
+
+        bank.add_question(make_question(1, theme_id=1))
+
+        assert not bank.loaded
+        assert bank.sample() is None
+
+
+class TestRandomQuestion:
+    async def test_loaded_lazily(self, store: Store, question_1: QuestionModel):
+        question = await store.quizzes.random_question()
+
+        assert isinstance(question, CachedQuestion)
+        assert question.id == question_1.id
+        assert question.true_answer.title == question_1.true_answer.title
+
+    async def test_new_question_added_to_loaded_bank(
+        self, store: Store, theme_1: ThemeModel
+    ):
+        await store.quizzes.load_bank()
+        assert store.quizzes.bank.sample() is None
+
+        created = await store.quizzes.create_question(
+            title="new",
+            theme_id=theme_1.id,
+            true_answer=AnswerModel(title="answer", description="description"),
+        )
+
+        question = await store.quizzes.random_question(theme_id=theme_1.id)
+        assert question.id == created.id
+        assert question.theme.title == theme_1.title
@@ -0,0 +1,68 @@
+from sqlalchemy import select
+
+from app.quiz.models import AnswerModel, QuestionModel, ThemeModel
+from app.store.quiz.importer import RowError
+
+
+async def aiter_lines(text: str):  # noqa: RUF029
+    for line in text.splitlines(keepends=True):
+        yield line
+
+
+class TestQuestionImport:
+    async def test_import_csv(self, store, db_sessionmaker):
+        report = await store.quizzes.import_questions(
+            aiter_lines(
+                "theme,question,answer,description\n"
+                "Кино,Кто снял Сталкера?,Тарковский,Фильм 1979 года\n"
+                "Кино,Кто снял Солярис?,Тарковский,\n"
+                "Книги,,Булгаков,\n"
+            ),
+            fmt="csv",
+        )
+
+        assert (report.total, report.imported, report.invalid) == (3, 2, 1)
+        assert report.errors == [
+            RowError(line=4, error="Не заполнены поля: question")
+        ]
+        async with db_sessionmaker() as session:
+            themes = (await session.scalars(select(ThemeModel.title))).all()
+            answers = (
+                await session.execute(
+                    select(QuestionModel.title, AnswerModel.description)
+                    .join(AnswerModel)
+                    .order_by(QuestionModel.title)
+                )
+            ).all()
+        assert themes == ["Кино"]
+        assert answers == [
+            ("Кто снял Солярис?", None),
+            ("Кто снял Сталкера?", "Фильм 1979 года"),
+        ]
+
+    async def test_duplicates_are_reported(self, store, db_sessionmaker):
+        theme = await store.quizzes.create_theme(title="Кино")
+        await store.quizzes.create_question(
+            title="Кто снял Сталкера?",
+            theme_id=theme.id,
+            true_answer=AnswerModel(title="Тарковский"),
+        )
+
+        report = await store.quizzes.import_questions(
+            aiter_lines(
+                '{"theme": "Кино", "question": "Кто снял Сталкера?", '
+                '"answer": "Тарковский"}\n'
+                '{"theme": "Кино", "question": "Кто снял Солярис?", '
+                '"answer": "Тарковский"}\n'
+                '{"theme": "Кино", "question": "Кто снял Солярис?", '
+                '"answer": "Андрей Тарковский"}\n'
+            ),
+            fmt="jsonl",
+        )
+
+        assert (report.imported, report.duplicates) == (1, 2)
+        assert [error.line for error in report.errors] == [1, 3]
+        async with db_sessionmaker() as session:
+            count = len((await session.scalars(select(QuestionModel))).all())
+        assert count == 2
+        assert not store.quizzes.bank.loaded
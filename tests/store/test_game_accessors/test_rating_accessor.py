@@ -0,0 +1,66 @@
+from sqlalchemy import update
+
+from app.bot.game.models import SessionModel
+from app.store.bot.consts import MAX_SCORE
+
+
+class TestRatingAccessor:
+    async def test_table_exists(self, inspect_list_tables: list[str]):
+        assert "chat_ratings" in inspect_list_tables
+
+    async def test_no_games(self, store, chat_id):
+        assert await store.ratings.get_chat_rating(chat_id=chat_id) is None
+        assert await store.ratings.top_chats() == []
+        assert await store.ratings.top_players() == []
+
+    async def test_game_over_updates_rating(
+        self,
+        store,
+        db_sessionmaker,
+        chat_id,
+        username_tg,
+        active_game_session,
+        active_player,
+        active_round,
+    ):
+        async with db_sessionmaker() as sess:
+            await sess.execute(
+                update(SessionModel).values(
+                    experts_score=MAX_SCORE - 1, bot_score=2
+                )
+            )
+            await sess.commit()
+        await store.rounds.set_answer_player_id(
+            session_id=active_game_session.id,
+            answer_player_id=active_player.id,
+        )
+
+        await store.rounds.close_round(
+            session_id=active_game_session.id, is_correct=True
+        )
+
+        rating = await store.ratings.get_chat_rating(chat_id=chat_id)
+        assert rating.games_played == 1
+        assert rating.expert_wins == 1
+        assert rating.bot_wins == 0
+        assert rating.last_experts_score == MAX_SCORE
+        assert rating.last_bot_score == 2
+
+        assert [r.chat_id for r in await store.ratings.top_chats()] == [chat_id]
+        assert await store.ratings.top_players(limit=1) == [
+            {
+                "username_tg": username_tg,
+                "games_played": 1,
+                "wins": 1,
+                "correct_answers": 1,
+            }
+        ]
+
+    async def test_unfinished_game_not_counted(
+        self, store, chat_id, active_game_session, active_round
+    ):
+        await store.rounds.close_round(
+            session_id=active_game_session.id, is_correct=False
+        )
+
+        assert await store.ratings.get_chat_rating(chat_id=chat_id) is None
@@ -0,0 +1,31 @@
+import dataclasses
+from unittest.mock import MagicMock
+
+from app.store.database.database import Database
+from app.web.config import ReplicaConfig
+
+
+class TestReadReplicaConnection:
+    """Проверка настоящего запроса отставания.
+    Если в tests/config.yaml задан database.replica, используется
+    он (например, второй локальный Postgres), иначе репликой
+    притворяется сама тестовая БД.
+    """
+
+    async def test_lag_query(self, app):
+        db_config = app.config.database
+        replica = db_config.replica or ReplicaConfig(host=db_config.host)
+        replica_app = MagicMock()
+        replica_app.config.database = dataclasses.replace(
+            db_config, replica=replica
+        )
+        database = Database(replica_app)
+        await database.connect()
+        try:
+            assert await database.replica_available() is True
+            assert database.replica_lag == 0
+
+            async with await database.get_read_session() as session:
+                assert session.bind is database.replica_engine
+        finally:
+            await database.disconnect()
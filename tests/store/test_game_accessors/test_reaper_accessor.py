@@ -0,0 +1,139 @@
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select, update
+
+from app.bot.game.models import (
+    GameState,
+    SessionModel,
+    StateModel,
+    StatusSession,
+)
+from app.store.bot import consts
+from app.store.bot.board import GameBoard
+from app.web.config import ReaperConfig
+
+
+async def make_idle(db_sessionmaker, idle: timedelta) -> None:
+    """Сдвигает время последних изменений всех сессий и state в прошлое"""
+    moment = datetime.now(UTC) - idle
+    async with db_sessionmaker() as sess:
+        for model in (SessionModel, StateModel):
+            await sess.execute(
+                update(model).values(created_at=moment, updated_at=moment)
+            )
+        await sess.commit()
+
+
+class TestSessionReaperAccessor:
+    async def test_nothing_to_reap(self, store):
+        """RETURNING доходит до Postgres и на пустых таблицах"""
+        reaped = await store.reaper.reap_sessions(
+            pending_before=datetime.now(UTC),
+            processing_before=datetime.now(UTC),
+            batch_size=10,
+        )
+
+        assert reaped == []
+
+    async def test_reap_abandoned_pending(self, store, db_sessionmaker):
+        pending = await store.game_session.create_session(
+            chat_id=1, status=StatusSession.PENDING
+        )
+        await store.fsm.update_data(chat_id=1, new_data={"a": 1})
+        await make_idle(db_sessionmaker, timedelta(hours=2))
+
+        reaped = await store.reaper.reap_sessions(
+            pending_before=datetime.now(UTC) - timedelta(hours=1),
+            processing_before=datetime.now(UTC) - timedelta(hours=1),
+            batch_size=10,
+        )
+
+        assert reaped == [(pending.id, 1, StatusSession.PENDING)]
+        async with db_sessionmaker() as sess:
+            session = await sess.get(SessionModel, pending.id)
+            state = await sess.scalar(
+                select(StateModel).where(StateModel.session_id == pending.id)
+            )
+        assert session.status == StatusSession.CANCELLED
+        assert state.current_state == GameState.INACTIVE
+        assert state.data == {}
+        # Чат свободен для новой игры
+        assert await store.game_session.get_active_session_by_chat_id(1) is None
+
+    async def test_keeps_recent_sessions(
+        self, store, db_sessionmaker, active_game_session
+    ):
+        await make_idle(db_sessionmaker, timedelta(minutes=10))
+
+        reaped = await store.reaper.reap_sessions(
+            pending_before=datetime.now(UTC) - timedelta(minutes=5),
+            processing_before=datetime.now(UTC) - timedelta(hours=1),
+            batch_size=10,
+        )
+
+        assert reaped == []
+
+    async def test_recent_state_keeps_session(
+        self, store, db_sessionmaker, active_game_session
+    ):
+        await make_idle(db_sessionmaker, timedelta(hours=2))
+        await store.fsm.set_state(
+            chat_id=active_game_session.chat_id,
+            new_state=GameState.WAIT_ANSWER,
+        )
+
+        reaped = await store.reaper.reap_sessions(
+            pending_before=datetime.now(UTC) - timedelta(hours=1),
+            processing_before=datetime.now(UTC) - timedelta(hours=1),
+            batch_size=10,
+        )
+
+        assert reaped == []
+
+    async def test_run_once_in_batches(self, app, store, db_sessionmaker):
+        for chat_id in range(1, 4):
+            await store.game_session.create_session(
+                chat_id=chat_id, status=StatusSession.PROCESSING
+            )
+        await store.game_session.create_session(
+            chat_id=4, status=StatusSession.PENDING
+        )
+        await make_idle(db_sessionmaker, timedelta(hours=2))
+        config = app.config.reaper
+        app.config.reaper = ReaperConfig(
+            pending_timeout=60, processing_timeout=60, batch_size=2
+        )
+        try:
+            report = await store.reaper.run_once()
+        finally:
+            app.config.reaper = config
+
+        assert (report.total, report.pending, report.processing) == (4, 1, 3)
+        assert sorted(chat_id for _, chat_id in report.sessions) == [1, 2, 3, 4]
+
+    async def test_run_once_closes_board(self, app, store, db_sessionmaker):
+        await store.game_session.create_session(
+            chat_id=1, status=StatusSession.PROCESSING
+        )
+        await make_idle(db_sessionmaker, timedelta(hours=2))
+        store.board.boards[1] = GameBoard(message_id=10, deadline=1.0)
+        store.tg_api.reset_mock()
+        config = app.config.reaper
+        app.config.reaper = ReaperConfig(processing_timeout=60)
+        app.config.bot.board_mode = True
+        try:
+            report = await store.reaper.run_once()
+        finally:
+            app.config.reaper = config
+            app.config.bot.board_mode = False
+
+        assert report.total == 1
+        assert 1 not in store.board.boards
+        store.tg_api.post_message.assert_called_once_with(
+            chat_id=1, text=consts.GAME_REAPED
+        )
+        store.tg_api.edit_message_text.assert_called_once()
+        assert (
+            consts.BOARD_PHASE_FINISHED
+            in store.tg_api.edit_message_text.call_args.kwargs["text"]
+        )
@@ -115,3 +115,38 @@ class TestPlayerAccessor:
 
         assert curr_round is not None
         assert curr_round.is_correct_answer is False
+
+    @pytest.mark.asyncio
+    async def test_set_is_correct_answer_updates_score(
+        self, store, active_round, active_game_session
+    ):
+        score = await store.rounds.set_is_correct_answer(
+            session_id=active_game_session.id, new_is_correct_answer=True
+        )
+        assert score == {"experts": 1, "bot": 0, "total_rounds": 1}
+        assert await store.game_session.gen_score(
+            session_id=active_game_session.id
+        ) == {"experts": 1, "bot": 0, "total_rounds": 1}
+
+        # Раунд уже с вердиктом - счет не меняется
+        assert (
+            await store.rounds.set_is_correct_answer(
+                session_id=active_game_session.id, new_is_correct_answer=False
+            )
+            is None
+        )
+
+    @pytest.mark.asyncio
+    async def test_close_round(
+        self, store, db_sessionmaker, active_round, active_game_session
+    ):
+        score = await store.rounds.close_round(
+            session_id=active_game_session.id, is_correct=False
+        )
+        assert score == {"experts": 0, "bot": 1, "total_rounds": 1}
+
+        async with db_sessionmaker() as sess:
+            curr_round = await sess.get(RoundModel, active_round.id)
+
+        assert curr_round.is_active is False
+        assert curr_round.is_correct_answer is False
@@ -0,0 +1,183 @@
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import update
+
+from app.bot.game.models import (
+    SessionArchiveModel,
+    SessionModel,
+    StatusSession,
+)
+from app.store.bot.consts import MAX_SCORE
+
+
+async def answer(store, session_id: int, player_id: int, *, is_correct: bool):
+    await store.rounds.set_answer_player_id(
+        session_id=session_id, answer_player_id=player_id
+    )
+    return await store.rounds.close_round(
+        session_id=session_id, is_correct=is_correct
+    )
+
+
+class TestUserStats:
+    async def test_table_exists(self, inspect_list_tables: list[str]):
+        assert "user_stats" in inspect_list_tables
+
+    async def test_unknown_user(self, store):
+        assert await store.users.get_player_stats_by_username("nobody") == {
+            "username": "nobody",
+            "total_answers": 0,
+            "correct_answers": 0,
+            "incorrect_answers": 0,
+            "games_played": 0,
+            "wins": 0,
+        }
+
+    async def test_close_round_counts_answer(
+        self,
+        store,
+        active_game_session,
+        active_player,
+        active_round,
+        username_tg,
+    ):
+        await answer(
+            store, active_game_session.id, active_player.id, is_correct=False
+        )
+
+        stats = await store.users.get_player_stats_by_username(username_tg)
+
+        assert stats["total_answers"] == 1
+        assert stats["correct_answers"] == 0
+        assert stats["incorrect_answers"] == 1
+        assert stats["games_played"] == 0
+
+    async def test_last_round_counts_game(
+        self,
+        store,
+        db_sessionmaker,
+        active_game_session,
+        active_player,
+        active_round,
+        username_tg,
+    ):
+        async with db_sessionmaker() as sess:
+            await sess.execute(
+                update(SessionModel).values(experts_score=MAX_SCORE - 1)
+            )
+            await sess.commit()
+
+        score = await answer(
+            store, active_game_session.id, active_player.id, is_correct=True
+        )
+
+        assert score["experts"] == MAX_SCORE
+        stats = await store.users.get_player_stats_by_username(username_tg)
+        assert stats["games_played"] == 1
+        assert stats["wins"] == 1
+
+    async def test_rebuild_matches_incremental(
+        self,
+        store,
+        db_sessionmaker,
+        active_game_session,
+        active_player,
+        active_round,
+        username_tg,
+    ):
+        async with db_sessionmaker() as sess:
+            await sess.execute(
+                update(SessionModel).values(bot_score=MAX_SCORE - 1)
+            )
+            await sess.commit()
+        await answer(
+            store, active_game_session.id, active_player.id, is_correct=False
+        )
+        await store.game_session.set_status(
+            session_id=active_game_session.id,
+            new_status=StatusSession.COMPLETED,
+        )
+        incremental = await store.users.get_player_stats_by_username(
+            username_tg
+        )
+
+        assert await store.users.rebuild_stats() == 1
+        assert (
+            await store.users.get_player_stats_by_username(username_tg)
+            == incremental
+        )
+        assert incremental["games_played"] == 1
+        assert incremental["wins"] == 0
+
+    async def test_rebuild_skips_unjudged_rounds(
+        self,
+        store,
+        active_game_session,
+        active_player,
+        active_round,
+        username_tg,
+    ):
+        """Отвечающий выбран, но вердикта нет: ответ не считается
+        ни в рабочих таблицах, ни в архиве
+        """
+        await store.rounds.set_answer_player_id(
+            session_id=active_game_session.id,
+            answer_player_id=active_player.id,
+        )
+        await store.game_session.set_status(
+            session_id=active_game_session.id,
+            new_status=StatusSession.CANCELLED,
+        )
+
+        await store.users.rebuild_stats()
+        live = await store.users.get_player_stats_by_username(username_tg)
+        await store.archive.archive_finished_sessions(
+            older_than=datetime.now(UTC) + timedelta(minutes=1),
+            batch_size=10,
+        )
+        await store.users.rebuild_stats()
+        archived = await store.users.get_player_stats_by_username(username_tg)
+
+        assert live["total_answers"] == archived["total_answers"] == 0
+        assert live["incorrect_answers"] == archived["incorrect_answers"] == 0
+
+    async def test_rebuild_archived_verdicts(
+        self, store, db_sessionmaker, active_player, username_tg
+    ):
+        """Архивные раунды без вердикта не считаются, с false - считаются.
+        Строка архива пишется напрямую, без архиватора
+        """
+        user_id = active_player.user_id
+        async with db_sessionmaker() as sess:
+            sess.add(
+                SessionArchiveModel(
+                    id=10_000,
+                    chat_id=1,
+                    status=StatusSession.CANCELLED,
+                    experts_score=0,
+                    bot_score=1,
+                    rounds_played=1,
+                    data={
+                        "session": {},
+                        "players": [],
+                        "rounds": [
+                            {
+                                "answer_user_id": user_id,
+                                "is_correct_answer": None,
+                            },
+                            {
+                                "answer_user_id": user_id,
+                                "is_correct_answer": False,
+                            },
+                        ],
+                    },
+                )
+            )
+            await sess.commit()
+
+        await store.users.rebuild_stats()
+        stats = await store.users.get_player_stats_by_username(username_tg)
+
+        assert stats["total_answers"] == 1
+        assert stats["correct_answers"] == 0
+        assert stats["incorrect_answers"] == 1
@@ -0,0 +1,120 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.store.bot import consts
+from app.store.bot.board import GameBoard, GameBoardManager
+from app.store.bot.keyboards import start_game_keyboard
+
+# Тесты обработчиков подменяют asyncio.sleep, а отсчет зависит от времени
+REAL_SLEEP = asyncio.sleep
+
+
+class TestGameBoard:
+    def test_render(self):
+        board = GameBoard(
+            phase=consts.BOARD_PHASE_DISCUSSION,
+            captain="cap",
+            roster={"cap": True, "player": False},
+            experts=2,
+            bot=1,
+        )
+
+        text = board.render()
+
+        assert consts.BOARD_PHASE_DISCUSSION in text
+        assert "cap (капитан)" in text
+        assert "player" in text
+
+    def test_notes_limited(self):
+        board = GameBoard()
+        for i in range(consts.BOARD_MAX_NOTES + 3):
+            board.add_note(str(i))
+
+        assert len(board.notes) == consts.BOARD_MAX_NOTES
+        assert board.notes[-1] == str(consts.BOARD_MAX_NOTES + 2)
+
+
+class TestGameBoardManager:
+    @staticmethod
+    def make_manager() -> GameBoardManager:
+        app = MagicMock()
+        app.store.tg_api.send_message = AsyncMock(
+            return_value=MagicMock(message_id=10)
+        )
+        app.store.tg_api.edit_message_text = AsyncMock()
+        app.store.tg_api.pin_chat_message = AsyncMock()
+        return GameBoardManager(app)
+
+    async def test_open_sends_and_pins(self):
+        manager = self.make_manager()
+        tg_api = manager.app.store.tg_api
+
+        await manager.open(
+            chat_id=1, captain="cap", reply_markup=start_game_keyboard
+        )
+
+        tg_api.send_message.assert_called_once()
+        tg_api.pin_chat_message.assert_called_once_with(
+            chat_id=1, message_id=10
+        )
+        assert manager.get(1).message_id == 10
+
+    async def test_changes_debounced_into_one_edit(self):
+        manager = self.make_manager()
+        tg_api = manager.app.store.tg_api
+        await manager.open(chat_id=1, captain="cap")
+
+        with patch.object(consts, "BOARD_EDIT_DEBOUNCE", 0.01):
+            manager.set_player(1, "player")
+            manager.note(1, "note")
+            manager.update(1, experts=1)
+            await manager._flush_tasks[1]
+
+        tg_api.edit_message_text.assert_called_once()
+        text = tg_api.edit_message_text.call_args.kwargs["text"]
+        assert "player" in text
+        assert "note" in text
+
+    async def test_close_forgets_board(self):
+        manager = self.make_manager()
+        tg_api = manager.app.store.tg_api
+        await manager.open(chat_id=1, captain="cap")
+        manager.note(1, "note")
+
+        await manager.close(1, phase=consts.BOARD_PHASE_FINISHED)
+
+        assert 1 not in manager.boards
+        assert not manager._flush_tasks
+        assert tg_api.edit_message_text.call_args.kwargs["reply_markup"] is None
+
+    async def test_countdown_ticks_while_deadline_set(self):
+        manager = self.make_manager()
+        tg_api = manager.app.store.tg_api
+        await manager.open(chat_id=1, captain="cap")
+        assert not manager._tick_tasks
+
+        with (
+            patch.object(consts, "BOARD_COUNTDOWN_STEP", 0.05),
+            patch.object(asyncio, "sleep", REAL_SLEEP),
+        ):
+            manager.get(1).deadline = time.monotonic() + 0.22
+            await manager.flush(1)
+            while 1 in manager._tick_tasks:
+                await manager._tick_tasks[1]
+
+        # 0.22 -> тики на 0.15, 0.1 и 0.05 секунды до конца
+        assert tg_api.edit_message_text.call_count == 4
+
+    async def test_close_stops_countdown(self):
+        manager = self.make_manager()
+        await manager.open(chat_id=1, captain="cap")
+        manager.get(1).deadline = time.monotonic() + 60
+        await manager.flush(1)
+        tick = manager._tick_tasks[1]
+
+        await manager.close(1, phase=consts.BOARD_PHASE_FINISHED)
+        await asyncio.wait([tick])
+
+        assert tick.cancelled()
+        assert not manager._tick_tasks
@@ -54,7 +54,7 @@ class TestBotBase:
         # Проверяем вызовы
         tg_api = mock_app.store.tg_api
         mock_app.store.fsm.get_data.assert_called_once_with(chat_id)
-        tg_api.delete_messages.assert_called_once_with(
+        tg_api.delete_messages_in_background.assert_called_once_with(
             chat_id, unnecessary_messages
         )
         mock_app.store.fsm.update_data.assert_called_once()
@@ -96,7 +96,7 @@ class TestBotBase:
         bot_base.game_store.set_status.assert_called_once_with(
             session_id=session_id, new_status=new_status
         )
-        bot_base.app.store.tg_api.send_message.assert_called_once_with(
+        bot_base.app.store.tg_api.post_message.assert_called_once_with(
             chat_id=chat_id, text=text
         )
         bot_base.app.store.timer_manager.clean_timers.assert_called_once_with(
@@ -121,7 +121,7 @@ class TestBotBase:
         bot_base.game_store.get_active_session_by_chat_id.assert_called_once_with(
             chat_id=chat_id, inload_players=True
         )
-        bot_base.app.store.tg_api.send_message.assert_called_once_with(
+        bot_base.app.store.tg_api.post_message.assert_called_once_with(
             chat_id=chat_id,
             text="*У вас нет активной игровой сессии.*\n" "Начните её /start",
         )
@@ -212,10 +212,13 @@ class TestBotBase:
         bot_base.app.store.fsm.set_state.assert_called_once_with(
             chat_id=chat_id, new_state=GameState.QUESTION_DISCUTION
         )
-        bot_base.app.store.quizzes.random_question.assert_called()
+        game_store.pop_deck_question.assert_called_once_with(
+            session_id=session_id, chat_id=chat_id
+        )
+        bot_base.app.store.quizzes.get_cached_question.assert_called()
         bot_base.round_store.create_round.assert_called()
         bot_base.game_store.set_current_round.assert_called()
-        bot_base.app.store.tg_api.send_message.assert_called()
+        bot_base.app.store.tg_api.post_message.assert_called()
         bot_base.app.store.timer_manager.start_timer.assert_called_once_with(
             chat_id=chat_id,
             timeout=consts.QUESTION_DISCUTION_TIMEOUT,
@@ -267,6 +270,7 @@ class TestBotBase:
         bot_base.round_store.create_round.assert_not_called()
         bot_base.game_store.set_current_round.assert_not_called()
         bot_base.app.store.tg_api.send_message.assert_not_called()
+        bot_base.app.store.tg_api.post_message.assert_not_called()
         bot_base.app.store.timer_manager.start_timer.assert_not_called()
 
     @pytest.mark.asyncio
@@ -303,6 +307,7 @@ class TestBotBase:
         bot_base.round_store.create_round.assert_not_called()
         bot_base.game_store.set_current_round.assert_not_called()
         bot_base.app.store.tg_api.send_message.assert_not_called()
+        bot_base.app.store.tg_api.post_message.assert_not_called()
         bot_base.app.store.timer_manager.start_timer.assert_not_called()
 
     @pytest.mark.asyncio
@@ -326,7 +331,7 @@ class TestBotBase:
         bot_base.game_store.get_active_session_by_chat_id.assert_called_once_with(
             chat_id=chat_id, inload_players=True
         )
-        bot_base.app.store.tg_api.send_message.assert_called_once_with(
+        bot_base.app.store.tg_api.post_message.assert_called_once_with(
             chat_id=chat_id,
             text="*У вас нет активной игровой сессии.*\n" "Начните её /start",
         )
@@ -361,7 +366,7 @@ class TestBotBase:
             session_id=session_id,
         )
 
-        bot_base.app.store.tg_api.send_message.assert_called_once_with(
+        bot_base.app.store.tg_api.post_message.assert_called_once_with(
             chat_id=chat_id,
             text=consts.MESSAGE_FOR_CAPTAIN.format(
                 players_for_answer=players_for_answer
@@ -395,18 +400,15 @@ class TestBotBase:
             "bot": consts.MAX_SCORE,
             "total_rounds": 1 + consts.MAX_SCORE,
         }
-        bot_base.game_store.gen_score.return_value = score
         bot_base.cancel_game = AsyncMock()
         is_continue = await bot_base.check_and_notify_score(
-            session_id=session_id, chat_id=chat_id
+            session_id=session_id, chat_id=chat_id, score=score
         )
 
         assert is_continue is False
 
-        bot_base.game_store.gen_score.assert_called_once_with(
-            session_id=session_id
-        )
-        bot_base.app.store.tg_api.send_message.assert_called_with(
+        bot_base.game_store.gen_score.assert_not_called()
+        bot_base.app.store.tg_api.post_message.assert_called_with(
             chat_id=chat_id,
             text=consts.RUPOR_SCORE.format(
                 experts=score.get("experts"), bot=score.get("bot")
@@ -433,18 +435,15 @@ class TestBotBase:
             "bot": 3,
             "total_rounds": 3 + consts.MAX_SCORE,
         }
-        bot_base.game_store.gen_score.return_value = score
         bot_base.cancel_game = AsyncMock()
         is_continue = await bot_base.check_and_notify_score(
-            session_id=session_id, chat_id=chat_id
+            session_id=session_id, chat_id=chat_id, score=score
         )
 
         assert is_continue is False
 
-        bot_base.game_store.gen_score.assert_called_once_with(
-            session_id=session_id
-        )
-        bot_base.app.store.tg_api.send_message.assert_called_with(
+        bot_base.game_store.gen_score.assert_not_called()
+        bot_base.app.store.tg_api.post_message.assert_called_with(
             chat_id=chat_id,
             text=consts.RUPOR_SCORE.format(
                 experts=score.get("experts"), bot=score.get("bot")
@@ -471,18 +470,15 @@ class TestBotBase:
             "bot": consts.MAX_SCORE - 2,
             "total_rounds": consts.MAX_SCORE - 4,
         }
-        bot_base.game_store.gen_score.return_value = score
         bot_base.cancel_game = AsyncMock()
         is_continue = await bot_base.check_and_notify_score(
-            session_id=session_id, chat_id=chat_id
+            session_id=session_id, chat_id=chat_id, score=score
         )
 
         assert is_continue is True
 
-        bot_base.game_store.gen_score.assert_called_once_with(
-            session_id=session_id
-        )
-        bot_base.app.store.tg_api.send_message.assert_called_with(
+        bot_base.game_store.gen_score.assert_not_called()
+        bot_base.app.store.tg_api.post_message.assert_called_with(
             chat_id=chat_id,
             text=consts.RUPOR_SCORE.format(
                 experts=score.get("experts"), bot=score.get("bot")
@@ -491,13 +487,29 @@ class TestBotBase:
 
         bot_base.cancel_game.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_check_and_notify_score_round_already_closed(
+        self, bot_base, mock_app, chat_id, session_id
+    ):
+        """Раунд закрыл другой обработчик: счет уже объявлен им"""
+        bot_base.cancel_game = AsyncMock()
+        is_continue = await bot_base.check_and_notify_score(
+            session_id=session_id, chat_id=chat_id, score=None
+        )
+
+        assert is_continue is False
+        bot_base.app.store.tg_api.post_message.assert_not_called()
+        bot_base.cancel_game.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_is_answer_false(
         self, bot_base, mock_app, session_game, chat_id, session_id
     ):
         """Тест на то, что ответ неправильный (по разным причинам)."""
         text = "К сожалению вот так вот"
-        bot_base.check_and_notify_score = AsyncMock()
+        score = {"experts": 1, "bot": 2, "total_rounds": 3}
+        bot_base.round_store.close_round.return_value = score
+        bot_base.check_and_notify_score = AsyncMock(return_value=True)
         bot_base.add_message_in_unnecessary_messages = AsyncMock()
         await bot_base.is_answer_false(
             session_id=session_id, current_chat_id=chat_id, text=text
@@ -505,14 +517,11 @@ class TestBotBase:
         bot_base.player_store.set_all_players_is_ready_false.assert_called_with(
             session_id=session_id
         )
-        bot_base.round_store.set_is_correct_answer.assert_called_with(
-            session_id=session_id, new_is_correct_answer=False
-        )
-        bot_base.round_store.set_is_active_to_false.assert_called_with(
-            session_id=session_id
+        bot_base.round_store.close_round.assert_called_with(
+            session_id=session_id, is_correct=False
         )
         bot_base.check_and_notify_score.assert_called_with(
-            session_id=session_id, chat_id=chat_id
+            session_id=session_id, chat_id=chat_id, score=score
         )
         bot_base.app.store.tg_api.send_message.assert_called_with(
             chat_id=chat_id,
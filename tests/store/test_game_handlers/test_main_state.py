@@ -3,12 +3,14 @@ from unittest.mock import AsyncMock
 import pytest
 
 from app.bot.game.models import (
+    ChatRatingModel,
     GameState,
     StatusSession,
 )
 from app.store.bot import consts
 from app.store.bot.gamebot.main_state import MainGameBot
 from app.store.bot.keyboards import main_keyboard, start_game_keyboard
+from app.store.events.bus import GameEventType
 from app.store.rabbit.dataclasses import CommandTG
 
 
@@ -73,7 +75,7 @@ class TestMainGameBot:
         )
 
         await main_bot.handle_back(command_back, None)
-        main_bot.app.store.tg_api.send_message.assert_called_once_with(
+        main_bot.app.store.tg_api.post_message.assert_called_once_with(
             chat_id=chat_id, text=consts.DONT_EXIST_GAME_IN_CHAT
         )
 
@@ -99,7 +101,7 @@ class TestMainGameBot:
         )
 
         await main_bot.handle_back(command_back, None)
-        main_bot.app.store.tg_api.send_message.assert_called_once_with(
+        main_bot.app.store.tg_api.post_message.assert_called_once_with(
             text=consts.CANCEL_GAME_ONLY_CAP,
             chat_id=chat_id,
         )
@@ -197,6 +199,11 @@ class TestMainGameBot:
             chat_id=chat_id,
             status=StatusSession.PENDING,
         )
+        main_bot.app.store.events.publish.assert_called_once_with(
+            GameEventType.SESSION_CREATED,
+            chat_id=chat_id,
+            session_id=main_bot.game_store.create_session.return_value.id,
+        )
         main_bot.app.store.tg_api.send_message.assert_called_once_with(
             chat_id=chat_id,
             text=consts.WELCOME_TO_GAME,
@@ -204,6 +211,24 @@ class TestMainGameBot:
         )
         main_bot.add_message_in_unnecessary_messages.assert_called()
 
+    @pytest.mark.asyncio
+    async def test_handle_start_command_concurrent_start(
+        self, main_bot, mock_app, chat_id, command_start
+    ):
+        """Два /start одновременно: второй не создал игру
+        и отвечает, что она уже идет
+        """
+        main_bot.game_store.get_active_session_by_chat_id.return_value = None
+        main_bot.add_message_in_unnecessary_messages = AsyncMock()
+        main_bot.game_store.create_session = AsyncMock(return_value=None)
+
+        await main_bot.handle_start_command(command_start, None)
+
+        main_bot.app.store.events.publish.assert_not_called()
+        main_bot.app.store.tg_api.send_message.assert_called_once_with(
+            chat_id=chat_id, text=consts.EXIST_GAME_CAN_EXIT, reply_markup=None
+        )
+
     @pytest.mark.asyncio
     async def test_handle_start_game_dont_exist_session(
         self, main_bot, mock_app, chat_id, session_id, session_game, callback
@@ -291,43 +316,74 @@ class TestMainGameBot:
         main_bot.add_message_in_unnecessary_messages.assert_called()
 
     @pytest.mark.asyncio
-    async def test_handle_show_rating(
-        self, main_bot, mock_app, chat_id, callback, session_game
-    ):
-        """Тест поведение /back если отправил капитан"""
+    async def test_handle_show_rating(self, main_bot, mock_app, callback):
+        """Рейтинг чата читается одной строкой chat_ratings"""
         main_bot.add_message_in_unnecessary_messages = AsyncMock()
-        experts = 1
-        bot = 2
-        completed_sessions = [
-            session_game,
-        ]
-        main_bot.game_store.gen_score = AsyncMock(
-            return_value={
-                "experts": experts,
-                "bot": bot,
-                "total_rounds": 3,
-            }
-        )
-        main_bot.game_store.get_completed_sessions = AsyncMock(
-            return_value=completed_sessions
+        main_bot.app.store.ratings.get_chat_rating.return_value = (
+            ChatRatingModel(
+                chat_id=callback.chat.id_,
+                games_played=3,
+                expert_wins=2,
+                bot_wins=1,
+                last_experts_score=1,
+                last_bot_score=2,
+            )
         )
 
         callback.data = "show_rating"
 
         await main_bot.handle_show_rating(callback, None)
-        main_bot.game_store.get_completed_sessions.assert_called_once_with(
+        main_bot.app.store.ratings.get_chat_rating.assert_called_once_with(
             chat_id=callback.chat.id_
         )
-        main_bot.game_store.gen_score.assert_called_once_with(
-            session_id=session_game.id
+        main_bot.game_store.get_completed_sessions.assert_not_called()
+
+        main_bot.app.store.tg_api.send_message.assert_called_once_with(
+            callback.chat.id_,
+            consts.RATING_INFO.format(
+                count=3, expert_wins=2, bot_wins=1, experts=1, bot=2
+            ),
         )
+        main_bot.add_message_in_unnecessary_messages.assert_called()
+
+    @pytest.mark.asyncio
+    async def test_handle_show_rating_empty(self, main_bot, mock_app, callback):
+        main_bot.add_message_in_unnecessary_messages = AsyncMock()
+        main_bot.app.store.ratings.get_chat_rating.return_value = None
+        callback.data = "show_rating"
+
+        await main_bot.handle_show_rating(callback, None)
 
         main_bot.app.store.tg_api.send_message.assert_called_once_with(
             callback.chat.id_,
             consts.RATING_INFO.format(
-                count=len(completed_sessions),
-                experts=experts,
-                bot=bot,
+                count=0, expert_wins=0, bot_wins=0, experts=0, bot=0
+            ),
+        )
+
+    @pytest.mark.asyncio
+    async def test_handle_top_command(self, main_bot, mock_app, command):
+        main_bot.add_message_in_unnecessary_messages = AsyncMock()
+        main_bot.app.store.ratings.top_players.return_value = [
+            {
+                "username_tg": "courvuisier",
+                "games_played": 4,
+                "wins": 3,
+                "correct_answers": 10,
+            }
+        ]
+        command.text = "/top"
+
+        await main_bot.handle_top_command(command, None)
+
+        main_bot.app.store.ratings.top_players.assert_called_once_with(
+            limit=consts.TOP_PLAYERS_LIMIT
+        )
+        main_bot.app.store.tg_api.send_message.assert_called_once_with(
+            chat_id=command.chat.id_,
+            text=consts.TOP_PLAYERS_TITLE
+            + consts.TOP_PLAYER.format(
+                place=1, username="courvuisier", wins=3, correct=10
             ),
         )
         main_bot.add_message_in_unnecessary_messages.assert_called()
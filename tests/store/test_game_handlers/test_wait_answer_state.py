@@ -8,6 +8,8 @@ from app.quiz.models import AnswerModel, QuestionModel, ThemeModel
 from app.store.bot import consts
 from app.store.bot.gamebot.wait_answer_state import WaitAnswer
 
+SCORE = {"experts": 1, "bot": 1, "total_rounds": 2}
+
 
 class TestWaitAnswer:
     @pytest.fixture
@@ -66,7 +68,7 @@ class TestWaitAnswer:
 
         await wait_answer.handle_wait_answer(message, GameState.WAIT_ANSWER)
         wait_answer.game_store.get_active_session_by_chat_id.assert_called_with(
-            chat_id=session_game.chat_id
+            chat_id=session_game.chat_id, include_curr_round=True
         )
 
         wait_answer.is_answer_false.assert_called_once_with(
@@ -100,8 +102,7 @@ class TestWaitAnswer:
         session_game.current_round.question.is_answer_is_true = Mock(
             return_value=False
         )
-        wait_answer.round_store.set_is_correct_answer = AsyncMock()
-        wait_answer.round_store.set_is_active_to_false = AsyncMock()
+        wait_answer.round_store.close_round = AsyncMock(return_value=SCORE)
         wait_answer.next_quest = AsyncMock()
         wait_answer.check_and_notify_score = AsyncMock(return_value=True)
 
@@ -112,27 +113,26 @@ class TestWaitAnswer:
 
         await wait_answer.handle_wait_answer(message, GameState.WAIT_ANSWER)
         wait_answer.game_store.get_active_session_by_chat_id.assert_called_with(
-            chat_id=session_game.chat_id
+            chat_id=session_game.chat_id, include_curr_round=True
         )
         wait_answer.app.store.timer_manager.cancel_timer.assert_called_with(
             chat_id=session_game.chat_id, timer_type="30_second_for_answer"
         )
 
         session_game.current_round.question.is_answer_is_true(message.text)
-        wait_answer.app.store.tg_api.send_message.assert_called_with(
+        wait_answer.app.store.tg_api.post_message.assert_called_with(
             chat_id=session_game.chat_id,
             text=consts.IS_ANSWER_FALSE.format(
                 answer=session_game.current_round.question.true_answer.title
             ),
         )
-        wait_answer.round_store.set_is_correct_answer.assert_called_once_with(
-            session_id=session_game.id, new_is_correct_answer=False
-        )
-        wait_answer.round_store.set_is_active_to_false.assert_called_once_with(
-            session_id=session_game.id
+        wait_answer.round_store.close_round.assert_called_once_with(
+            session_id=session_game.id, is_correct=False
         )
         wait_answer.check_and_notify_score.assert_called_once_with(
-            session_id=session_game.id, chat_id=session_game.chat_id
+            session_id=session_game.id,
+            chat_id=session_game.chat_id,
+            score=SCORE,
         )
         wait_answer.next_quest.assert_called_once_with(
             text=consts.ARE_YOU_READY_NEXT_QUEST,
@@ -162,8 +162,7 @@ class TestWaitAnswer:
         session_game.current_round.question.is_answer_is_true = Mock(
             return_value=False
         )
-        wait_answer.round_store.set_is_correct_answer = AsyncMock()
-        wait_answer.round_store.set_is_active_to_false = AsyncMock()
+        wait_answer.round_store.close_round = AsyncMock(return_value=SCORE)
         wait_answer.next_quest = AsyncMock()
         wait_answer.check_and_notify_score = AsyncMock(return_value=False)
 
@@ -174,27 +173,26 @@ class TestWaitAnswer:
 
         await wait_answer.handle_wait_answer(message, GameState.WAIT_ANSWER)
         wait_answer.game_store.get_active_session_by_chat_id.assert_called_with(
-            chat_id=session_game.chat_id
+            chat_id=session_game.chat_id, include_curr_round=True
         )
         wait_answer.app.store.timer_manager.cancel_timer.assert_called_with(
             chat_id=session_game.chat_id, timer_type="30_second_for_answer"
         )
 
         session_game.current_round.question.is_answer_is_true(message.text)
-        wait_answer.app.store.tg_api.send_message.assert_called_with(
+        wait_answer.app.store.tg_api.post_message.assert_called_with(
             chat_id=session_game.chat_id,
             text=consts.IS_ANSWER_FALSE.format(
                 answer=session_game.current_round.question.true_answer.title
             ),
         )
-        wait_answer.round_store.set_is_correct_answer.assert_called_once_with(
-            session_id=session_game.id, new_is_correct_answer=False
-        )
-        wait_answer.round_store.set_is_active_to_false.assert_called_once_with(
-            session_id=session_game.id
+        wait_answer.round_store.close_round.assert_called_once_with(
+            session_id=session_game.id, is_correct=False
         )
         wait_answer.check_and_notify_score.assert_called_once_with(
-            session_id=session_game.id, chat_id=session_game.chat_id
+            session_id=session_game.id,
+            chat_id=session_game.chat_id,
+            score=SCORE,
         )
         wait_answer.next_quest.assert_not_called()
 
@@ -221,8 +219,7 @@ class TestWaitAnswer:
             return_value=True
         )
         asyncio.sleep = AsyncMock()
-        wait_answer.round_store.set_is_correct_answer = AsyncMock()
-        wait_answer.round_store.set_is_active_to_false = AsyncMock()
+        wait_answer.round_store.close_round = AsyncMock(return_value=SCORE)
         wait_answer.next_quest = AsyncMock()
         wait_answer.check_and_notify_score = AsyncMock(return_value=True)
 
@@ -233,27 +230,26 @@ class TestWaitAnswer:
 
         await wait_answer.handle_wait_answer(message, GameState.WAIT_ANSWER)
         wait_answer.game_store.get_active_session_by_chat_id.assert_called_with(
-            chat_id=session_game.chat_id
+            chat_id=session_game.chat_id, include_curr_round=True
         )
         wait_answer.app.store.timer_manager.cancel_timer.assert_called_with(
             chat_id=session_game.chat_id, timer_type="30_second_for_answer"
         )
 
         session_game.current_round.question.is_answer_is_true(message.text)
-        wait_answer.app.store.tg_api.send_message.assert_called_with(
+        wait_answer.app.store.tg_api.post_message.assert_called_with(
             chat_id=session_game.chat_id,
             text=consts.IS_ANSWER_TRUE.format(
                 answer=session_game.current_round.question.true_answer.title
             ),
         )
-        wait_answer.round_store.set_is_correct_answer.assert_called_once_with(
-            session_id=session_game.id, new_is_correct_answer=True
-        )
-        wait_answer.round_store.set_is_active_to_false.assert_called_once_with(
-            session_id=session_game.id
+        wait_answer.round_store.close_round.assert_called_once_with(
+            session_id=session_game.id, is_correct=True
         )
         wait_answer.check_and_notify_score.assert_called_once_with(
-            session_id=session_game.id, chat_id=session_game.chat_id
+            session_id=session_game.id,
+            chat_id=session_game.chat_id,
+            score=SCORE,
         )
         wait_answer.next_quest.assert_called_once_with(
             text=consts.ARE_YOU_READY_NEXT_QUEST,
@@ -285,8 +281,7 @@ class TestWaitAnswer:
         session_game.current_round.question.is_answer_is_true = Mock(
             return_value=True
         )
-        wait_answer.round_store.set_is_correct_answer = AsyncMock()
-        wait_answer.round_store.set_is_active_to_false = AsyncMock()
+        wait_answer.round_store.close_round = AsyncMock(return_value=SCORE)
         wait_answer.next_quest = AsyncMock()
         wait_answer.check_and_notify_score = AsyncMock(return_value=False)
 
@@ -297,26 +292,23 @@ class TestWaitAnswer:
 
         await wait_answer.handle_wait_answer(message, GameState.WAIT_ANSWER)
         wait_answer.game_store.get_active_session_by_chat_id.assert_called_with(
-            chat_id=session_game.chat_id
+            chat_id=session_game.chat_id, include_curr_round=True
         )
         wait_answer.app.store.timer_manager.cancel_timer.assert_called_with(
             chat_id=chat_id, timer_type="30_second_for_answer"
         )
 
         session_game.current_round.question.is_answer_is_true(message.text)
-        wait_answer.app.store.tg_api.send_message.assert_called_with(
+        wait_answer.app.store.tg_api.post_message.assert_called_with(
             chat_id=chat_id,
             text=consts.IS_ANSWER_TRUE.format(
                 answer=session_game.current_round.question.true_answer.title
             ),
         )
-        wait_answer.round_store.set_is_correct_answer.assert_called_once_with(
-            session_id=session_game.id, new_is_correct_answer=True
-        )
-        wait_answer.round_store.set_is_active_to_false.assert_called_once_with(
-            session_id=session_game.id
+        wait_answer.round_store.close_round.assert_called_once_with(
+            session_id=session_game.id, is_correct=True
         )
         wait_answer.check_and_notify_score.assert_called_once_with(
-            session_id=session_game.id, chat_id=chat_id
+            session_id=session_game.id, chat_id=chat_id, score=SCORE
         )
         wait_answer.next_quest.assert_not_called()
@@ -351,6 +351,11 @@ class TestWaitingPlayersProcessGameBot:
             text=consts.STARTED_GAME_FOR_CAP,
         )
         wait_p_state.deleted_unnecessary_messages.assert_called()
+        wait_p_state.game_store.draw_question_deck.assert_called_once_with(
+            session_id=session_id,
+            chat_id=chat_id,
+            size=consts.QUESTION_DECK_SIZE,
+        )
         wait_p_state.next_quest.assert_called_once_with(
             text=consts.ARE_YOU_READY_FIRST_QUEST,
             chat_id=chat_id,
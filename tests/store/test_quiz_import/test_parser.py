@@ -0,0 +1,94 @@
+import pytest
+
+from app.store.quiz.importer import (
+    ImportFormatError,
+    ImportRow,
+    RowError,
+    decode_lines,
+    parse_rows,
+)
+
+
+async def aiter_lines(text: str):  # noqa: RUF029
+    for line in text.splitlines(keepends=True):
+        yield line
+
+
+async def parse(text: str, fmt: str) -> list[ImportRow | RowError]:
+    return [row async for row in parse_rows(aiter_lines(text), fmt)]
+
+
+class TestParseCsv:
+    async def test_rows(self):
+        rows = await parse(
+            "theme,question,answer,description\n"
+            "Кино,Кто снял Сталкера?,Тарковский,\n"
+            'Книги,"Автор ""Мастера и Маргариты""?",Булгаков,Роман\n',
+            "csv",
+        )
+        assert rows == [
+            ImportRow(2, "Кино", "Кто снял Сталкера?", "Тарковский", None),
+            ImportRow(
+                3, "Книги", 'Автор "Мастера и Маргариты"?', "Булгаков", "Роман"
+            ),
+        ]
+
+    async def test_multiline_record_keeps_first_line_number(self):
+        rows = await parse(
+            "question,answer,theme\n"
+            '"Первая строка\nвторая строка",Ответ,Тема\n'
+            ",Ответ,Тема\n",
+            "csv",
+        )
+        assert rows == [
+            ImportRow(2, "Тема", "Первая строка\nвторая строка", "Ответ", None),
+            RowError(line=4, error="Не заполнены поля: question"),
+        ]
+
+    async def test_wrong_column_count(self):
+        rows = await parse("theme,question,answer\nТема,Вопрос\n", "csv")
+        assert rows == [
+            RowError(line=2, error="Ожидалось колонок: 3, получено: 2")
+        ]
+
+    async def test_unclosed_quote(self):
+        rows = await parse('theme,question,answer\nТема,"Вопрос,Ответ\n', "csv")
+        assert rows == [RowError(line=2, error="Незакрытая кавычка")]
+
+    async def test_missing_header_columns(self):
+        with pytest.raises(ImportFormatError):
+            await parse("theme,answer\nТема,Ответ\n", "csv")
+
+    async def test_empty_file(self):
+        with pytest.raises(ImportFormatError):
+            await parse("", "csv")
+
+
+class TestParseJsonl:
+    async def test_rows(self):
+        rows = await parse(
+            '{"theme": "Кино", "question": "Вопрос", "answer": "Ответ"}\n'
+            "\n"
+            "не json\n"
+            '{"theme": "Кино", "question": 1, "answer": "Ответ"}\n'
+            "[]\n",
+            "jsonl",
+        )
+        assert rows[0] == ImportRow(1, "Кино", "Вопрос", "Ответ", None)
+        assert [row.line for row in rows[1:]] == [3, 4, 5]
+        assert all(isinstance(row, RowError) for row in rows[1:])
+
+    async def test_unknown_format(self):
+        with pytest.raises(ImportFormatError):
+            await parse("", "xml")
+
+
+async def test_decode_lines_strips_bom():
+    async def chunks():  # noqa: RUF029
+        yield "\ufeffпервая\n".encode()
+        yield "\ufeffвторая\n".encode()
+
+    assert [line async for line in decode_lines(chunks())] == [
+        "первая\n",
+        "\ufeffвторая\n",
+    ]
@@ -0,0 +1,68 @@
+from unittest.mock import AsyncMock, call
+
+import pytest
+
+from app.store.tg_api.accessor import (
+    DELETE_MESSAGES_LIMIT,
+    TelegramApiAccessor,
+)
+
+
+class TestDeleteMessages:
+    @pytest.fixture
+    def tg_api(self, mock_app):
+        tg_api = TelegramApiAccessor(mock_app)
+        tg_api.delete_message = AsyncMock()
+        return tg_api
+
+    async def test_bulk_delete_split_by_limit(self, tg_api):
+        """Сообщения удаляются пачками не больше DELETE_MESSAGES_LIMIT"""
+        chat_id = 123
+        message_ids = list(range(DELETE_MESSAGES_LIMIT + 10))
+        tg_api._delete_messages_bulk = AsyncMock(return_value={"ok": True})
+
+        await tg_api.delete_messages(chat_id, message_ids)
+
+        tg_api._delete_messages_bulk.assert_has_calls(
+            [
+                call(chat_id, message_ids[:DELETE_MESSAGES_LIMIT]),
+                call(chat_id, message_ids[DELETE_MESSAGES_LIMIT:]),
+            ]
+        )
+        tg_api.delete_message.assert_not_called()
+
+    async def test_fallback_when_bulk_not_supported(self, tg_api):
+        """Если deleteMessages нет - удаляем по одному
+        и больше не пытаемся вызывать deleteMessages.
+        """
+        chat_id = 123
+        tg_api._delete_messages_bulk = AsyncMock(
+            return_value={"ok": False, "error_code": 404}
+        )
+
+        await tg_api.delete_messages(chat_id, [1, 2, 3])
+        await tg_api.delete_messages(chat_id, [4])
+
+        assert tg_api.bulk_delete_supported is False
+        tg_api._delete_messages_bulk.assert_called_once_with(chat_id, [1, 2, 3])
+        tg_api.delete_message.assert_has_calls(
+            [call(chat_id, 1), call(chat_id, 2), call(chat_id, 3)],
+            any_order=True,
+        )
+        tg_api.delete_message.assert_called_with(chat_id, 4)
+
+    async def test_delete_messages_in_background(self, tg_api):
+        """Удаление не блокирует вызывающего,
+        очередь дожидается его при отключении.
+        """
+        chat_id = 123
+        tg_api.delete_messages = AsyncMock()
+
+        await tg_api.delete_messages_in_background(chat_id, [1, 2])
+        tg_api.delete_messages.assert_not_awaited()
+        assert tg_api.outbox.depth == 1
+
+        await tg_api.disconnect(tg_api.app)
+
+        tg_api.delete_messages.assert_awaited_once_with(chat_id, [1, 2])
+        assert tg_api.outbox.depth == 0
@@ -0,0 +1,112 @@
+import pytest
+
+from app.store.bot.keyboards import main_keyboard
+from app.store.tg_api.accessor import (
+    RATE_LIMIT_RETRIES,
+    TelegramApiAccessor,
+    TelegramApiError,
+)
+from fake_tg_api.server import FakeApiConfig, FakeTelegramState, create_app
+
+
+class TestAccessorWithFakeServer:
+    @pytest.fixture
+    def fake_state(self):
+        return FakeTelegramState(config=FakeApiConfig())
+
+    @pytest.fixture
+    async def tg_api(self, aiohttp_server, fake_state, mock_app):
+        server = await aiohttp_server(create_app(fake_state))
+        mock_app.config.bot.api_url = str(server.make_url("/"))
+
+        tg_api = TelegramApiAccessor(mock_app)
+        await tg_api.connect(mock_app)
+        yield tg_api
+        await tg_api.disconnect(mock_app)
+
+    async def test_send_and_delete_messages(self, tg_api, fake_state):
+        chat_id = 123
+
+        messages = [
+            await tg_api.send_message(
+                chat_id=chat_id, text=f"text {i}", reply_markup=main_keyboard
+            )
+            for i in range(3)
+        ]
+        assert len(fake_state.chats[chat_id]) == 3
+        assert fake_state.last_message(chat_id)["reply_markup"] == dict(
+            main_keyboard
+        )
+
+        await tg_api.delete_messages(
+            chat_id, [message.message_id for message in messages]
+        )
+
+        assert fake_state.chats[chat_id] == {}
+        assert fake_state.calls["deleteMessages"] == 1
+
+    async def test_answer_callback_query(self, tg_api, fake_state):
+        await tg_api.answer_callback_query(
+            callback_query_id="42", text="Готово"
+        )
+        await tg_api.outbox.drain()
+
+        assert fake_state.answered_callbacks == [
+            {
+                "callback_query_id": "42",
+                "show_alert": False,
+                "cache_time": 0,
+                "text": "Готово",
+            }
+        ]
+
+    async def test_send_message_retries_after_429(self, tg_api, fake_state):
+        fake_state.config.rate_limit_every = 2
+        fake_state.config.retry_after = 0
+
+        first = await tg_api.send_message(chat_id=1, text="first")
+        second = await tg_api.send_message(chat_id=1, text="second")
+
+        assert fake_state.rate_limited == 1
+        assert second.message_id > first.message_id
+        assert fake_state.last_message(1)["text"] == "second"
+
+    async def test_send_message_gives_up_on_rate_limit(
+        self, tg_api, fake_state
+    ):
+        fake_state.config.rate_limit_every = 1
+        fake_state.config.retry_after = 0
+
+        with pytest.raises(TelegramApiError) as error:
+            await tg_api.send_message(chat_id=1, text="hi")
+
+        assert error.value.error_code == 429
+        assert fake_state.calls["sendMessage"] == RATE_LIMIT_RETRIES + 1
+
+    async def test_get_updates_long_polling(self, aiohttp_client, fake_state):
+        client = await aiohttp_client(create_app(fake_state))
+        fake_state.push_update({"message": {"text": "/start"}})
+
+        response = await client.post(
+            "/botTOKEN/getUpdates", json={"offset": 0, "timeout": 1}
+        )
+        updates = (await response.json())["result"]
+        assert [update["update_id"] for update in updates] == [1]
+
+        response = await client.post(
+            "/botTOKEN/getUpdates", json={"offset": 2, "timeout": 0.1}
+        )
+        assert (await response.json())["result"] == []
+
+    async def test_rate_limit(self, aiohttp_client, fake_state):
+        fake_state.config.rate_limit_every = 2
+        client = await aiohttp_client(create_app(fake_state))
+
+        statuses = []
+        for _ in range(4):
+            response = await client.post(
+                "/botTOKEN/sendMessage", json={"chat_id": 1, "text": "hi"}
+            )
+            statuses.append(response.status)
+
+        assert statuses == [200, 429, 200, 429]
@@ -0,0 +1,116 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.store.tg_api.outbox import OutboxClosedError, TelegramOutbox
+
+
+class TestTelegramOutbox:
+    async def test_submit_returns_result(self):
+        outbox = TelegramOutbox(workers=2)
+        call = AsyncMock(return_value=42)
+
+        assert await (await outbox.submit(1, call)) == 42
+        assert outbox.stats["processed"] == 1
+
+        await outbox.drain()
+
+    async def test_order_inside_chat(self):
+        """Запросы одного чата выполняются в порядке постановки"""
+        outbox = TelegramOutbox(workers=4)
+        done = []
+
+        def make_call(i: int):
+            async def call():
+                await asyncio.sleep(0.01 * (5 - i))
+                done.append(i)
+
+            return call
+
+        for i in range(5):
+            await outbox.post(123, make_call(i))
+
+        await outbox.drain()
+
+        assert done == [0, 1, 2, 3, 4]
+
+    async def test_error_goes_to_future(self):
+        outbox = TelegramOutbox(workers=1)
+        call = AsyncMock(side_effect=ValueError("boom"))
+
+        with pytest.raises(ValueError, match="boom"):
+            await (await outbox.submit(1, call))
+        assert outbox.stats["failed"] == 1
+
+        await outbox.drain()
+
+    async def test_closed_after_drain(self):
+        outbox = TelegramOutbox(workers=1)
+
+        await outbox.drain()
+
+        with pytest.raises(OutboxClosedError):
+            await outbox.post(1, AsyncMock())
+
+    async def test_full_queue_waits_for_space(self):
+        """Полная очередь тормозит вызывающего, запросы не теряются"""
+        outbox = TelegramOutbox(workers=1, max_size=1)
+        started = asyncio.Event()
+        release = asyncio.Event()
+        done = []
+
+        def make_call(i: int):
+            async def call():
+                started.set()
+                await release.wait()
+                done.append(i)
+
+            return call
+
+        # Первый запрос занимает воркера, второй - единственное место
+        await outbox.post(1, make_call(0))
+        await started.wait()
+        await outbox.post(1, make_call(1))
+        blocked = asyncio.create_task(outbox.post(1, make_call(2)))
+        await asyncio.wait([blocked], timeout=0.05)
+
+        assert not blocked.done()
+        assert outbox.stats["blocked"] == 1
+
+        release.set()
+        await blocked
+        await outbox.drain()
+
+        assert done == [0, 1, 2]
+
+    async def test_slow_chat_does_not_block_others(self):
+        outbox = TelegramOutbox(workers=4)
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+
+        # Медленные запросы занимают не все слоты, у каждого чата
+        # своя очередь
+        for chat_id in range(3):
+            await outbox.post(chat_id, slow)
+        fast = await outbox.submit(100, AsyncMock(return_value="ok"))
+
+        await asyncio.wait([fast], timeout=1)
+        assert fast.done()
+        assert outbox.stats["lanes"] == 3
+
+        release.set()
+        await outbox.drain()
+
+    async def test_idle_lanes_are_reaped(self):
+        outbox = TelegramOutbox(workers=1)
+
+        result = await outbox.submit(1, AsyncMock())
+        worker = outbox._lanes[1].task
+        await result
+        await asyncio.wait([worker], timeout=1)
+
+        assert outbox.stats["lanes"] == 0
+        assert await (await outbox.submit(1, AsyncMock(return_value=2))) == 2
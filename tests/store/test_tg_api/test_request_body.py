@@ -0,0 +1,28 @@
+import json
+
+from app.store.bot.keyboards import main_keyboard
+from app.store.tg_api.accessor import TelegramApiAccessor
+
+
+class TestBuildBody:
+    def test_body_without_markup(self):
+        params = {"chat_id": 1, "text": "Привет"}
+
+        body = TelegramApiAccessor._build_body(params)
+
+        assert json.loads(body) == params
+
+    def test_body_with_prepared_markup(self):
+        params = {"chat_id": 1, "text": "Привет"}
+
+        body = TelegramApiAccessor._build_body(params, main_keyboard)
+
+        assert json.loads(body) == {**params, "reply_markup": main_keyboard}
+
+    def test_body_with_plain_markup(self):
+        params = {"chat_id": 1, "text": "Привет"}
+        markup = {"inline_keyboard": [[{"text": "a", "callback_data": "b"}]]}
+
+        body = TelegramApiAccessor._build_body(params, markup)
+
+        assert json.loads(body) == {**params, "reply_markup": markup}
@@ -0,0 +1,119 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from aiohttp.test_utils import make_mocked_request
+
+from app.admin.tokens import (
+    AdminPrincipal,
+    TokenCache,
+    derive_key,
+    sign_token,
+    verify_token,
+)
+from app.store.admin.accessor import AdminAccessor
+from app.web.config import SessionConfig
+from app.web.middlewares import auth_middleware
+
+KEY = derive_key("secret")
+ADMIN = AdminPrincipal(id=1, email="admin@example.com")
+
+
+class TestTokens:
+    def test_round_trip(self):
+        token = sign_token(ADMIN, key=KEY, ttl=60, now=1000)
+        assert verify_token(token, key=KEY, now=1030) == (ADMIN, 1060)
+
+    def test_expired(self):
+        token = sign_token(ADMIN, key=KEY, ttl=60, now=1000)
+        assert verify_token(token, key=KEY, now=1060) is None
+
+    def test_other_key(self):
+        token = sign_token(ADMIN, key=KEY, ttl=60, now=1000)
+        assert verify_token(token, key=derive_key("other"), now=1000) is None
+
+    @pytest.mark.parametrize("token", ["", "garbage", "a.b", "ы.ы"])
+    def test_broken(self, token):
+        assert verify_token(token, key=KEY, now=1000) is None
+
+    def test_tampered_payload(self):
+        payload, signature = sign_token(ADMIN, key=KEY, ttl=60).split(".")
+        forged = sign_token(
+            AdminPrincipal(id=2, email=ADMIN.email), key=KEY, ttl=60
+        ).split(".")[0]
+        assert verify_token(f"{forged}.{signature}", key=KEY) is None
+        assert verify_token(f"{payload}.{signature}", key=KEY) is not None
+
+
+class TestTokenCache:
+    def test_entry_lives_until_ttl_or_token_expiry(self):
+        cache = TokenCache(ttl=10, max_size=10)
+        cache.put("long", ADMIN, expires_at=1000, now=0)
+        cache.put("short", ADMIN, expires_at=5, now=0)
+
+        assert cache.get("long", now=9) == ADMIN
+        assert cache.get("long", now=10) is None
+        assert cache.get("short", now=5) is None
+        assert len(cache) == 0
+
+    def test_evicts_oldest(self):
+        cache = TokenCache(ttl=10, max_size=2)
+        for token in ("a", "b", "c"):
+            cache.put(token, ADMIN, expires_at=100, now=0)
+
+        assert cache.get("a", now=1) is None
+        assert cache.get("c", now=1) == ADMIN
+
+
+@pytest.fixture
+def admins() -> AdminAccessor:
+    app = MagicMock()
+    app.config.session = SessionConfig(key="secret", token_ttl=60)
+    return AdminAccessor(app)
+
+
+class TestAdminAccessor:
+    def test_verify_is_cached(self, admins):
+        token = admins.issue_token(MagicMock(id=ADMIN.id, email=ADMIN.email))
+        assert admins.verify_token(token) == ADMIN
+
+        with patch("app.store.admin.accessor.verify_token") as verify:
+            assert admins.verify_token(token) == ADMIN
+        verify.assert_not_called()
+
+    def test_invalid(self, admins):
+        assert admins.verify_token("garbage") is None
+
+
+class TestAuthMiddleware:
+    @staticmethod
+    def request(admins, path: str, token: str | None = None):
+        app = MagicMock()
+        app.store.admins = admins
+        headers = {"Cookie": f"session_id={token}"} if token else None
+        return make_mocked_request("GET", path, headers=headers, app=app)
+
+    async def test_sets_request_admin(self, admins):
+        token = admins.issue_token(MagicMock(id=ADMIN.id, email=ADMIN.email))
+        request = self.request(admins, "/quiz.list_themes", token)
+
+        async def handler(request):  # noqa: RUF029
+            return request.admin
+
+        assert await auth_middleware(request, handler) == ADMIN
+
+    async def test_rejects_without_token(self, admins):
+        request = self.request(admins, "/quiz.list_themes", "garbage")
+        handler = MagicMock()
+
+        response = await auth_middleware(request, handler)
+
+        assert response.status == 401
+        handler.assert_not_called()
+
+    async def test_public_path(self, admins):
+        request = self.request(admins, "/admin.current")
+
+        async def handler(request):  # noqa: RUF029
+            return request.admin
+
+        assert await auth_middleware(request, handler) is None
@@ -0,0 +1,154 @@
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from aiohttp_apispec import setup_aiohttp_apispec, validation_middleware
+
+from app.bot.game.views import SessionEventsView
+from app.store.events.bus import (
+    EventBus,
+    GameEventType,
+    TooManySubscribersError,
+)
+from app.web.app import Application
+from app.web.config import EventsConfig
+
+
+def make_app(**config) -> Application:
+    app = Application()
+    app.config = MagicMock()
+    app.config.events = EventsConfig(**config)
+    app.store = MagicMock()
+    app.store.events = EventBus(app)
+    return app
+
+
+async def pause(delay: float) -> None:
+    """Пауза без asyncio.sleep, который подменяют тесты обработчиков"""
+    await asyncio.wait(
+        [asyncio.get_running_loop().create_future()], timeout=delay
+    )
+
+
+async def read_message(response) -> dict[str, str]:
+    """Читает одно сообщение SSE, пропуская комментарии"""
+    message = {}
+    while True:
+        line = (await response.content.readline()).decode().rstrip("\n")
+        if line.startswith(":"):
+            continue
+        if not line:
+            if message:
+                return message
+            continue
+        key, _, value = line.partition(": ")
+        message[key] = value
+
+
+class TestEventBus:
+    def test_publish_without_subscribers(self):
+        bus = make_app().store.events
+
+        assert bus.publish(GameEventType.SESSION_CREATED, chat_id=1) is None
+
+    async def test_subscriber_receives_events_of_its_chat(self):
+        bus = make_app().store.events
+        chat = bus.subscribe(chat_id=1)
+        everything = bus.subscribe()
+
+        bus.publish(GameEventType.SESSION_CREATED, chat_id=1, session_id=10)
+        bus.publish(GameEventType.SESSION_CREATED, chat_id=2, session_id=20)
+
+        assert [e.session_id for e in await chat.get(timeout=0)] == [10]
+        assert [e.session_id for e in await everything.get(timeout=0)] == [
+            10,
+            20,
+        ]
+
+    async def test_slow_subscriber_drops_oldest(self):
+        bus = make_app(buffer_size=2).store.events
+        subscription = bus.subscribe()
+
+        for score in range(5):
+            bus.publish(GameEventType.SCORE_CHANGED, chat_id=1, experts=score)
+
+        events = await subscription.get(timeout=0)
+        assert [event.data["experts"] for event in events] == [3, 4]
+        assert subscription.take_dropped() == 3
+        assert subscription.take_dropped() == 0
+
+    async def test_get_times_out_with_empty_list(self):
+        subscription = make_app().store.events.subscribe()
+
+        assert await subscription.get(timeout=0.01) == []
+
+    async def test_closed_subscription(self):
+        bus = make_app().store.events
+        subscription = bus.subscribe()
+        bus.publish(GameEventType.SESSION_CREATED, chat_id=1)
+
+        await bus.close(bus.app)
+
+        assert len(await subscription.get(timeout=1)) == 1
+        assert await subscription.get(timeout=1) is None
+        assert len(bus) == 0
+
+    def test_subscribers_limit(self):
+        bus = make_app(max_subscribers=1).store.events
+        bus.subscribe()
+
+        with pytest.raises(TooManySubscribersError):
+            bus.subscribe()
+
+
+@pytest.fixture
+async def client():
+    app = make_app(keepalive=0.05)
+    setup_aiohttp_apispec(app)
+    app.middlewares.append(validation_middleware)
+    app.router.add_view("/sessions.events", SessionEventsView)
+    async with TestClient(TestServer(app)) as client:
+        yield client
+
+
+class TestSessionEventsView:
+    async def test_stream_events(self, client):
+        bus = client.app.store.events
+        response = await client.get("/sessions.events", params={"chat_id": 1})
+        assert response.headers["Content-Type"] == "text/event-stream"
+
+        bus.publish(GameEventType.PLAYER_JOINED, chat_id=2, username="b")
+        bus.publish(
+            GameEventType.PLAYER_JOINED, chat_id=1, session_id=5, username="a"
+        )
+        message = await read_message(response)
+
+        assert message["event"] == "player_joined"
+        data = json.loads(message["data"])
+        assert data["session_id"] == 5
+        assert data["username"] == "a"
+        response.close()
+
+    async def test_keepalive(self, client):
+        response = await client.get("/sessions.events")
+
+        line = await asyncio.wait_for(response.content.readline(), timeout=1)
+
+        assert line == b": keepalive\n"
+        response.close()
+
+    async def test_unsubscribe_on_disconnect(self, client):
+        bus = client.app.store.events
+        response = await client.get("/sessions.events")
+        assert len(bus) == 1
+
+        response.close()
+        for _ in range(20):
+            bus.publish(GameEventType.SESSION_CREATED, chat_id=1)
+            await pause(0.05)
+            if not len(bus):
+                break
+
+        assert len(bus) == 0
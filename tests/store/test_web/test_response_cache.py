@@ -0,0 +1,95 @@
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from aiohttp.web import json_response
+
+from app.web.app import Application, View
+from app.web.cache import GZIP_MIN_SIZE, ResponseCache, cached_response
+
+
+async def counting_version(view: View) -> str:  # noqa: RUF029
+    return CountingView.version
+
+
+class CountingView(View):
+    calls = 0
+    version = "v1"
+
+    @cached_response(version=counting_version)
+    async def get(self):
+        CountingView.calls += 1
+        size = int(self.request.query.get("size", 10))
+        return json_response({"items": "x" * size})
+
+
+@pytest.fixture
+async def client():
+    CountingView.calls = 0
+    CountingView.version = "v1"
+    app = Application()
+    app.response_cache = ResponseCache()
+    app.router.add_view("/items", CountingView)
+    async with TestClient(TestServer(app)) as client:
+        yield client
+
+
+class TestResponseCache:
+    async def test_second_request_is_cached(self, client):
+        first = await client.get("/items")
+        second = await client.get("/items")
+
+        assert CountingView.calls == 1
+        assert await first.json() == await second.json()
+        assert first.headers["ETag"] == second.headers["ETag"]
+
+    async def test_not_modified(self, client):
+        first = await client.get("/items")
+        etag = first.headers["ETag"]
+        CountingView.calls = 0
+
+        response = await client.get("/items", headers={"If-None-Match": etag})
+
+        assert response.status == 304
+        assert response.headers["ETag"] == etag
+        assert CountingView.calls == 0
+
+    async def test_version_bump_changes_etag(self, client):
+        first = await client.get("/items")
+        CountingView.version = "v2"
+
+        response = await client.get(
+            "/items", headers={"If-None-Match": first.headers["ETag"]}
+        )
+
+        assert response.status == 200
+        assert response.headers["ETag"] != first.headers["ETag"]
+        assert CountingView.calls == 2
+
+    async def test_query_is_part_of_key(self, client):
+        await client.get("/items", params={"size": 1})
+        await client.get("/items", params={"size": 2})
+
+        assert CountingView.calls == 2
+
+    async def test_large_payload_gzipped_once(self, client):
+        params = {"size": GZIP_MIN_SIZE * 4}
+        headers = {"Accept-Encoding": "gzip"}
+        first = await client.get("/items", params=params, headers=headers)
+        second = await client.get("/items", params=params, headers=headers)
+        plain = await client.get(
+            "/items", params=params, headers={"Accept-Encoding": "identity"}
+        )
+
+        assert first.headers["Content-Encoding"] == "gzip"
+        assert await first.read() == await second.read() == await plain.read()
+        assert "Content-Encoding" not in plain.headers
+        assert CountingView.calls == 1
+
+
+def test_lru_eviction():
+    cache = ResponseCache(max_size=2)
+    for etag in ("a", "b", "c"):
+        cache.put(etag, json_response({}))
+
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.get("c").body == b"{}"
@@ -0,0 +1,105 @@
+import json
+from datetime import UTC, datetime
+
+from marshmallow import Schema, fields, post_dump
+
+from app.bot.game.models import GameState, StatusSession
+from app.bot.game.schemas import ChatRatingSchema, SessionSchema
+from app.bot.user.schemas import UserInfo
+from app.store.game.dataclasses import (
+    PlayerRead,
+    SessionRead,
+    StateRead,
+    UserRead,
+)
+from app.web.serializers import compile_schema, dumps
+
+
+def make_session(id_: int) -> SessionRead:
+    return SessionRead(
+        id=id_,
+        chat_id=-100,
+        status=StatusSession.PROCESSING,
+        current_round_id=None,
+        experts_score=2,
+        bot_score=1,
+        rounds_played=3,
+        state=StateRead(current_state=GameState.WAIT_ANSWER),
+        players=[
+            PlayerRead(
+                id=1,
+                is_active=True,
+                is_ready=False,
+                is_captain=True,
+                user=UserRead(id_tg=10, username_tg="captain"),
+            )
+        ],
+    )
+
+
+class TestCompiledSchema:
+    def test_matches_marshmallow(self):
+        sessions = [make_session(1), make_session(2)]
+        sessions[1].state = None
+
+        assert compile_schema(SessionSchema, many=True).dump(
+            sessions
+        ) == SessionSchema(many=True).dump(sessions)
+
+    def test_only(self):
+        only = frozenset({"id", "players"})
+        session = make_session(1)
+
+        assert compile_schema(SessionSchema, only=only).dump(
+            session
+        ) == SessionSchema(only=only).dump(session)
+
+    def test_mappings_and_datetimes(self):
+        rating = {
+            "chat_id": 1,
+            "games_played": 3,
+            "expert_wins": 2,
+            "bot_wins": 1,
+            "last_experts_score": 6,
+            "last_bot_score": 4,
+            "last_game_at": datetime(2026, 1, 1, tzinfo=UTC),
+        }
+        stats = {"username": "captain", "wins": 1, "games_played": 2}
+
+        assert compile_schema(ChatRatingSchema).dump(
+            rating
+        ) == ChatRatingSchema().dump(rating)
+        assert compile_schema(UserInfo).dump(stats)["wins"] == 1
+
+    def test_absent_keys_omitted(self):
+        class Pair(Schema):
+            a = fields.Int()
+            b = fields.Str()
+            c = fields.Int(dump_default=0)
+
+        class Row:
+            a = 1
+
+        for obj in ({"a": 1, "b": None}, {"a": 1}, Row()):
+            assert compile_schema(Pair).dump(obj) == Pair().dump(obj)
+        assert compile_schema(Pair).dump({"a": 1}) == {"a": 1, "c": 0}
+
+    def test_hooks_fall_back_to_schema(self):
+        class Upper(Schema):
+            name = fields.Str()
+
+            @post_dump
+            def upper(self, data, **kwargs):
+                return {"name": data["name"].upper()}
+
+        assert compile_schema(Upper).dump({"name": "a"}) == {"name": "A"}
+
+    def test_same_instance_is_reused(self):
+        assert compile_schema(SessionSchema, many=True) is compile_schema(
+            SessionSchema, many=True
+        )
+
+
+def test_dumps():
+    data = {"text": "Привет", "items": [1, 2.5, None, True]}
+    assert json.loads(dumps(data)) == data
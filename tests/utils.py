@@ -1,5 +1,8 @@
 from collections.abc import Iterable
 
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
 from app.bot.game.models import (
     PlayerModel,
     RoundModel,
@@ -112,3 +115,25 @@ def answer_to_dict(answer: AnswerModel) -> dict:
 
 def answers_to_dict(answers: Iterable[AnswerModel]) -> list[dict]:
     return [answer_to_dict(answer) for answer in answers]
+
+
+class QueryCounter:
+    """Собирает SQL запросы, выполненные через engine внутри with"""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine.sync_engine
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, *args) -> None:
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)